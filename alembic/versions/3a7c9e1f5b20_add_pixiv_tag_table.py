@@ -0,0 +1,36 @@
+"""Add pixiv tag index table
+
+Revision ID: 3a7c9e1f5b20
+Revises: 2d34d7973dd9, c1f3d2a6b4e5
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3a7c9e1f5b20"
+down_revision: str | Sequence[str] | None = ("2d34d7973dd9", "c1f3d2a6b4e5")
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "pixiv_tag",
+        sa.Column("artwork_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("tag", sa.String(length=255, collation="utf8mb4_general_ci"), nullable=False),
+        sa.PrimaryKeyConstraint("artwork_id", "tag"),
+    )
+    op.create_index("ix_pixiv_tag_tag_artwork_id", "pixiv_tag", ["tag", "artwork_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pixiv_tag_tag_artwork_id", table_name="pixiv_tag")
+    op.drop_table("pixiv_tag")
@@ -0,0 +1,56 @@
+"""Add review author stats table
+
+Revision ID: 5b8d2f4a7c31
+Revises: 3a7c9e1f5b20
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+import paihub
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8d2f4a7c31"
+down_revision: str | Sequence[str] | None = "3a7c9e1f5b20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "review_author_stats",
+        sa.Column("work_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("site_key", paihub.utils.sql_types.SiteKey(), nullable=False),
+        sa.Column("author_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("wait_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("pass_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("reject_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("move_count", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("work_id", "site_key", "author_id"),
+    )
+    op.create_index(
+        "ix_review_author_stats_site_author", "review_author_stats", ["site_key", "author_id"], unique=False
+    )
+    op.execute(
+        "INSERT INTO review_author_stats "
+        "(work_id, site_key, author_id, wait_count, pass_count, reject_count, move_count) "
+        "SELECT work_id, site_key, author_id, "
+        "SUM(IF(status = 'WAIT', 1, 0)), "
+        "SUM(IF(status = 'PASS', 1, 0)), "
+        "SUM(IF(status = 'REJECT', 1, 0)), "
+        "SUM(IF(status = 'MOVE', 1, 0)) "
+        "FROM review "
+        "WHERE work_id IS NOT NULL and site_key IS NOT NULL and author_id IS NOT NULL "
+        "GROUP BY work_id, site_key, author_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_review_author_stats_site_author", table_name="review_author_stats")
+    op.drop_table("review_author_stats")
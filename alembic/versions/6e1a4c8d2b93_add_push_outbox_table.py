@@ -0,0 +1,46 @@
+"""Add push outbox table
+
+Revision ID: 6e1a4c8d2b93
+Revises: 5b8d2f4a7c31
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6e1a4c8d2b93"
+down_revision: str | Sequence[str] | None = "5b8d2f4a7c31"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "push_outbox",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("work_id", sa.Integer(), nullable=False),
+        sa.Column("review_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "SENDING", "SENT", "FAILED", "UNKNOWN", name="pushoutboxstatus"),
+            nullable=False,
+        ),
+        sa.Column("message_id", sa.Integer(), nullable=True),
+        sa.Column("create_time", sa.DateTime(), nullable=True),
+        sa.Column("update_time", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("review_id"),
+    )
+    op.create_index("ix_push_outbox_work_id_status", "push_outbox", ["work_id", "status"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_push_outbox_work_id_status", table_name="push_outbox")
+    op.drop_table("push_outbox")
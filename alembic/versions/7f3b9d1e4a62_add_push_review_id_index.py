@@ -0,0 +1,46 @@
+"""Add push review_id index
+
+Revision ID: 7f3b9d1e4a62
+Revises: 6e1a4c8d2b93
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7f3b9d1e4a62"
+down_revision: str | Sequence[str] | None = "6e1a4c8d2b93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_push_review_id", "push", ["review_id"], unique=False)
+    op.create_index("ix_review_work_id_status_id", "review", ["work_id", "status", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_review_work_id_status_id", table_name="review")
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql":
+        op.drop_index("ix_push_review_id", table_name="push")
+        return
+    # MySQL 中 ix_push_review_id 替代了外键原有的隐式索引 无法直接删除
+    # 先删除外键 删除索引后重新创建外键 MySQL 会重新为外键创建隐式索引
+    foreign_keys = [
+        foreign_key
+        for foreign_key in sa.inspect(bind).get_foreign_keys("push")
+        if foreign_key["constrained_columns"] == ["review_id"]
+    ]
+    for foreign_key in foreign_keys:
+        op.drop_constraint(foreign_key["name"], "push", type_="foreignkey")
+    op.drop_index("ix_push_review_id", table_name="push")
+    for foreign_key in foreign_keys:
+        op.create_foreign_key(foreign_key["name"], "push", "review", ["review_id"], ["id"])
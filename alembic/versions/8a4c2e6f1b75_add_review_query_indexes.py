@@ -0,0 +1,33 @@
+"""Add review query indexes
+
+Revision ID: 8a4c2e6f1b75
+Revises: 7f3b9d1e4a62
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4c2e6f1b75"
+down_revision: str | Sequence[str] | None = "7f3b9d1e4a62"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_review_work_id_site_key_id", "review", ["work_id", "site_key", "id"], unique=False)
+    op.create_index(
+        "ix_review_work_id_site_key_artwork_id", "review", ["work_id", "site_key", "artwork_id"], unique=False
+    )
+    op.create_index("ix_review_artwork_id", "review", ["artwork_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_review_artwork_id", table_name="review")
+    op.drop_index("ix_review_work_id_site_key_artwork_id", table_name="review")
+    op.drop_index("ix_review_work_id_site_key_id", table_name="review")
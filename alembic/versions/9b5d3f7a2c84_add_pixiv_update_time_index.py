@@ -0,0 +1,27 @@
+"""Add pixiv update_time index
+
+Revision ID: 9b5d3f7a2c84
+Revises: 8a4c2e6f1b75
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b5d3f7a2c84"
+down_revision: str | Sequence[str] | None = "8a4c2e6f1b75"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_pixiv_update_time", "pixiv", ["update_time"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pixiv_update_time", table_name="pixiv")
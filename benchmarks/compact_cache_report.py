@@ -0,0 +1,81 @@
+"""
+统计 Redis 中 tweet_detail 与 Danbooru 作品缓存精简前后的字节数
+
+遍历现有的缓存键，旧格式（完整 JSON）的条目按当前规则精简编码后计算大小，已经是新格式的条目按原大小计算。
+该脚本只读取 Redis，不会修改数据：
+
+    python -m benchmarks.compact_cache_report --limit 10000
+
+Redis 连接使用与主程序相同的 REDIS_HOST / REDIS_PORT / REDIS_DATABASE 环境变量。
+"""
+
+import argparse
+import asyncio
+
+from paihub.dependence.redis import Redis
+from paihub.error import BadRequest
+from paihub.sites.cache import pack_entry
+from paihub.sites.danbooru.cache import DanbooruCache
+from paihub.sites.danbooru.utils import project_post
+from paihub.sites.twitter.api import WebClientApi
+from paihub.sites.twitter.cache import WebClientCache
+from paihub.sites.twitter.utils import project_tweet
+
+try:
+    import orjson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+
+def compact_tweet_detail(key: str, data: dict) -> bytes:
+    tweet_id = key.rsplit(":", 1)[-1]
+    tweet = WebClientApi.get_tweet_from_tweet_detail(data, tweet_id)
+    return pack_entry(project_tweet(tweet), WebClientCache.tweet_detail_version)
+
+
+def compact_danbooru(_: str, data: dict) -> bytes:
+    return pack_entry(project_post(data), DanbooruCache.result_version)
+
+
+async def report(client, pattern: str, compact, limit: int):
+    count = skipped = before = after = 0
+    async for key in client.scan_iter(match=pattern, count=1000):
+        if count >= limit:
+            break
+        data = await client.get(key)
+        if data is None:
+            continue
+        count += 1
+        before += len(data)
+        if not data.startswith((b"{", b"[")):
+            # 已经是精简后的格式
+            after += len(data)
+            continue
+        try:
+            after += len(compact(key.decode(), jsonlib.loads(data)))
+        except (BadRequest, KeyError, TypeError):
+            skipped += 1
+            after += len(data)
+    saved = before - after
+    ratio = saved / before if before else 0
+    print(
+        f"{pattern:>28}: {count} 个条目 {before} -> {after} 字节 节省 {saved} 字节 ({ratio:.1%}) 无法精简 {skipped} 个"
+    )
+
+
+async def run(args: argparse.Namespace):
+    redis = Redis()
+    client = redis.binary_client
+    await report(client, "twitter:web:tweet_detail:*", compact_tweet_detail, args.limit)
+    await report(client, "danbooru:web:*", compact_danbooru, args.limit)
+    await redis.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=10000, help="每种缓存最多统计的条目数量")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+对比流式下载时拼接 bytes 与 StreamBuffer 的耗时
+
+    python -m benchmarks.stream_buffer --size 33554432 --chunk-size 16384
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+from paihub.utils.stream import read_stream
+
+
+async def iter_chunks(payload: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    view = memoryview(payload)
+    for offset in range(0, len(payload), chunk_size):
+        yield bytes(view[offset : offset + chunk_size])
+
+
+async def concat(payload: bytes, chunk_size: int) -> bytes:
+    data = b""
+    async for chunk in iter_chunks(payload, chunk_size):
+        data += chunk
+    return data
+
+
+async def run(args: argparse.Namespace):
+    payload = bytes(range(256)) * (args.size // 256)
+    cases = {
+        "concat": lambda: concat(payload, args.chunk_size),
+        "content-length": lambda: read_stream(iter_chunks(payload, args.chunk_size), len(payload)),
+        "spooled": lambda: read_stream(iter_chunks(payload, args.chunk_size)),
+    }
+    for name, func in cases.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            data = await func()
+            timings.append(time.perf_counter() - start)
+            if data != payload:
+                raise RuntimeError(f"{name} 返回的数据不一致")
+        print(f"{name:>14}: 最快 {min(timings):.3f}s 平均 {sum(timings) / len(timings):.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=32 * 1024 * 1024, help="模拟下载的字节数")
+    parser.add_argument("--chunk-size", type=int, default=16 * 1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
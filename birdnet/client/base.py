@@ -146,9 +146,23 @@ class BaseClient(AbstractAsyncContextManager["BaseClient"]):
             raise BadRequest(message="\n".join([error["message"] for error in errors]))
         return result["data"]
 
-    async def download(self, url: "URLTypes", chunk_size: int | None = None) -> bytes:
-        data = b""
+    async def download(
+        self, url: "URLTypes", chunk_size: int | None = None, max_size: int = 256 * 1024 * 1024
+    ) -> bytes:
+        """Download the content of the URL, raising BadRequest above ``max_size`` bytes."""
         async with self.client.stream("GET", url) as response:
+            content_length = response.headers.get("Content-Length")
+            size = int(content_length) if content_length else 0
+            if size > max_size:
+                raise BadRequest(message=f"Content-Length {size} exceeds {max_size} bytes")
+            data = bytearray(size)
+            offset = 0
             async for chunk in response.aiter_bytes(chunk_size):
-                data += chunk
-        return data
+                end = offset + len(chunk)
+                if end > max_size:
+                    raise BadRequest(message=f"Response exceeds {max_size} bytes")
+                data[offset:end] = chunk
+                offset = end
+        if offset < len(data):
+            del data[offset:]
+        return bytes(data)
@@ -1,3 +1,5 @@
+from collections.abc import Awaitable, Callable
+from functools import wraps
 from typing import TYPE_CHECKING, get_args
 
 from persica.factory.component import AsyncInitializingComponent
@@ -5,11 +7,15 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from paihub.error import ArtWorkNotFoundError, ArtWorkUnavailableError
+
 if TYPE_CHECKING:
     from telegram.ext import Application as BotApplication
 
     from paihub.application import Application
+    from paihub.dependence.image_cache import ImageCache
     from paihub.entities.artwork import ArtWork
+    from paihub.sites.cache import NegativeCache
 
 
 class Component(AsyncInitializingComponent):
@@ -103,21 +109,81 @@ class Command(Component):
         """Add bot handlers used by this function"""
 
 
+def _check_negative_cache[T](
+    func: Callable[["SiteService", int], Awaitable[T]],
+) -> Callable[["SiteService", int], Awaitable[T]]:
+    @wraps(func)
+    async def wrapper(self: "SiteService", artwork_id: int) -> T:
+        if self.negative_cache is None:
+            return await func(self, artwork_id)
+        await self.negative_cache.check(self.site_key, artwork_id)
+        try:
+            return await func(self, artwork_id)
+        except (ArtWorkNotFoundError, ArtWorkUnavailableError) as exc:
+            await self.negative_cache.set(self.site_key, artwork_id, exc)
+            raise
+
+    return wrapper
+
+
+def _cache_artwork_images(
+    func: Callable[["SiteService", int], Awaitable[list[bytes]]],
+) -> Callable[["SiteService", int], Awaitable[list[bytes]]]:
+    @wraps(func)
+    async def get_artwork_images(self: "SiteService", artwork_id: int) -> list[bytes]:
+        if self.image_cache is None:
+            return await func(self, artwork_id)
+        images = await self.image_cache.get(self.site_key, artwork_id)
+        if images is None:
+            images = await func(self, artwork_id)
+            if images:
+                await self.image_cache.set(self.site_key, artwork_id, images)
+        return images
+
+    return get_artwork_images
+
+
 class SiteService(Component):
     __order__ = 5
     site_name: str  # 网站名称
     site_key: str  # 网站关键标识符 最大长度不超过16
     application: "Application"
+    image_cache: "ImageCache | None" = None
+    negative_cache: "NegativeCache | None" = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 子类实现的 get_artwork 与 get_artwork_images 先检查作品是否已记录为不存在
+        # get_artwork_images 命中图片缓存时无需再检查
+        func = cls.__dict__.get("get_artwork")
+        if func is not None:
+            cls.get_artwork = _check_negative_cache(func)
+        func = cls.__dict__.get("get_artwork_images")
+        if func is not None:
+            cls.get_artwork_images = _cache_artwork_images(_check_negative_cache(func))
 
     def set_application(self, application: "Application"):
         self.application = application
 
+    def set_image_cache(self, image_cache: "ImageCache"):
+        self.image_cache = image_cache
+
+    def set_negative_cache(self, negative_cache: "NegativeCache"):
+        self.negative_cache = negative_cache
+
     async def get_artwork(self, artwork_id: int) -> "ArtWork":
         pass
 
     async def get_artwork_images(self, artwork_id: int) -> list[bytes]:
         pass
 
+    async def prefetch_artworks(self, artwork_ids: list[int]) -> int:  # noqa: ARG002
+        """批量获取多个作品的信息并写入缓存 支持批量查询的网站实现
+        :param artwork_ids: 作品ID列表
+        :return: 写入缓存的作品数量
+        """
+        return 0
+
     async def initialize_review(
         self,
         work_id: int,  # noqa: ARG002
@@ -125,6 +191,7 @@ class SiteService(Component):
         is_pattern: bool,  # noqa: ARG002
         lines_per_page: int = 1000,  # noqa: ARG002
         create_by: int | None = None,  # noqa: ARG002
+        full_rebuild: bool = False,  # noqa: ARG002
     ) -> int:
         return 0
 
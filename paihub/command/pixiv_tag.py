@@ -0,0 +1,42 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+from telegram.ext import CommandHandler
+
+from paihub.base import Command
+from paihub.bot.adminhandler import AdminHandler
+from paihub.log import logger
+from paihub.sites.pixiv.services import PixivSitesService
+
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import ContextTypes
+
+
+class PixivTagCommand(Command):
+    lock = asyncio.Lock()
+
+    def __init__(self, pixiv_service: PixivSitesService):
+        self.pixiv_service = pixiv_service
+
+    def add_handlers(self):
+        self.bot.add_handler(
+            AdminHandler(CommandHandler("pixiv_tag_backfill", self.backfill, block=False), self.application)
+        )
+
+    async def backfill(self, update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
+        user = update.effective_user
+        message = update.effective_message
+        logger.info("用户 %s[%s] 发出 pixiv_tag_backfill 命令", user.full_name, user.id)
+        if self.lock.locked():
+            await message.reply_text("正在回填 Pixiv 标签索引 请勿重复操作")
+            return
+        async with self.lock:
+            reply_text = await message.reply_text("正在回填 Pixiv 标签索引")
+            try:
+                count = await self.pixiv_service.backfill_tags()
+            except Exception as exc:
+                logger.error("回填 Pixiv 标签索引时发生错误", exc_info=exc)
+                await reply_text.edit_text("回填 Pixiv 标签索引时发生错误，详情请查看日志")
+                return
+            await reply_text.edit_text(f"回填 Pixiv 标签索引完成，共写入 {count} 个标签")
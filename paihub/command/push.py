@@ -1,9 +1,7 @@
-import asyncio
 import html
 from typing import TYPE_CHECKING
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, ReplyKeyboardRemove
-from telegram.constants import ParseMode
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardRemove
 from telegram.error import BadRequest as BotBadRequest
 from telegram.error import NetworkError as BotNetworkError
 from telegram.error import RetryAfter as BotRetryAfter
@@ -11,23 +9,26 @@ from telegram.ext import CallbackQueryHandler, CommandHandler, ConversationHandl
 
 from paihub.base import Command
 from paihub.bot.adminhandler import AdminHandler
-from paihub.entities.artwork import ImageType
 from paihub.error import ArtWorkNotFoundError, BadRequest, RetryAfter
 from paihub.log import logger
 from paihub.system.push.services import PushService
+from paihub.system.sender.services import SenderService
 from paihub.system.work.services import WorkService
 
 if TYPE_CHECKING:
     from telegram import Update
     from telegram.ext import ContextTypes
 
+    from paihub.system.push.ext import PushCallbackContext
+
 GET_WORK, START_PUSH, _, _ = range(4)
 
 
 class PushCommand(Command):
-    def __init__(self, work_service: WorkService, push_service: PushService):
+    def __init__(self, work_service: WorkService, push_service: PushService, sender_service: SenderService):
         self.work_service = work_service
         self.push_service = push_service
+        self.sender_service = sender_service
 
     def add_handlers(self):
         conv_handler = ConversationHandler(
@@ -39,6 +40,7 @@ class PushCommand(Command):
             fallbacks=[CommandHandler("cancel", self.cancel), CallbackQueryHandler(self.cancel, pattern=r"^push_exit")],
         )
         self.bot.add_handler(conv_handler)
+        self.bot.add_handler(AdminHandler(CommandHandler("push_requeue", self.requeue, block=False), self.application))
 
     async def start(self, update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
         user = update.effective_user
@@ -80,11 +82,10 @@ class PushCommand(Command):
         )
         return START_PUSH
 
-    async def start_push(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
+    async def start_push(self, update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
         user = update.effective_user
         message = update.effective_message
         callback_query = update.callback_query
-        bot = context.bot
 
         def get_callback_query(callback_query_data: str) -> int:
             _data = callback_query_data.split("|")
@@ -103,6 +104,8 @@ class PushCommand(Command):
                 await message.edit_text("当前 Push 队列无任务\n退出 Push")
                 return ConversationHandler.END
             await message.edit_text(f"当前有 {count} 个作品正在推送")
+            # 调用发送之后出错时无法确认作品是否已经发出 记录为推送失败；调用发送之前出错时放回队列
+            sent = False
             try:
                 artwork = await push_context.get_artwork()
                 artwork_images = await push_context.get_artwork_images()
@@ -113,55 +116,28 @@ class PushCommand(Command):
                     f"From <a href='{artwork.url}'>{artwork.web_name}</a> "
                     f"By <a href='{artwork.author.url}'>{html.escape(artwork.author.name)}</a>\n"
                 )
-                if len(artwork_images) > 1:
-                    media = [InputMediaPhoto(media=artwork_images[0], caption=caption, parse_mode=ParseMode.HTML)]
-                    media.extend(InputMediaPhoto(media=data) for data in artwork_images[1:])
-                    media = media[:10]
-                    send_media_group_message = await bot.send_media_group(
-                        chat_id=push_context.channel_id,
-                        media=media,
-                        connect_timeout=10,
-                        read_timeout=10,
-                        write_timeout=30,
-                    )
-                    await push_context.set_push(message_id=send_media_group_message[0].id, create_by=user.id)
-                elif len(artwork_images) == 1:
-                    if artwork.image_type == ImageType.STATIC:
-                        send_photo_message = await bot.send_photo(
-                            chat_id=push_context.channel_id,
-                            photo=artwork_images[0],
-                            caption=caption,
-                            parse_mode=ParseMode.HTML,
-                            connect_timeout=10,
-                            read_timeout=10,
-                            write_timeout=30,
-                        )
-                        await push_context.set_push(message_id=send_photo_message.id, create_by=user.id)
-                    elif artwork.image_type == ImageType.DYNAMIC:
-                        send_video_message = await bot.send_video(
-                            chat_id=push_context.channel_id,
-                            video=artwork_images[0],
-                            caption=caption,
-                            parse_mode=ParseMode.HTML,
-                            connect_timeout=10,
-                            read_timeout=10,
-                            write_timeout=30,
-                        )
-                        await push_context.set_push(message_id=send_video_message.id, create_by=user.id)
-                else:
+                if not artwork_images:
                     raise RuntimeError  # noqa: TRY301
-                count = await self.push_service.get_push_count(work_id)
-                if count == 0:
-                    await message.reply_text("推送完毕")
-                    await message.delete()
-                    return ConversationHandler.END
-                await asyncio.sleep(len(artwork_images) * 3)
+                sent = True
+                send_messages = await self.sender_service.send_artwork(
+                    push_context.site_service.site_key,
+                    push_context.artwork_id,
+                    artwork_images,
+                    artwork.image_type,
+                    caption,
+                    chat_id=push_context.channel_id,
+                )
+                if send_messages:
+                    await push_context.set_push(message_id=send_messages[0].id, create_by=user.id)
+                else:
+                    await push_context.set_push(status=False, create_by=user.id)
             except ArtWorkNotFoundError:
                 await push_context.set_push(status=False, create_by=user.id)
                 await message.reply_text(f"[Review]{push_context.review_id} 作品不存在")
                 logger.warning("[Review]%s 作品不存在", push_context.review_id)
                 continue
             except RetryAfter as exc:
+                await push_context.undo_push()
                 await message.reply_text(f"触发速率限制 请等待{exc.retry_after}秒")
                 logger.warning(f"触发速率限制 请等待{exc.retry_after}秒", exc_info=exc)
                 break
@@ -170,29 +146,49 @@ class PushCommand(Command):
                 await message.reply_text(f"[Review]{push_context.review_id} 推送时发生错误：\n{exc.message}")
                 logger.warning("推送时发生致命错误", exc_info=exc)
                 continue
-            except BotBadRequest as exc:
-                await message.reply_text("推送时发生致命错误\n%s", exc.message)
-                logger.error("推送时发生致命错误", exc_info=exc)
-                break
-            except BotNetworkError as exc:
-                await message.reply_text("推送时发生致命错误\n%s", exc.message)
-                logger.error("推送时发生致命错误", exc_info=exc)
-                break
             except BotRetryAfter as exc:
                 await push_context.undo_push()
                 await message.reply_text(f"推送太快啦！\n等待{exc.retry_after}秒后重试")
                 logger.warning("超出洪水控制限制 等待%s秒后重试", exc.retry_after)
-                await asyncio.sleep(exc.retry_after + 1)
                 continue
+            except (BotBadRequest, BotNetworkError) as exc:
+                await self._release_push(push_context, sent, user.id)
+                await message.reply_text(f"推送时发生致命错误\n{exc.message}")
+                logger.error("推送时发生致命错误", exc_info=exc)
+                break
             except Exception as exc:
-                await push_context.set_push(status=False, create_by=user.id)
+                await self._release_push(push_context, sent, user.id)
                 await message.reply_text("推送时发生致命错误，退出Push")
                 await self.application.bot.process_error(update, exc)
                 logger.error("推送时发生致命错误", exc_info=exc)
                 break
+            count = await self.push_service.get_push_count(work_id)
+            if count == 0:
+                await message.reply_text("推送完毕")
+                await message.delete()
+                return ConversationHandler.END
 
         return ConversationHandler.END
 
+    @staticmethod
+    async def _release_push(push_context: "PushCallbackContext", sent: bool, create_by: int):
+        """推送出错后结束认领 已经调用发送的作品记录为推送失败 否则放回队列"""
+        if sent:
+            await push_context.set_push(status=False, create_by=create_by)
+        else:
+            await push_context.undo_push()
+
+    async def requeue(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
+        user = update.effective_user
+        message = update.effective_message
+        logger.info("用户 %s[%s] 发出 push_requeue 命令", user.full_name, user.id)
+        if len(context.args) != 1 or not context.args[0].isdigit():
+            await message.reply_text("用法：/push_requeue <Work ID>\n请先确认频道中没有这些作品，否则会重复推送")
+            return
+        work_id = int(context.args[0])
+        count = await self.push_service.requeue_unknown_push(work_id)
+        await message.reply_text(f"已将 Work {work_id} 中 {count} 个推送中断的作品重新加入推送队列")
+
     @staticmethod
     async def cancel(update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
         message = update.effective_message
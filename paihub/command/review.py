@@ -1,8 +1,8 @@
 import html
 from typing import TYPE_CHECKING
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, ReplyKeyboardRemove
-from telegram.constants import ChatAction, ParseMode
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardRemove
+from telegram.constants import ChatAction
 from telegram.error import BadRequest as BotBadRequest
 from telegram.error import NetworkError as BotNetworkError
 from telegram.error import RetryAfter as BotRetryAfter
@@ -10,11 +10,12 @@ from telegram.ext import CallbackQueryHandler, CommandHandler, ConversationHandl
 
 from paihub.base import Command
 from paihub.bot.adminhandler import AdminHandler
-from paihub.entities.artwork import ImageType
 from paihub.error import ArtWorkNotFoundError, BadRequest, RetryAfter
 from paihub.log import logger
 from paihub.system.review.entities import AutoReviewResult, ReviewAuthorRuleAction, ReviewStatus
+from paihub.system.review.prefetch import ReviewPrefetcher
 from paihub.system.review.services import ReviewService
+from paihub.system.sender.services import SenderService
 from paihub.system.work.error import WorkRuleNotFound
 from paihub.system.work.services import WorkService
 
@@ -26,9 +27,32 @@ GET_WORK, START_REVIEW, SET_REVIEW, _ = range(4)
 
 
 class ReviewCommand(Command):
-    def __init__(self, work_service: WorkService, review_service: ReviewService):
+    prefetch_size = 3  # 人工审核时预取的作品数量
+
+    def __init__(self, work_service: WorkService, review_service: ReviewService, sender_service: SenderService):
         self.work_service = work_service
         self.review_service = review_service
+        self.sender_service = sender_service
+        self._prefetchers: dict[int, ReviewPrefetcher] = {}  # 以用户ID为键
+
+    def get_prefetcher(self, user_id: int, work_id: int) -> ReviewPrefetcher:
+        prefetcher = self._prefetchers.get(user_id)
+        if prefetcher is None or prefetcher.work_id != work_id:
+            prefetcher = self.review_service.create_prefetcher(work_id, self.prefetch_size)
+            self._prefetchers[user_id] = prefetcher
+        return prefetcher
+
+    async def close_prefetcher(self, user_id: int):
+        prefetcher = self._prefetchers.pop(user_id, None)
+        if prefetcher is not None:
+            await prefetcher.close()
+
+    async def get_review_count(self, user_id: int, work_id: int) -> int:
+        count = await self.review_service.get_review_count(work_id)
+        prefetcher = self._prefetchers.get(user_id)
+        if prefetcher is not None and prefetcher.work_id == work_id:
+            count += prefetcher.pending_count
+        return count
 
     @staticmethod
     def build_review_keyboard(review_id: int) -> InlineKeyboardMarkup:
@@ -112,13 +136,17 @@ class ReviewCommand(Command):
         )
         self.bot.add_handler(conv_handler)
 
-    async def start(self, update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
+    async def start(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
         user = update.effective_user
         message = update.effective_message
         logger.info("用户 %s[%s] 发出 review 命令", user.full_name, user.id)
+        await self.close_prefetcher(user.id)
+        # /review full 忽略增量扫描的水位线 全量重建审核队列
+        full_rebuild = int(bool(context.args) and context.args[0] == "full")
         works = await self.work_service.get_all()
         keyboard: list[list[InlineKeyboardButton]] = [
-            [InlineKeyboardButton(text=work.name, callback_data=f"set_review_work|{work.id}")] for work in works
+            [InlineKeyboardButton(text=work.name, callback_data=f"set_review_work|{work.id}|{full_rebuild}")]
+            for work in works
         ]
         keyboard.append([InlineKeyboardButton(text="退出", callback_data="review_exit")])
         await message.reply_html(
@@ -131,16 +159,17 @@ class ReviewCommand(Command):
         callback_query = update.callback_query
         user = update.effective_user
 
-        def get_callback_query(callback_query_data: str) -> int:
+        def get_callback_query(callback_query_data: str) -> tuple[int, bool]:
             _data = callback_query_data.split("|")
-            return int(_data[1])
+            return int(_data[1]), len(_data) > 2 and _data[2] == "1"
 
-        work_id = get_callback_query(callback_query.data)
-        await message.edit_text("正在初始化 Review 队列")
+        work_id, full_rebuild = get_callback_query(callback_query.data)
+        await self.close_prefetcher(user.id)
+        await message.edit_text("正在全量重建 Review 队列" if full_rebuild else "正在初始化 Review 队列")
         await message.reply_chat_action(ChatAction.TYPING)
         try:
             count = await self.review_service.initialize_review_form_sites(
-                work_id=work_id, create_by=user.id, lines_per_page=10000
+                work_id=work_id, create_by=user.id, lines_per_page=10000, full_rebuild=full_rebuild
             )
         except WorkRuleNotFound:
             await message.edit_text("当前 Work 未配置规则 退出任务")
@@ -173,14 +202,12 @@ class ReviewCommand(Command):
 
         await message.edit_text("正在处理作品")
         await message.reply_chat_action(ChatAction.TYPING)
+        work_id = get_callback_query(callback_query.data)
+        prefetcher = self.get_prefetcher(user.id, work_id)
         while True:
-            work_id = get_callback_query(callback_query.data)
-            count = await self.review_service.get_review_count(work_id)
-            if count == 0:
-                await message.reply_text("当前 Review 队列无任务\n退出 Review")
-                return ConversationHandler.END
-            review_context = await self.review_service.retrieve_next_for_review(work_id=work_id)
+            review_context = await prefetcher.next()
             if review_context is None:
+                await self.close_prefetcher(user.id)
                 await message.reply_text("当前 Review 队列无任务\n退出 Review")
                 return ConversationHandler.END
             try:
@@ -208,38 +235,15 @@ class ReviewCommand(Command):
                     f"By <a href='{artwork.author.url}'>{html.escape(artwork.author.name)}</a>\n"
                     f"At {artwork.create_time.strftime('%Y-%m-%d %H:%M')}"
                 )
-                if len(artwork_images) > 1:
-                    media = [InputMediaPhoto(media=artwork_images[0], caption=caption, parse_mode=ParseMode.HTML)]
-                    media.extend(InputMediaPhoto(media=data) for data in artwork_images[1:])
-                    media = media[:10]
-                    await message.reply_chat_action(ChatAction.UPLOAD_PHOTO)
-                    await message.reply_media_group(
-                        media,
-                        connect_timeout=10,
-                        read_timeout=10,
-                        write_timeout=30,
+                if artwork_images:
+                    await self.sender_service.send_artwork(
+                        review_context.site_key,
+                        review_context.artwork_id,
+                        artwork_images,
+                        artwork.image_type,
+                        caption,
+                        reply_to=message,
                     )
-                elif len(artwork_images) == 1:
-                    if artwork.image_type == ImageType.STATIC:
-                        await message.reply_chat_action(ChatAction.UPLOAD_PHOTO)
-                        await message.reply_photo(
-                            photo=artwork_images[0],
-                            caption=caption,
-                            parse_mode=ParseMode.HTML,
-                            connect_timeout=10,
-                            read_timeout=10,
-                            write_timeout=30,
-                        )
-                    elif artwork.image_type == ImageType.DYNAMIC:
-                        await message.reply_chat_action(ChatAction.UPLOAD_VIDEO)
-                        await message.reply_video(
-                            video=artwork_images[0],
-                            caption=caption,
-                            parse_mode=ParseMode.HTML,
-                            connect_timeout=10,
-                            read_timeout=10,
-                            write_timeout=30,
-                        )
                 else:
                     raise RuntimeError  # noqa: TRY301
                 await message.reply_text(
@@ -281,6 +285,7 @@ class ReviewCommand(Command):
             else:
                 return SET_REVIEW
 
+        await self.close_prefetcher(user.id)
         return ConversationHandler.END
 
     async def set_review(self, update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
@@ -306,7 +311,7 @@ class ReviewCommand(Command):
             review_info.set_reject(user.id)
             await message.edit_text("你选择了拒绝")
         await self.review_service.update_review(review_info)
-        count = await self.review_service.get_review_count(review_info.work_id)
+        count = await self.get_review_count(user.id, review_info.work_id)
         await message.reply_text(
             f"当前还有{count}个作品未审核\n选择你要的操作",
             reply_markup=self.build_review_result_keyboard(review_info.work_id, review_info.id),
@@ -352,7 +357,7 @@ class ReviewCommand(Command):
             await message.edit_text("已加入当前 Work 的作者黑名单，并设置为拒绝")
 
         await self.review_service.update_review(review_info)
-        count = await self.review_service.get_review_count(review_info.work_id)
+        count = await self.get_review_count(user.id, review_info.work_id)
         await message.reply_text(
             f"当前还有{count}个作品未审核\n选择你要的操作",
             reply_markup=self.build_review_result_keyboard(
@@ -415,10 +420,10 @@ class ReviewCommand(Command):
         )
         return SET_REVIEW
 
-    @staticmethod
-    async def cancel(update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
+    async def cancel(self, update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
         message = update.effective_message
         callback_query = update.callback_query
+        await self.close_prefetcher(update.effective_user.id)
         if callback_query is None:
             await message.reply_text("退出命令", reply_markup=ReplyKeyboardRemove())
         else:
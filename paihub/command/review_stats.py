@@ -0,0 +1,43 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+from telegram.ext import CommandHandler
+
+from paihub.base import Command
+from paihub.bot.adminhandler import AdminHandler
+from paihub.log import logger
+from paihub.system.review.services import ReviewService
+
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import ContextTypes
+
+
+class ReviewStatsCommand(Command):
+    lock = asyncio.Lock()
+
+    def __init__(self, review_service: ReviewService):
+        self.review_service = review_service
+
+    def add_handlers(self):
+        self.bot.add_handler(
+            AdminHandler(CommandHandler("review_stats_rebuild", self.rebuild, block=False), self.application)
+        )
+
+    async def rebuild(self, update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
+        user = update.effective_user
+        message = update.effective_message
+        logger.info("用户 %s[%s] 发出 review_stats_rebuild 命令", user.full_name, user.id)
+        if self.lock.locked():
+            await message.reply_text("正在重建作者审核统计 请勿重复操作")
+            return
+        async with self.lock:
+            reply_text = await message.reply_text("正在重建作者审核统计")
+            try:
+                count = await self.review_service.rebuild_author_stats()
+            except Exception as exc:
+                logger.error("重建作者审核统计时发生错误", exc_info=exc)
+                await reply_text.edit_text("重建作者审核统计时发生错误，详情请查看日志")
+                return
+            logger.info("重建作者审核统计完成 共 %s 行", count)
+            await reply_text.edit_text(f"重建作者审核统计完成，共 {count} 位作者")
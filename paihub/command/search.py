@@ -3,19 +3,18 @@ from io import BytesIO
 from typing import TYPE_CHECKING
 
 from PicImageSearch import Network, SauceNAO
-from telegram import InputMediaPhoto
-from telegram.constants import ChatAction, FileSizeLimit, ParseMode
+from telegram.constants import ChatAction, FileSizeLimit
 from telegram.error import BadRequest as BotBadRequest
 from telegram.error import NetworkError as BotNetworkError
 from telegram.ext import MessageHandler, filters
 
 from paihub.base import Command
 from paihub.bot.adminhandler import AdminHandler
-from paihub.entities.artwork import ImageType
 from paihub.entities.config import TomlConfig
 from paihub.error import ArtWorkNotFoundError, BadRequest, RetryAfter
 from paihub.log import logger
 from paihub.system.name_map.service import WorkTagFormatterService
+from paihub.system.sender.services import SenderService
 from paihub.system.sites.manager import SitesManager
 
 if TYPE_CHECKING:
@@ -24,7 +23,9 @@ if TYPE_CHECKING:
 
 
 class Search(Command):
-    def __init__(self, sites_manager: SitesManager, tag_formatter: WorkTagFormatterService):
+    def __init__(
+        self, sites_manager: SitesManager, tag_formatter: WorkTagFormatterService, sender_service: SenderService
+    ):
         self.config: dict = {}
         self.config = TomlConfig("config/search.toml")
         self.network = Network()
@@ -34,6 +35,7 @@ class Search(Command):
         )
         self.sites_manager = sites_manager
         self.tag_formatter = tag_formatter
+        self.sender_service = sender_service
 
     def add_handlers(self):
         self.bot.add_handler(
@@ -115,49 +117,16 @@ class Search(Command):
                             )
                             if any(len(image) > FileSizeLimit.PHOTOSIZE_UPLOAD for image in artwork_images):
                                 await message.reply_chat_action(ChatAction.TYPING)
-                                for image in artwork_images:
-                                    await message.reply_document(
-                                        document=image,
-                                        caption=caption,
-                                        parse_mode=ParseMode.HTML,
-                                        connect_timeout=10,
-                                        read_timeout=10,
-                                        write_timeout=30,
-                                    )
-                            elif len(artwork_images) > 1:
-                                media = [
-                                    InputMediaPhoto(media=artwork_images[0], caption=caption, parse_mode=ParseMode.HTML)
-                                ]
-                                media.extend(InputMediaPhoto(media=data) for data in artwork_images[1:])
-                                media = media[:10]
-                                await message.reply_chat_action(ChatAction.UPLOAD_PHOTO)
-                                await message.reply_media_group(
-                                    media,
-                                    connect_timeout=10,
-                                    read_timeout=10,
-                                    write_timeout=30,
+                                await self.sender_service.send_documents(artwork_images, caption, reply_to=message)
+                            elif artwork_images:
+                                await self.sender_service.send_artwork(
+                                    site.site_key,
+                                    artwork_id,
+                                    artwork_images,
+                                    artwork.image_type,
+                                    caption,
+                                    reply_to=message,
                                 )
-                            elif len(artwork_images) == 1:
-                                if artwork.image_type == ImageType.STATIC:
-                                    await message.reply_chat_action(ChatAction.UPLOAD_PHOTO)
-                                    await message.reply_photo(
-                                        photo=artwork_images[0],
-                                        caption=caption,
-                                        parse_mode=ParseMode.HTML,
-                                        connect_timeout=10,
-                                        read_timeout=10,
-                                        write_timeout=30,
-                                    )
-                                elif artwork.image_type == ImageType.DYNAMIC:
-                                    await message.reply_chat_action(ChatAction.UPLOAD_VIDEO)
-                                    await message.reply_video(
-                                        video=artwork_images[0],
-                                        caption=caption,
-                                        parse_mode=ParseMode.HTML,
-                                        connect_timeout=10,
-                                        read_timeout=10,
-                                        write_timeout=30,
-                                    )
                         except ArtWorkNotFoundError:
                             await message.reply_text(
                                 f"搜索结果 [{site.site_name}]{artwork_id} [title]{raw.title} 作品不存在"
@@ -1,20 +1,20 @@
 import html
 from typing import TYPE_CHECKING
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, ReplyKeyboardRemove
-from telegram.constants import ChatAction, ParseMode
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardRemove
+from telegram.constants import ChatAction
 from telegram.error import BadRequest as BotBadRequest
 from telegram.error import NetworkError as BotNetworkError
 from telegram.ext import CallbackQueryHandler, CommandHandler, ConversationHandler, MessageHandler, filters
 
 from paihub.base import Command
 from paihub.bot.adminhandler import AdminHandler
-from paihub.entities.artwork import ImageType
 from paihub.error import ArtWorkNotFoundError, BadRequest, RetryAfter
 from paihub.log import logger
 from paihub.system.name_map.service import WorkTagFormatterService
 from paihub.system.push.services import PushService
 from paihub.system.review.services import ReviewService
+from paihub.system.sender.services import SenderService
 from paihub.system.sites.manager import SitesManager
 from paihub.system.work.services import WorkService
 
@@ -35,12 +35,14 @@ class SendCommand(Command):
         push_service: PushService,
         review_service: ReviewService,
         tag_formatter: WorkTagFormatterService,
+        sender_service: SenderService,
     ):
         self.work_service = work_service
         self.push_service = push_service
         self.review_service = review_service
         self.sites_manager = sites_manager
         self.tag_formatter = tag_formatter
+        self.sender_service = sender_service
 
     def add_handlers(self):
         conv_handler = ConversationHandler(
@@ -85,40 +87,15 @@ class SendCommand(Command):
                             f"By <a href='{artwork.author.url}'>{html.escape(artwork.author.name)}</a>\n"
                             f"At {artwork.create_time.strftime('%Y-%m-%d %H:%M')}"
                         )
-                        if len(artwork_images) > 1:
-                            media = [
-                                InputMediaPhoto(media=artwork_images[0], caption=caption, parse_mode=ParseMode.HTML)
-                            ]
-                            media.extend([InputMediaPhoto(media=data) for data in artwork_images[1:]])
-                            media = media[:10]
-                            await message.reply_chat_action(ChatAction.UPLOAD_PHOTO)
-                            await message.reply_media_group(
-                                media,
-                                connect_timeout=10,
-                                read_timeout=10,
-                                write_timeout=30,
+                        if artwork_images:
+                            await self.sender_service.send_artwork(
+                                site.site_key,
+                                artwork_id,
+                                artwork_images,
+                                artwork.image_type,
+                                caption,
+                                reply_to=message,
                             )
-                        elif len(artwork_images) == 1:
-                            if artwork.image_type == ImageType.STATIC:
-                                await message.reply_chat_action(ChatAction.UPLOAD_PHOTO)
-                                await message.reply_photo(
-                                    photo=artwork_images[0],
-                                    caption=caption,
-                                    parse_mode=ParseMode.HTML,
-                                    connect_timeout=10,
-                                    read_timeout=10,
-                                    write_timeout=30,
-                                )
-                            elif artwork.image_type == ImageType.DYNAMIC:
-                                await message.reply_chat_action(ChatAction.UPLOAD_VIDEO)
-                                await message.reply_video(
-                                    video=artwork_images[0],
-                                    caption=caption,
-                                    parse_mode=ParseMode.HTML,
-                                    connect_timeout=10,
-                                    read_timeout=10,
-                                    write_timeout=30,
-                                )
                         works = await self.work_service.get_all()
                         keyboard: list[list[InlineKeyboardButton]] = [
                             [
@@ -199,11 +176,10 @@ class SendCommand(Command):
         await message.edit_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
         return SEND
 
-    async def send_artwork(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
+    async def send_artwork(self, update: "Update", _: "ContextTypes.DEFAULT_TYPE"):
         user = update.effective_user
         message = update.effective_message
         callback_query = update.callback_query
-        bot = context.bot
 
         def get_callback_query(callback_query_data: str) -> tuple[int, str, int]:
             _data = callback_query_data.split("|")
@@ -236,38 +212,16 @@ class SendCommand(Command):
                 f"By <a href='{artwork.author.url}'>{html.escape(artwork.author.name)}</a>\n"
                 f"At {artwork.create_time.strftime('%Y-%m-%d %H:%M')}"
             )
-            if len(artwork_images) > 1:
-                media = [InputMediaPhoto(media=artwork_images[0], caption=caption, parse_mode=ParseMode.HTML)]
-                media.extend(InputMediaPhoto(media=data) for data in artwork_images[1:])
-                media = media[:10]
-                send_message = await bot.send_media_group(
+            if artwork_images:
+                send_messages = await self.sender_service.send_artwork(
+                    site.site_key,
+                    artwork_id,
+                    artwork_images,
+                    artwork.image_type,
+                    caption,
                     chat_id=work_channel.channel_id,
-                    media=media,
-                    connect_timeout=10,
-                    read_timeout=10,
-                    write_timeout=30,
                 )
-            elif len(artwork_images) == 1:
-                if artwork.image_type == ImageType.STATIC:
-                    send_message = await bot.send_photo(
-                        chat_id=work_channel.channel_id,
-                        photo=artwork_images[0],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML,
-                        connect_timeout=10,
-                        read_timeout=10,
-                        write_timeout=30,
-                    )
-                elif artwork.image_type == ImageType.DYNAMIC:
-                    send_message = await bot.send_video(
-                        chat_id=work_channel.channel_id,
-                        video=artwork_images[0],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML,
-                        connect_timeout=10,
-                        read_timeout=10,
-                        write_timeout=30,
-                    )
+                send_message = send_messages[0] if send_messages else None
             else:
                 raise RuntimeError  # noqa: TRY301
         except ArtWorkNotFoundError:
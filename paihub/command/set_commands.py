@@ -18,11 +18,14 @@ class SetBotCommand(Command):
     ]
 
     admin = [
-        BotCommand("review", "开始审核"),
+        BotCommand("review", "开始审核 /review full 全量重建审核队列"),
         BotCommand("review_rule", "管理作者规则"),
         BotCommand("push", "开始推送"),
+        BotCommand("push_requeue", "重新推送中断的作品"),
         BotCommand("reset", "重设审核"),
         BotCommand("update", "更新代码"),
+        BotCommand("pixiv_tag_backfill", "回填 Pixiv 标签索引"),
+        BotCommand("review_stats_rebuild", "重建作者审核统计"),
         BotCommand("send", "快速发送"),
         BotCommand("ping", "Ping！"),
         BotCommand("cancel", "取消操作"),
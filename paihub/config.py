@@ -41,5 +41,21 @@ class MongodbConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="mongodb_")
 
 
+class ImageCacheConfig(BaseSettings):
+    memory_bytes: int = 256 * 1024 * 1024  # 内存缓存的最大字节数
+    disk_path: str = "cache/images"
+    disk_bytes: int = 4 * 1024 * 1024 * 1024  # 磁盘缓存的最大字节数 为 0 时不使用磁盘缓存
+
+    model_config = SettingsConfigDict(env_prefix="image_cache_")
+
+
+class SiteCacheConfig(BaseSettings):
+    local_size: int = 1024  # 每个命名空间在进程内缓存的最大条目数 为 0 时不使用进程内缓存
+    local_ttl: float = 60  # 进程内缓存的有效时间（秒）
+    negative_ttl: int = 6 * 60 * 60  # 不存在或无法查看的作品的缓存时间（秒） 为 0 时不缓存
+
+    model_config = SettingsConfigDict(env_prefix="site_cache_")
+
+
 class Settings(BaseSettings):
     bot: BotConfig = BotConfig()
@@ -0,0 +1,199 @@
+import asyncio
+import os
+import shutil
+from collections import OrderedDict
+
+from paihub.base import BaseDependence
+from paihub.config import ImageCacheConfig
+from paihub.log import logger
+
+__all__ = ("ImageCache",)
+
+type ArtWorkKey = tuple[str, int]
+type PageKey = tuple[str, int, int]
+
+
+class ImageCache(BaseDependence):
+    """作品图片缓存 以 (site_key, artwork_id, page) 为键
+
+    内存层为按字节数限制的 LRU；磁盘层每个作品一个目录，总大小超出限制时按最近使用时间淘汰整个作品。
+    磁盘中只有写入了 pages 文件的目录才视为完整，避免读取到写入一半的作品。
+    作品目录创建时先写入 MARKER 标记文件，启动时只会加载或清理带有该标记的目录。
+    """
+
+    MARKER = ".paihub-image-cache"
+
+    def __init__(self):
+        config = ImageCacheConfig()
+        self.memory_bytes = config.memory_bytes
+        self.disk_path = config.disk_path
+        self.disk_bytes = config.disk_bytes
+        self._memory: OrderedDict[PageKey, bytes] = OrderedDict()
+        self._memory_size = 0
+        self._page_counts: dict[ArtWorkKey, int] = {}
+        self._disk: OrderedDict[ArtWorkKey, int] = OrderedDict()  # 作品目录 -> 占用字节数
+        self._disk_size = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def initialize(self):
+        if self.disk_bytes > 0:
+            await asyncio.to_thread(self._load_disk_index)
+            logger.info("图片磁盘缓存已加载 %s 个作品 共 %s 字节", len(self._disk), self._disk_size)
+
+    async def shutdown(self):
+        logger.info("图片缓存统计 %s", self.get_stats())
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_size": self._memory_size,
+            "disk_size": self._disk_size,
+        }
+
+    async def get(self, site_key: str, artwork_id: int) -> list[bytes] | None:
+        """获取作品的所有图片
+        :param site_key: 网站关键标识符
+        :param artwork_id: 作品ID
+        :return: 按页码排列的图片数据 未缓存时返回 None
+        """
+        key = (site_key, artwork_id)
+        images = self._get_from_memory(key)
+        if images is not None:
+            self.memory_hits += 1
+            return images
+        if key in self._disk:
+            images = await asyncio.to_thread(self._read_disk, key)
+            if images is not None:
+                self._disk.move_to_end(key)
+                self._put_to_memory(key, images)
+                self.disk_hits += 1
+                return images
+            self._forget_disk(key)
+        self.misses += 1
+        return None
+
+    async def set(self, site_key: str, artwork_id: int, images: list[bytes]):
+        """写入作品的所有图片
+        :param site_key: 网站关键标识符
+        :param artwork_id: 作品ID
+        :param images: 按页码排列的图片数据
+        """
+        key = (site_key, artwork_id)
+        self._put_to_memory(key, images)
+        if self.disk_bytes <= 0:
+            return
+        size = sum(len(image) for image in images)
+        if size > self.disk_bytes:
+            return
+        try:
+            await asyncio.to_thread(self._write_disk, key, images)
+        except OSError as exc:
+            logger.warning("写入图片磁盘缓存 [%s]%s 失败", site_key, artwork_id, exc_info=exc)
+            return
+        self._forget_disk(key)
+        self._disk[key] = size
+        self._disk_size += size
+        evicted = []
+        while self._disk_size > self.disk_bytes and self._disk:
+            old_key, old_size = self._disk.popitem(last=False)
+            self._disk_size -= old_size
+            evicted.append(old_key)
+        if evicted:
+            await asyncio.to_thread(self._remove_disk, evicted)
+
+    def _get_from_memory(self, key: ArtWorkKey) -> list[bytes] | None:
+        count = self._page_counts.get(key)
+        if count is None:
+            return None
+        images = []
+        for page in range(count):
+            data = self._memory.get((*key, page))
+            if data is None:
+                return None
+            self._memory.move_to_end((*key, page))
+            images.append(data)
+        return images
+
+    def _put_to_memory(self, key: ArtWorkKey, images: list[bytes]):
+        if sum(len(image) for image in images) > self.memory_bytes:
+            return
+        self._page_counts[key] = len(images)
+        for page, data in enumerate(images):
+            old = self._memory.pop((*key, page), None)
+            if old is not None:
+                self._memory_size -= len(old)
+            self._memory[(*key, page)] = data
+            self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            (site_key, artwork_id, _), data = self._memory.popitem(last=False)
+            self._memory_size -= len(data)
+            self._page_counts.pop((site_key, artwork_id), None)
+
+    def _forget_disk(self, key: ArtWorkKey):
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_size -= size
+
+    def _get_artwork_path(self, key: ArtWorkKey) -> str:
+        site_key, artwork_id = key
+        return os.path.join(self.disk_path, site_key, str(artwork_id))
+
+    def _load_disk_index(self):
+        if not os.path.isdir(self.disk_path):
+            return
+        entries = []
+        for site_key in os.listdir(self.disk_path):
+            site_path = os.path.join(self.disk_path, site_key)
+            if not os.path.isdir(site_path):
+                continue
+            for name in os.listdir(site_path):
+                path = os.path.join(site_path, name)
+                # 只处理带有标记文件的目录 disk_path 配置错误时不会删除其他文件
+                if not name.isdigit() or not os.path.isfile(os.path.join(path, self.MARKER)):
+                    continue
+                if not os.path.isfile(os.path.join(path, "pages")):
+                    shutil.rmtree(path, ignore_errors=True)
+                    continue
+                size = sum(
+                    entry.stat().st_size for entry in os.scandir(path) if entry.name not in ("pages", self.MARKER)
+                )
+                entries.append((os.path.getmtime(path), (site_key, int(name)), size))
+        entries.sort()
+        for _, key, size in entries:
+            self._disk[key] = size
+            self._disk_size += size
+
+    def _read_disk(self, key: ArtWorkKey) -> list[bytes] | None:
+        path = self._get_artwork_path(key)
+        try:
+            with open(os.path.join(path, "pages")) as file:
+                count = int(file.read())
+            images = []
+            for page in range(count):
+                with open(os.path.join(path, str(page)), "rb") as file:
+                    images.append(file.read())
+            os.utime(path)
+        except (OSError, ValueError):
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        return images
+
+    def _write_disk(self, key: ArtWorkKey, images: list[bytes]):
+        path = self._get_artwork_path(key)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        with open(os.path.join(path, self.MARKER), "w"):
+            pass
+        for page, data in enumerate(images):
+            with open(os.path.join(path, str(page)), "wb") as file:
+                file.write(data)
+        with open(os.path.join(path, "pages"), "w") as file:
+            file.write(str(len(images)))
+
+    def _remove_disk(self, keys: list[ArtWorkKey]):
+        for key in keys:
+            shutil.rmtree(self._get_artwork_path(key), ignore_errors=True)
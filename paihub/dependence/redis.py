@@ -10,6 +10,10 @@ class Redis(BaseDependence):
         self.client = aioredis.Redis(
             host=config.host, port=config.port, db=config.database, password=config.password, decode_responses=True
         )
+        # 读写二进制数据时使用 与 client 共用连接配置但不解码返回值
+        self.binary_client = aioredis.Redis(
+            host=config.host, port=config.port, db=config.database, password=config.password, decode_responses=False
+        )
         self.ttl = 600
 
     async def initialize(self):
@@ -27,3 +31,4 @@ class Redis(BaseDependence):
 
     async def shutdown(self):
         await self.client.close()
+        await self.binary_client.close()
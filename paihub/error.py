@@ -30,5 +30,13 @@ class ArtWorkNotFoundError(PaiHubException):
     message = "ArtWork Not Found"
 
 
+class ArtWorkUnavailableError(BadRequest):
+    message = "ArtWork Unavailable"
+
+
 class ImagesFormatNotSupported(PaiHubException):
     pass
+
+
+class ImagesTooLarge(BadRequest):
+    message = "Images Too Large"
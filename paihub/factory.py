@@ -3,6 +3,8 @@ from persica.factory.interface import InterfaceFactory
 from paihub.application import Application
 from paihub.base import ApiService, Command, Job, Repository, Service, SiteService, Spider
 from paihub.dependence.database import DataBase
+from paihub.dependence.image_cache import ImageCache
+from paihub.sites.cache import NegativeCache
 
 
 class SQLEngineFactory(InterfaceFactory[Repository]):
@@ -24,11 +26,15 @@ class ServiceFactory(InterfaceFactory[Service]):
 
 
 class SiteServiceFactory(InterfaceFactory[SiteService]):
-    def __init__(self, application: Application):
+    def __init__(self, application: Application, image_cache: ImageCache, negative_cache: NegativeCache):
         self.application = application
+        self.image_cache = image_cache
+        self.negative_cache = negative_cache
 
     def get_object(self, obj: SiteService | None) -> SiteService:
         obj.set_application(self.application)
+        obj.set_image_cache(self.image_cache)
+        obj.set_negative_cache(self.negative_cache)
         return obj
 
 
@@ -5,19 +5,20 @@ from typing import TYPE_CHECKING, Union
 
 from apscheduler.triggers.interval import IntervalTrigger
 from croniter import CroniterBadCronError, croniter
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
+from httpx import TransportError
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ParseMode
 from telegram.error import RetryAfter as BotRetryAfter
 
 from paihub.base import Job
-from paihub.entities.artwork import ImageType
-from paihub.error import ArtWorkNotFoundError
+from paihub.error import ArtWorkNotFoundError, BadRequest, ConnectionTimedOut, RetryAfter
 from paihub.log import Logger, logger
 from paihub.system.push.auto_push_entities import AutoPushMode
 from paihub.system.push.auto_push_repositories import AutoPushConfigRepository
 from paihub.system.push.services import PushService
 from paihub.system.review.entities import ReviewStatus
 from paihub.system.review.services import ReviewService
+from paihub.system.sender.services import SenderService
 from paihub.system.work.error import WorkRuleNotFound
 from paihub.system.work.repositories import WorkChannelRepository
 
@@ -34,6 +35,10 @@ class AutoPushJob(Job):
 
     STALE_RUNNING_TIMEOUT_MINUTES = 30
     RETRY_BACKOFF_MINUTES = 10
+    MAX_CONCURRENT_INITIALIZATIONS = 4
+    REVIEW_PAGE_SIZE = 50
+    IMMEDIATE_PREFETCH_SIZE = 4  # 即时模式各阶段之间队列的容量
+    IMMEDIATE_FETCH_WORKERS = 2  # 即时模式并发下载作品的数量
 
     def __init__(
         self,
@@ -41,13 +46,17 @@ class AutoPushJob(Job):
         review_service: ReviewService,
         push_service: PushService,
         work_channel_repository: WorkChannelRepository,
+        sender_service: SenderService,
     ):
         self.config_repository = config_repository
         self.review_service = review_service
         self.push_service = push_service
         self.work_channel_repository = work_channel_repository
+        self.sender_service = sender_service
         self._running_jobs: set[int] = set()  # 记录正在运行的任务ID，防止重复执行
         self._recovery_checked = False
+        self._initialize_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_INITIALIZATIONS)
+        self._tasks: set[asyncio.Task] = set()  # 持有任务引用，避免任务在执行中被回收
 
     def add_jobs(self) -> None:
         """添加定时任务"""
@@ -121,8 +130,10 @@ class AutoPushJob(Job):
                 if config.next_run_time and config.next_run_time <= now:
                     _main_logger.info("开始执行自动推送任务: %s (ID: %s)", config.name, config.id)
                     _logger.info("开始执行自动推送任务: %s (ID: %s)", config.name, config.id)
-                    # 异步执行任务，避免阻塞
-                    asyncio.create_task(self.execute_auto_push_task(config))
+                    # 异步执行任务，避免阻塞 不同配置的初始化可以并发进行
+                    task = asyncio.create_task(self.execute_auto_push_task(config))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
         except Exception as exc:
             logger.error("检查自动推送任务时发生错误", exc_info=exc)
 
@@ -172,6 +183,29 @@ class AutoPushJob(Job):
             # 移除运行标记
             self._running_jobs.discard(config_id)
 
+    async def _initialize_review(self, config) -> int | None:
+        """初始化审核队列 多个任务之间并发执行 并发数由 MAX_CONCURRENT_INITIALIZATIONS 限制
+        :param config: AutoPushConfig 配置对象
+        :return: 待审核作品数量 未配置规则时返回 None
+        """
+        async with self._initialize_semaphore:
+            start_time = asyncio.get_running_loop().time()
+            try:
+                await self.review_service.initialize_review_form_sites(
+                    work_id=config.work_id, lines_per_page=10000, create_by=config.create_by
+                )
+            except WorkRuleNotFound:
+                _main_logger.warning("Work ID %s 未配置规则，跳过任务", config.work_id)
+                _logger.warning("Work ID %s 未配置规则，跳过任务", config.work_id)
+                return None
+            count = await self.review_service.initialize_review_queue(work_id=config.work_id)
+        _logger.info(
+            "审核队列初始化完成，共 %s 个待审核作品，耗时 %.2f 秒",
+            count,
+            asyncio.get_running_loop().time() - start_time,
+        )
+        return count
+
     async def _execute_batch_mode(self, config):
         """执行批量模式的自动推送
         :param config: AutoPushConfig 配置对象
@@ -180,18 +214,9 @@ class AutoPushJob(Job):
         _logger.info("批量模式: 开始自动审核 %s 个作品", config.review_count)
 
         # 1. 初始化审核队列
-        try:
-            await self.review_service.initialize_review_form_sites(
-                work_id=config.work_id, lines_per_page=10000, create_by=config.create_by
-            )
-        except WorkRuleNotFound:
-            _main_logger.warning("Work ID %s 未配置规则，跳过任务", config.work_id)
-            _logger.warning("Work ID %s 未配置规则，跳过任务", config.work_id)
+        count = await self._initialize_review(config)
+        if count is None:
             return
-
-        count = await self.review_service.initialize_review_queue(work_id=config.work_id)
-        _logger.info("审核队列初始化完成，共 %s 个待审核作品", count)
-
         if count == 0:
             _logger.info("没有待审核作品，跳过任务")
             return
@@ -202,83 +227,96 @@ class AutoPushJob(Job):
         passed_reviews = []  # 存储通过审核的review_id
 
         # 继续审核直到达到目标数量（通过+拒绝），跳过的不计数
+        # 每次从队列取出一页作品 作者规则与历史统计按页批量查询
         while (passed_count + rejected_count) < config.review_count:
-            review_context = await self.review_service.retrieve_next_for_review(work_id=config.work_id)
-            if review_context is None:
+            review_contexts = await self.review_service.retrieve_next_batch_for_review(
+                work_id=config.work_id, count=self.REVIEW_PAGE_SIZE
+            )
+            if not review_contexts:
                 _logger.info("审核队列已空，实际处理 %d 个作品", passed_count + rejected_count)
                 break
+            auto_reviews = await self.review_service.try_auto_review_batch(
+                config.work_id, [review_context.review for review_context in review_contexts]
+            )
 
-            try:
-                auto_review = await review_context.try_auto_review()
-                if auto_review is not None and auto_review.status:
-                    # 获取作品信息
-                    artwork = await review_context.get_artwork()
-                    artwork_images = await review_context.get_artwork_images()
-
-                    # 同步到BOT_OWNER
-                    if config.push_to_owner:
-                        await self._send_to_owner(
-                            review_context, artwork, artwork_images, review_context.review_id, config.work_id
-                        )
-
-                    # 设置审核状态为通过
-                    await review_context.set_review_status(
-                        ReviewStatus.PASS,
-                        auto=True,
-                        update_by=config.create_by or 0,
-                        auto_reason=auto_review.description,
-                    )
-                    passed_reviews.append(review_context.review_id)
-                    passed_count += 1
-                    _logger.info(
-                        "作品自动通过 [%d/%d]: %s[%s]",
-                        passed_count + rejected_count,
-                        config.review_count,
-                        review_context.site_key,
-                        review_context.artwork_id,
+            for index, review_context in enumerate(review_contexts):
+                if (passed_count + rejected_count) >= config.review_count:
+                    # 已经达到目标数量 把本页剩余的作品放回审核队列
+                    await self.review_service.restore_pending_review(
+                        config.work_id, [remain.review_id for remain in review_contexts[index:]]
                     )
-                    await asyncio.sleep(2)  # 避免速率限制
-                elif auto_review is not None:
-                    # 自动拒绝
-                    # 获取作品信息（用于发送给 BOT_OWNER）
-                    artwork = await review_context.get_artwork()
-                    artwork_images = await review_context.get_artwork_images()
-
-                    # 同步到BOT_OWNER（标记为拒绝）
-                    if config.push_to_owner:
-                        await self._send_to_owner(
-                            review_context,
-                            artwork,
-                            artwork_images,
-                            review_context.review_id,
-                            config.work_id,
-                            rejected=True,
+                    break
+                auto_review = auto_reviews.get(review_context.review_id)
+                try:
+                    if auto_review is not None and auto_review.status:
+                        # 获取作品信息
+                        artwork = await review_context.get_artwork()
+                        artwork_images = await review_context.get_artwork_images()
+
+                        # 同步到BOT_OWNER
+                        if config.push_to_owner:
+                            await self._send_to_owner(
+                                review_context, artwork, artwork_images, review_context.review_id, config.work_id
+                            )
+
+                        # 设置审核状态为通过
+                        await review_context.set_review_status(
+                            ReviewStatus.PASS,
+                            auto=True,
+                            update_by=config.create_by or 0,
+                            auto_reason=auto_review.description,
                         )
-
-                    await review_context.set_review_status(
-                        ReviewStatus.REJECT,
-                        auto=True,
-                        update_by=config.create_by or 0,
-                        auto_reason=auto_review.description,
-                    )
-                    rejected_count += 1
-                    _logger.info(
-                        "作品自动拒绝 [%d/%d]: %s[%s]",
-                        passed_count + rejected_count,
-                        config.review_count,
-                        review_context.site_key,
-                        review_context.artwork_id,
-                    )
-                    await asyncio.sleep(2)  # 避免速率限制
-                else:
-                    # 无法自动审核（返回 None），跳过，不计入统计，继续下一个
-                    _logger.debug("作品无法自动审核，跳过: %s[%s]", review_context.site_key, review_context.artwork_id)
-            except ArtWorkNotFoundError:
-                await review_context.set_review_status(ReviewStatus.NOT_FOUND, update_by=config.create_by or 0)
-                _logger.warning("作品不存在: %s[%s]", review_context.site_key, review_context.artwork_id)
-            except Exception as exc:
-                await review_context.set_review_status(ReviewStatus.ERROR, update_by=config.create_by or 0)
-                _logger.error("审核作品时发生错误", exc_info=exc)
+                        passed_reviews.append(review_context.review_id)
+                        passed_count += 1
+                        _logger.info(
+                            "作品自动通过 [%d/%d]: %s[%s]",
+                            passed_count + rejected_count,
+                            config.review_count,
+                            review_context.site_key,
+                            review_context.artwork_id,
+                        )
+                    elif auto_review is not None:
+                        # 自动拒绝
+                        # 获取作品信息（用于发送给 BOT_OWNER）
+                        artwork = await review_context.get_artwork()
+                        artwork_images = await review_context.get_artwork_images()
+
+                        # 同步到BOT_OWNER（标记为拒绝）
+                        if config.push_to_owner:
+                            await self._send_to_owner(
+                                review_context,
+                                artwork,
+                                artwork_images,
+                                review_context.review_id,
+                                config.work_id,
+                                rejected=True,
+                            )
+
+                        await review_context.set_review_status(
+                            ReviewStatus.REJECT,
+                            auto=True,
+                            update_by=config.create_by or 0,
+                            auto_reason=auto_review.description,
+                        )
+                        rejected_count += 1
+                        _logger.info(
+                            "作品自动拒绝 [%d/%d]: %s[%s]",
+                            passed_count + rejected_count,
+                            config.review_count,
+                            review_context.site_key,
+                            review_context.artwork_id,
+                        )
+                    else:
+                        # 无法自动审核（返回 None），跳过，不计入统计，继续下一个
+                        _logger.debug(
+                            "作品无法自动审核，跳过: %s[%s]", review_context.site_key, review_context.artwork_id
+                        )
+                except ArtWorkNotFoundError:
+                    await review_context.set_review_status(ReviewStatus.NOT_FOUND, update_by=config.create_by or 0)
+                    _logger.warning("作品不存在: %s[%s]", review_context.site_key, review_context.artwork_id)
+                except Exception as exc:
+                    await review_context.set_review_status(ReviewStatus.ERROR, update_by=config.create_by or 0)
+                    _logger.error("审核作品时发生错误", exc_info=exc)
 
         _main_logger.info("批量模式: 完成自动审核，通过 %d 个，拒绝 %d 个", passed_count, rejected_count)
         _logger.info("批量模式: 完成自动审核，通过 %d 个，拒绝 %d 个", passed_count, rejected_count)
@@ -291,47 +329,129 @@ class AutoPushJob(Job):
 
     async def _execute_immediate_mode(self, config):
         """执行即时模式的自动推送
+
+        以流水线方式执行：分类阶段从审核队列按页取出作品并批量自动审核，下载阶段并发获取作品信息与图片，
+        发送阶段经过 SendScheduler 依次同步到 BOT_OWNER 并推送到频道。各阶段之间通过有界队列连接，
+        发送当前作品时后续作品的查询与下载同时进行。
         :param config: AutoPushConfig 配置对象
         """
         _main_logger.info("即时模式: 开始自动审核并推送 %s 个作品 (Work ID: %s)", config.review_count, config.work_id)
         _logger.info("即时模式: 开始自动审核并推送 %s 个作品", config.review_count)
 
         # 1. 初始化审核队列
-        try:
-            await self.review_service.initialize_review_form_sites(
-                work_id=config.work_id, lines_per_page=10000, create_by=config.create_by
-            )
-        except WorkRuleNotFound:
-            _main_logger.warning("Work ID %s 未配置规则，跳过任务", config.work_id)
-            _logger.warning("Work ID %s 未配置规则，跳过任务", config.work_id)
+        count = await self._initialize_review(config)
+        if count is None:
             return
-
-        count = await self.review_service.initialize_review_queue(work_id=config.work_id)
-        _logger.info("审核队列初始化完成，共 %s 个待审核作品", count)
-
         if count == 0:
             _logger.info("没有待审核作品，跳过任务")
             return
 
         # 2. 审核并立即推送
-        passed_count = 0
-        rejected_count = 0
         work_channel = await self.work_channel_repository.get_by_work_id(config.work_id)
+        classified_queue: asyncio.Queue = asyncio.Queue(maxsize=self.IMMEDIATE_PREFETCH_SIZE)
+        fetched_queue: asyncio.Queue = asyncio.Queue(maxsize=self.IMMEDIATE_PREFETCH_SIZE)
+        in_flight: set[int] = set()  # 已经从审核队列取出但尚未处理的作品 任务结束时放回审核队列
+        tasks = [asyncio.create_task(self._immediate_classify_stage(config, classified_queue, in_flight))]
+        tasks.extend(
+            asyncio.create_task(self._immediate_fetch_stage(classified_queue, fetched_queue))
+            for _ in range(self.IMMEDIATE_FETCH_WORKERS)
+        )
+        try:
+            passed_count, rejected_count = await self._immediate_send_stage(
+                config, work_channel.channel_id, fetched_queue, in_flight
+            )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if in_flight:
+                await self.review_service.restore_pending_review(config.work_id, list(in_flight))
+                _logger.info("已将 %s 个未处理的作品放回审核队列", len(in_flight))
 
-        # 继续审核直到达到目标数量（通过+拒绝），跳过的不计数
-        while (passed_count + rejected_count) < config.review_count:
-            review_context = await self.review_service.retrieve_next_for_review(work_id=config.work_id)
-            if review_context is None:
-                _logger.info("审核队列已空，实际处理 %d 个作品", passed_count + rejected_count)
-                break
+        _main_logger.info("即时模式: 完成自动审核并推送，通过 %d 个，拒绝 %d 个", passed_count, rejected_count)
+        _logger.info("即时模式: 完成自动审核并推送，通过 %d 个，拒绝 %d 个", passed_count, rejected_count)
 
+    async def _immediate_classify_stage(self, config, out_queue: asyncio.Queue, in_flight: set[int]):
+        """分类阶段 从审核队列按页取出作品并批量自动审核 无法自动审核的作品直接跳过
+        :param config: AutoPushConfig 配置对象
+        :param out_queue: 输出 (ReviewCallbackContext, AutoReviewResult)
+        :param in_flight: 已经取出但尚未处理的 ReviewID
+        """
+        try:
+            while True:
+                review_contexts = await self.review_service.retrieve_next_batch_for_review(
+                    work_id=config.work_id, count=self.REVIEW_PAGE_SIZE
+                )
+                if not review_contexts:
+                    _logger.info("审核队列已空")
+                    break
+                in_flight.update(review_context.review_id for review_context in review_contexts)
+                auto_reviews = await self.review_service.try_auto_review_batch(
+                    config.work_id, [review_context.review for review_context in review_contexts]
+                )
+                for review_context in review_contexts:
+                    auto_review = auto_reviews.get(review_context.review_id)
+                    if auto_review is None:
+                        # 无法自动审核（返回 None），跳过，不计入统计，继续下一个
+                        in_flight.discard(review_context.review_id)
+                        _logger.debug(
+                            "作品无法自动审核，跳过: %s[%s]", review_context.site_key, review_context.artwork_id
+                        )
+                        continue
+                    await out_queue.put((review_context, auto_review))
+        except Exception as exc:
+            _logger.error("从审核队列获取作品时发生错误", exc_info=exc)
+        for _ in range(self.IMMEDIATE_FETCH_WORKERS):
+            await out_queue.put(None)
+
+    async def _immediate_fetch_stage(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        """下载阶段 获取作品信息与图片 异常交给发送阶段按原有方式处理
+        :param in_queue: 输入 (ReviewCallbackContext, AutoReviewResult)
+        :param out_queue: 输出 (ReviewCallbackContext, AutoReviewResult, Exception | None)
+        """
+        while True:
+            item = await in_queue.get()
+            if item is None:
+                await out_queue.put(None)
+                return
+            review_context, auto_review = item
+            error = None
             try:
-                auto_review = await review_context.try_auto_review()
-                if auto_review is not None and auto_review.status:
-                    # 获取作品信息
-                    artwork = await review_context.get_artwork()
-                    artwork_images = await review_context.get_artwork_images()
+                await review_context.get_artwork()
+                await review_context.get_artwork_images()
+            except Exception as exc:
+                error = exc
+            await out_queue.put((review_context, auto_review, error))
 
+    async def _immediate_send_stage(
+        self, config, channel_id: int, in_queue: asyncio.Queue, in_flight: set[int]
+    ) -> tuple[int, int]:
+        """发送阶段 同步到 BOT_OWNER 设置审核状态并推送到频道 达到目标数量（通过+拒绝）后结束
+        :param config: AutoPushConfig 配置对象
+        :param channel_id: 频道ID
+        :param in_queue: 输入 (ReviewCallbackContext, AutoReviewResult, Exception | None)
+        :param in_flight: 已经取出但尚未处理的 ReviewID
+        :return: (通过数量, 拒绝数量)
+        """
+        passed_count = 0
+        rejected_count = 0
+        finished_workers = 0
+        while (passed_count + rejected_count) < config.review_count:
+            item = await in_queue.get()
+            if item is None:
+                finished_workers += 1
+                if finished_workers == self.IMMEDIATE_FETCH_WORKERS:
+                    _logger.info("审核队列已空，实际处理 %d 个作品", passed_count + rejected_count)
+                    break
+                continue
+            review_context, auto_review, error = item
+            in_flight.discard(review_context.review_id)
+            try:
+                if error is not None:
+                    raise error  # noqa: TRY301
+                artwork = await review_context.get_artwork()
+                artwork_images = await review_context.get_artwork_images()
+                if auto_review.status:
                     # 同步到BOT_OWNER
                     if config.push_to_owner:
                         await self._send_to_owner(
@@ -354,7 +474,7 @@ class AutoPushJob(Job):
                             review_context,
                             artwork,
                             artwork_images,
-                            work_channel.channel_id,
+                            channel_id,
                             review_context.review_id,
                             config.create_by or 0,
                         )
@@ -377,12 +497,7 @@ class AutoPushJob(Job):
                             passed_count + rejected_count,
                             config.review_count,
                         )
-                elif auto_review is not None:
-                    # 自动拒绝
-                    # 获取作品信息（用于发送给 BOT_OWNER）
-                    artwork = await review_context.get_artwork()
-                    artwork_images = await review_context.get_artwork_images()
-
+                else:
                     # 同步到BOT_OWNER（标记为拒绝）
                     if config.push_to_owner:
                         await self._send_to_owner(
@@ -408,23 +523,15 @@ class AutoPushJob(Job):
                         review_context.site_key,
                         review_context.artwork_id,
                     )
-                else:
-                    # 无法自动审核（返回 None），跳过，不计入统计，继续下一个
-                    _logger.debug("作品无法自动审核，跳过: %s[%s]", review_context.site_key, review_context.artwork_id)
             except ArtWorkNotFoundError:
                 await review_context.set_review_status(ReviewStatus.NOT_FOUND, update_by=config.create_by or 0)
                 _logger.warning("作品不存在: %s[%s]", review_context.site_key, review_context.artwork_id)
             except BotRetryAfter as exc:
-                _logger.warning("触发Telegram速率限制，等待 %s 秒", exc.retry_after)
-                await asyncio.sleep(exc.retry_after + 1)
+                _logger.warning("多次触发Telegram速率限制，跳过作品，需要等待 %s 秒", exc.retry_after)
             except Exception as exc:
                 await review_context.set_review_status(ReviewStatus.ERROR, update_by=config.create_by or 0)
                 _logger.error("审核或推送作品时发生错误", exc_info=exc)
-
-            await asyncio.sleep(3)  # 避免速率限制
-
-        _main_logger.info("即时模式: 完成自动审核并推送，通过 %d 个，拒绝 %d 个", passed_count, rejected_count)
-        _logger.info("即时模式: 完成自动审核并推送，通过 %d 个，拒绝 %d 个", passed_count, rejected_count)
+        return passed_count, rejected_count
 
     async def _send_to_owner(
         self,
@@ -444,7 +551,6 @@ class AutoPushJob(Job):
         :param rejected: 是否为拒绝的作品
         """
         try:
-            bot = self.application.bot.bot  # 获取真正的 Bot 对象
             owner_id = self.application.settings.bot.owner
 
             status_text = "自动审核拒绝" if rejected else "自动审核通过"
@@ -458,34 +564,14 @@ class AutoPushJob(Job):
                 f"Review ID: {review_id} | Work ID: {work_id}"
             )
 
-            if len(artwork_images) > 1:
-                media = [InputMediaPhoto(media=artwork_images[0], caption=caption, parse_mode=ParseMode.HTML)]
-                media.extend(InputMediaPhoto(media=data) for data in artwork_images[1:])
-                media = media[:10]
-                await bot.send_media_group(
-                    chat_id=owner_id, media=media, connect_timeout=10, read_timeout=10, write_timeout=30
-                )
-            elif len(artwork_images) == 1:
-                if artwork.image_type == ImageType.STATIC:
-                    await bot.send_photo(
-                        chat_id=owner_id,
-                        photo=artwork_images[0],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML,
-                        connect_timeout=10,
-                        read_timeout=10,
-                        write_timeout=30,
-                    )
-                elif artwork.image_type == ImageType.DYNAMIC:
-                    await bot.send_video(
-                        chat_id=owner_id,
-                        video=artwork_images[0],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML,
-                        connect_timeout=10,
-                        read_timeout=10,
-                        write_timeout=30,
-                    )
+            await self.sender_service.send_artwork(
+                review_context.site_key,
+                review_context.artwork_id,
+                artwork_images,
+                artwork.image_type,
+                caption,
+                chat_id=owner_id,
+            )
 
             # 发送撤销按钮
             keyboard = [
@@ -498,8 +584,8 @@ class AutoPushJob(Job):
             ]
 
             message_text = f"当前作品已经{status_text}\n正在获取下一个作品"
-            await bot.send_message(
-                chat_id=owner_id,
+            await self.sender_service.send_message(
+                owner_id,
                 text=message_text,
                 reply_markup=InlineKeyboardMarkup(keyboard),
                 parse_mode=ParseMode.HTML,
@@ -525,7 +611,6 @@ class AutoPushJob(Job):
         :param create_by: 创建人ID
         """
         try:
-            bot = self.application.bot.bot  # 获取真正的 Bot 对象
             formatted_tags = await context.format_artwork_tags(artwork, filter_character_tags=True)
             caption = (
                 f"Title: {html.escape(artwork.title)}\n"
@@ -534,44 +619,28 @@ class AutoPushJob(Job):
                 f"By <a href='{artwork.author.url}'>{html.escape(artwork.author.name)}</a>"
             )
 
-            message_id = None
-            if len(artwork_images) > 1:
-                media = [InputMediaPhoto(media=artwork_images[0], caption=caption, parse_mode=ParseMode.HTML)]
-                media.extend(InputMediaPhoto(media=data) for data in artwork_images[1:])
-                media = media[:10]
-                messages = await bot.send_media_group(
-                    chat_id=channel_id, media=media, connect_timeout=10, read_timeout=10, write_timeout=30
-                )
-                message_id = messages[0].id
-            elif len(artwork_images) == 1:
-                if artwork.image_type == ImageType.STATIC:
-                    msg = await bot.send_photo(
-                        chat_id=channel_id,
-                        photo=artwork_images[0],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML,
-                        connect_timeout=10,
-                        read_timeout=10,
-                        write_timeout=30,
-                    )
-                    message_id = msg.id
-                elif artwork.image_type == ImageType.DYNAMIC:
-                    msg = await bot.send_video(
-                        chat_id=channel_id,
-                        video=artwork_images[0],
-                        caption=caption,
-                        parse_mode=ParseMode.HTML,
-                        connect_timeout=10,
-                        read_timeout=10,
-                        write_timeout=30,
-                    )
-                    message_id = msg.id
+            messages = await self.sender_service.send_artwork(
+                context.site_service.site_key,
+                context.artwork_id,
+                artwork_images,
+                artwork.image_type,
+                caption,
+                chat_id=channel_id,
+            )
+            message_id = messages[0].id if messages else None
 
             # 记录推送信息
             if message_id:
                 await self.push_service.set_send_push(
                     review_id=review_id, channel_id=channel_id, message_id=message_id, status=True, create_by=create_by
                 )
+            else:
+                await self.push_service.set_send_push(
+                    review_id=review_id, channel_id=channel_id, message_id=0, status=False, create_by=create_by
+                )
+        except BotRetryAfter:
+            # 触发速率限制时作品没有发出 由调用方决定是否重新推送
+            raise
         except Exception:
             # 记录推送失败
             await self.push_service.set_send_push(
@@ -591,14 +660,15 @@ class AutoPushJob(Job):
 
         work_channel = await self.work_channel_repository.get_by_work_id(work_id)
 
-        # 将通过审核的作品添加到推送队列
-        await self.push_service.push_cache.set_pending_push(work_id, review_ids)
-        _logger.info("已将 %s 个作品添加到推送队列", len(review_ids))
+        # 将通过审核的作品写入发件箱并添加到推送队列 上次中断的推送会一并恢复
+        await self.push_service.enqueue_push(work_id, review_ids)
+        total = await self.push_service.recover_push(work_id)
+        _logger.info("已将 %s 个作品添加到推送队列，当前队列共 %s 个作品", len(review_ids), total)
 
         # 逐个推送
         success_count = 0
         failed_count = 0
-        for _ in range(len(review_ids)):
+        for _ in range(total):
             push_context = await self.push_service.get_next_push_with_validation(work_id=work_id)
             if push_context is None:
                 _logger.warning("推送队列为空，跳过")
@@ -607,7 +677,29 @@ class AutoPushJob(Job):
             try:
                 artwork = await push_context.get_artwork()
                 artwork_images = await push_context.get_artwork_images()
+            except (RetryAfter, ConnectionTimedOut, TimeoutError, TransportError) as exc:
+                # 暂时性的错误 还没有发送 放回队列等待下次推送
+                await push_context.undo_push()
+                failed_count += 1
+                _logger.warning("获取作品时发生暂时性错误: Review ID %s", push_context.review_id, exc_info=exc)
+                continue
+            except Exception as exc:
+                # 作品不存在、无法查看等错误重试也不会成功 与 /push 一样记录为推送失败
+                await self.push_service.set_send_push(
+                    review_id=push_context.review_id,
+                    channel_id=work_channel.channel_id,
+                    message_id=0,
+                    status=False,
+                    create_by=create_by,
+                )
+                failed_count += 1
+                if isinstance(exc, ArtWorkNotFoundError | BadRequest):
+                    _logger.warning("作品无法推送: Review ID %s %s", push_context.review_id, exc)
+                else:
+                    _logger.error("获取作品时发生错误: Review ID %s", push_context.review_id, exc_info=exc)
+                continue
 
+            try:
                 await self._push_single_artwork(
                     push_context,
                     artwork,
@@ -621,14 +713,12 @@ class AutoPushJob(Job):
             except BotRetryAfter as exc:
                 await push_context.undo_push()
                 failed_count += 1
-                _logger.warning("触发Telegram速率限制，等待 %s 秒", exc.retry_after)
-                await asyncio.sleep(exc.retry_after + 1)
+                _logger.warning("多次触发Telegram速率限制，需要等待 %s 秒", exc.retry_after)
             except Exception as exc:
+                # _push_single_artwork 已经记录为推送失败
                 failed_count += 1
                 _logger.error("推送作品时发生错误: Review ID %s", push_context.review_id, exc_info=exc)
 
-            await asyncio.sleep(3)  # 避免速率限制
-
         _main_logger.info("批量推送完成: 成功 %d 个，失败 %d 个", success_count, failed_count)
         _logger.info("批量推送完成: 成功 %d 个，失败 %d 个", success_count, failed_count)
 
@@ -7,11 +7,12 @@
 from sqlmodel import SQLModel
 
 # 导入所有表
-from paihub.sites.pixiv.entities import Pixiv
+from paihub.sites.pixiv.entities import Pixiv, PixivTag
 from paihub.system.name_map.entities import NameMapConfig
 from paihub.system.push.auto_push_entities import AutoPushConfig
 from paihub.system.push.entities import Push
-from paihub.system.review.entities import Review, ReviewAuthorRule
+from paihub.system.push.outbox_entities import PushOutbox
+from paihub.system.review.entities import Review, ReviewAuthorRule, ReviewAuthorStats
 from paihub.system.user.entities import User
 from paihub.system.work.entities import Work, WorkChannel, WorkRule
 
@@ -22,9 +23,12 @@ __all__ = [
     "metadata",
     "AutoPushConfig",
     "Pixiv",
+    "PixivTag",
     "Push",
+    "PushOutbox",
     "Review",
     "ReviewAuthorRule",
+    "ReviewAuthorStats",
     "User",
     "Work",
     "WorkChannel",
@@ -0,0 +1,241 @@
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from functools import wraps
+from typing import Any
+
+from paihub.base import Component
+from paihub.config import SiteCacheConfig
+from paihub.dependence.redis import Redis
+from paihub.error import ArtWorkNotFoundError, ArtWorkUnavailableError
+from paihub.log import logger
+
+try:
+    import orjson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+__all__ = ("LocalCache", "NegativeCache", "TieredCache", "pack_entry", "tiered_get", "tiered_set", "unpack_entry")
+
+_ENTRY_MAGIC = b"PHC"
+
+
+class LocalCache:
+    """按条目数量限制的进程内 LRU 缓存 每个条目在写入 ttl 秒后过期
+
+    缓存的对象由调用方共享，读取后不应修改。
+    """
+
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, now: float | None = None) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expire_at, value = item
+        if expire_at <= (time.monotonic() if now is None else now):
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, now: float | None = None):
+        if self.size <= 0:
+            return
+        self._data[key] = ((time.monotonic() if now is None else now) + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def record_compact(self, raw_bytes: int, stored_bytes: int):
+        """记录写入 Redis 的字节数 用于统计精简后节省的空间
+        :param raw_bytes: 原始响应的字节数
+        :param stored_bytes: 实际写入的字节数
+        """
+        self.raw_bytes += raw_bytes
+        self.stored_bytes += stored_bytes
+
+    def get_stats(self) -> dict[str, int]:
+        stats = {
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "size": len(self._data),
+        }
+        if self.raw_bytes:
+            stats["saved_bytes"] = self.raw_bytes - self.stored_bytes
+        return stats
+
+
+class TieredCache(Component):
+    """站点缓存的进程内一级缓存
+
+    站点缓存仍以 Redis 作为二级缓存，通过 tiered_get 与 tiered_set 装饰读写方法后，
+    同一对象在一级缓存有效期内只需要从 Redis 读取并解码一次。每个命名空间单独统计命中情况。
+    """
+
+    def __init__(self):
+        config = SiteCacheConfig()
+        self.local_size = config.local_size
+        self.local_ttl = config.local_ttl
+        self._namespaces: dict[str, LocalCache] = {}
+
+    async def shutdown(self):
+        logger.info("站点缓存统计 %s", self.get_stats())
+
+    def namespace(self, name: str) -> LocalCache:
+        local = self._namespaces.get(name)
+        if local is None:
+            local = self._namespaces[name] = LocalCache(self.local_size, self.local_ttl)
+        return local
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        return {name: local.get_stats() for name, local in self._namespaces.items()}
+
+
+class NegativeCache(Component):
+    """记录不存在或无法查看的作品 以 (site_key, artwork_id) 为键
+
+    作品被删除或需要更高权限时，在 negative_ttl 秒内再次获取直接抛出相同的错误，不再请求网站。
+    记录保存在 Redis 中供所有进程共享，进程内缓存减少重复读取 Redis。
+    """
+
+    def __init__(self, redis: Redis):
+        config = SiteCacheConfig()
+        self.client = redis.client
+        self.ttl = config.negative_ttl
+        self.local = LocalCache(config.local_size, min(config.local_ttl, config.negative_ttl))
+        self.stores = 0
+
+    async def shutdown(self):
+        logger.info("作品不存在缓存统计 %s", self.get_stats())
+
+    @staticmethod
+    def get_key(site_key: str, artwork_id: int) -> str:
+        return f"site:negative:{site_key}:{artwork_id}"
+
+    async def check(self, site_key: str, artwork_id: int):
+        """作品已记录为不存在或无法查看时抛出对应的错误
+        :param site_key: 网站关键标识符
+        :param artwork_id: 作品ID
+        """
+        if self.ttl <= 0:
+            return
+        key = (site_key, artwork_id)
+        value = self.local.get(key)
+        if value is not None:
+            self.local.local_hits += 1
+        else:
+            value = await self.client.get(self.get_key(site_key, artwork_id))
+            if value is None:
+                self.local.misses += 1
+                return
+            self.local.remote_hits += 1
+            self.local.set(key, value)
+        kind, _, message = value.partition(":")
+        if kind == "unavailable":
+            raise ArtWorkUnavailableError(message or None)
+        raise ArtWorkNotFoundError(message or None)
+
+    async def set(self, site_key: str, artwork_id: int, error: ArtWorkNotFoundError | ArtWorkUnavailableError):
+        """记录作品不存在或无法查看
+        :param site_key: 网站关键标识符
+        :param artwork_id: 作品ID
+        :param error: 获取作品时抛出的错误 再次获取时按相同类型与信息抛出
+        """
+        if self.ttl <= 0:
+            return
+        kind = "unavailable" if isinstance(error, ArtWorkUnavailableError) else "not_found"
+        value = f"{kind}:{error.message or ''}"
+        await self.client.set(self.get_key(site_key, artwork_id), value, ex=self.ttl)
+        self.local.set((site_key, artwork_id), value)
+        self.stores += 1
+
+    def get_stats(self) -> dict[str, int]:
+        return {**self.local.get_stats(), "stores": self.stores}
+
+
+type CacheGetter = Callable[[Any, Hashable], Awaitable[Any | None]]
+type CacheSetter = Callable[..., Awaitable[None]]
+
+
+def pack_entry(value: Any, version: int) -> bytes:
+    """把缓存内容编码为带版本号的压缩数据
+    :param value: 可以序列化为 JSON 的对象
+    :param version: 数据结构版本 结构变更时递增
+    :return: 编码后的数据
+    """
+    data = jsonlib.dumps(value)
+    if isinstance(data, str):
+        data = data.encode()
+    return _ENTRY_MAGIC + bytes([version]) + zlib.compress(data)
+
+
+def unpack_entry(data: bytes | None, version: int) -> Any | None:
+    """解码 pack_entry 编码的数据 旧格式或版本不一致时返回 None 视为未缓存
+    :param data: Redis 中读取的数据
+    :param version: 当前数据结构版本
+    :return: 缓存内容
+    """
+    header = _ENTRY_MAGIC + bytes([version])
+    if data is None or not data.startswith(header):
+        return None
+    return jsonlib.loads(zlib.decompress(data[len(header) :]))
+
+
+def tiered_get(namespace: str) -> Callable[[CacheGetter], CacheGetter]:
+    """装饰站点缓存的读取方法 先查询进程内缓存 未命中时再调用原方法从 Redis 读取
+    被装饰方法所在的对象需要有 tiered_cache 属性
+    :param namespace: 命名空间 与对应的 tiered_set 一致
+    """
+
+    def decorator(func: CacheGetter) -> CacheGetter:
+        @wraps(func)
+        async def wrapper(self, key: Hashable) -> Any | None:
+            local = self.tiered_cache.namespace(namespace)
+            value = local.get(key)
+            if value is not None:
+                local.local_hits += 1
+                return value
+            value = await func(self, key)
+            if value is None:
+                local.misses += 1
+                return None
+            local.remote_hits += 1
+            local.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def tiered_set(namespace: str) -> Callable[[CacheSetter], CacheSetter]:
+    """装饰站点缓存的写入方法 写入 Redis 后同时写入进程内缓存
+    :param namespace: 命名空间 与对应的 tiered_get 一致
+    """
+
+    def decorator(func: CacheSetter) -> CacheSetter:
+        @wraps(func)
+        async def wrapper(self, key: Hashable, value: Any, **kwargs):
+            await func(self, key, value, **kwargs)
+            self.tiered_cache.namespace(namespace).set(key, value)
+
+        return wrapper
+
+    return decorator
@@ -1,50 +1,105 @@
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import batched
 from typing import TYPE_CHECKING, Any, cast
 
 from curl_cffi import AsyncSession
+from curl_cffi.requests.exceptions import RequestException
 from httpx import codes
-from pybooru import Danbooru, PybooruHTTPError
 
 from paihub.base import ApiService
-from paihub.error import ArtWorkNotFoundError, BadRequest
+from paihub.error import ArtWorkNotFoundError, ArtWorkUnavailableError, BadRequest
 from paihub.sites.danbooru.cache import DanbooruCache
 from paihub.sites.danbooru.entities import DanbooruArtWork, DanbooruUploader
-from paihub.utils.functools import async_wrap
+from paihub.sites.danbooru.utils import project_post
+from paihub.utils.stream import read_stream
 
 if TYPE_CHECKING:
     from curl_cffi import Response
 
 
 class DanbooruApi(ApiService):
+    """Danbooru API
+
+    元数据查询与图片下载共用同一个 AsyncSession 复用连接，批量查询时每次请求最多获取 batch_size 个作品。
+    """
+
+    base_url = "https://danbooru.donmai.us"
+    batch_size = 100
+
     def __init__(self, cache: DanbooruCache):
-        self.api = Danbooru("danbooru")
-        executor = ThreadPoolExecutor(max_workers=2)
-        self.post_show = async_wrap(self.api.post_show, executor=executor)
-        self.post_list = async_wrap(self.api.post_list, executor=executor)
         self.cache = cache
-        self.download_client = AsyncSession(impersonate="chrome")
+        self.client = AsyncSession(impersonate="chrome", timeout=30)
+
+    async def shutdown(self) -> None:
+        await self.client.close()
 
-    async def get_post(self, post_id: int | None = None, md5: str | None = None) -> dict[str, Any]:
+    async def _request_json(self, path: str, params: dict[str, Any] | None = None) -> tuple[Any, int]:
+        """请求 API 并解析 JSON
+        :return: 解析后的数据与响应的字节数
+        """
         try:
-            if post_id:
-                post = await self.post_show(post_id)
-            else:
-                post = await self.post_list(md5=md5)
-        except PybooruHTTPError as err:
-            message = err.__str__()
-            if "Not Found" in message:
-                raise ArtWorkNotFoundError("Post not found") from err
-            raise BadRequest("Pybooru HTTP Error") from err
+            response = await self.client.get(f"{self.base_url}/{path}", params=params)
+        except RequestException as exc:
+            raise BadRequest(f"Danbooru Api Request Error: {exc}") from exc
+        if response.status_code == codes.NOT_FOUND:
+            raise ArtWorkNotFoundError("Post not found")
+        if codes.is_error(response.status_code):
+            raise BadRequest(f"Danbooru Api Error: {response.status_code}")
+        return response.json(), len(response.content)
+
+    async def post_show(self, post_id: int) -> tuple[dict[str, Any], int]:
+        return await self._request_json(f"posts/{post_id}.json")
+
+    async def post_list(self, md5: str) -> tuple[dict[str, Any], int]:
+        return await self._request_json("posts.json", params={"md5": md5})
+
+    async def get_posts(self, post_ids: list[int]) -> dict[int, tuple[dict[str, Any], int]]:
+        """批量获取作品 通过 id 元标签在一次请求中查询多个作品
+        :param post_ids: 作品ID列表
+        :return: 以作品ID为键的作品与其分摊的响应字节数 不存在的作品不会出现在结果中
+        """
+        posts: dict[int, tuple[dict[str, Any], int]] = {}
+        for chunk in batched(dict.fromkeys(post_ids), self.batch_size):
+            params = {"tags": "id:" + ",".join(str(post_id) for post_id in chunk), "limit": len(chunk)}
+            data, size = await self._request_json("posts.json", params=params)
+            for post in data:
+                posts[post["id"]] = (post, size // len(data))
+        return posts
+
+    async def get_post(self, post_id: int | None = None, md5: str | None = None) -> tuple[dict[str, Any], int]:
+        post, size = await self.post_show(post_id) if post_id else await self.post_list(md5=md5)
         if "file_url" not in post:
-            raise BadRequest("You may need a gold account to view this post\nSource: " + post["source"])
-        return post
+            raise ArtWorkUnavailableError("You may need a gold account to view this post\nSource: " + post["source"])
+        return post, size
 
-    async def get_artwork_info(self, post_id: int | None = None) -> DanbooruArtWork:
+    async def prefetch_posts(self, post_ids: list[int]) -> int:
+        """批量获取尚未缓存的作品并写入缓存
+        :param post_ids: 作品ID列表
+        :return: 写入缓存的作品数量
+        """
+        missing = [post_id for post_id in post_ids if await self.cache.get_result(post_id) is None]
+        if not missing:
+            return 0
+        count = 0
+        for post_id, (post, size) in (await self.get_posts(missing)).items():
+            # 需要更高权限才能查看的作品不缓存 单独获取时再报告错误
+            if "file_url" not in post:
+                continue
+            await self.cache.set_result(post_id, project_post(post), raw_bytes=size)
+            count += 1
+        return count
+
+    async def get_cached_post(self, post_id: int) -> dict[str, Any]:
+        """获取作品 缓存中只保存 project_post 精简后的字段"""
         post = await self.cache.get_result(post_id)
         if post is None:
-            post = await self.get_post(post_id)
-            await self.cache.set_result(post_id, post)
+            raw, size = await self.get_post(post_id)
+            post = project_post(raw)
+            await self.cache.set_result(post_id, post, raw_bytes=size)
+        return post
+
+    async def get_artwork_info(self, post_id: int | None = None) -> DanbooruArtWork:
+        post = await self.get_cached_post(post_id)
         created_at = datetime.fromisoformat(post["created_at"])
         source = post["source"]
         tags = post["tag_string"].split(" ")
@@ -60,19 +115,14 @@ class DanbooruApi(ApiService):
         )
 
     async def get_artwork_images(self, post_id: int | None = None) -> list[bytes]:
-        post = await self.cache.get_result(post_id)
-        if post is None:
-            post = await self.get_post(post_id)
-            await self.cache.set_result(post_id, post)
+        post = await self.get_cached_post(post_id)
         url = post["file_url"]
-        data = b""
-        async with self.download_client.stream("GET", url) as response:
+        async with self.client.stream("GET", url) as response:
             response = cast("Response", response)
             if codes.is_error(response.status_code):
                 raise BadRequest(f"Danbooru Api Get Images Error: {response.status_code}")
             content_type = response.headers.get("Content-Type", "")
             if not content_type.startswith("image/"):
                 raise BadRequest(f"Danbooru Api Get Images Content Type Error: {content_type}")
-            async for chunk in response.aiter_content():
-                data += chunk
+            data = await read_stream(response.aiter_content(), response.headers.get("Content-Length"))
         return [data]
@@ -1,22 +1,31 @@
 from paihub.base import Component
 from paihub.dependence.redis import Redis
-
-try:
-    import orjson as jsonlib
-except ImportError:
-    import json as jsonlib
+from paihub.sites.cache import TieredCache, pack_entry, tiered_get, tiered_set, unpack_entry
 
 
 class DanbooruCache(Component):
-    def __init__(self, redis: Redis):
+    result_version = 1  # 精简后的作品结构版本 结构变更时递增 旧版本的缓存会被忽略
+
+    def __init__(self, redis: Redis, tiered_cache: TieredCache):
         self.client = redis.client
+        self.binary_client = redis.binary_client
+        self.tiered_cache = tiered_cache
         self.ttl = 60 * 60
 
+    @tiered_get("danbooru:web")
     async def get_result(self, post_id: int) -> dict | None:
-        data = await self.client.get(f"danbooru:web:{post_id}")
-        if data is None:
-            return None
-        return jsonlib.loads(data)
+        """获取 project_post 精简后的作品"""
+        data = await self.binary_client.get(f"danbooru:web:{post_id}")
+        return unpack_entry(data, self.result_version)
 
-    async def set_result(self, post_id: int, value: dict):
-        await self.client.set(f"danbooru:web:{post_id}", jsonlib.dumps(value), ex=self.ttl)
+    @tiered_set("danbooru:web")
+    async def set_result(self, post_id: int, value: dict, raw_bytes: int = 0):
+        """写入 project_post 精简后的作品
+        :param post_id: 作品ID
+        :param value: 精简后的作品
+        :param raw_bytes: 原始响应的字节数 用于统计节省的空间
+        """
+        data = pack_entry(value, self.result_version)
+        await self.binary_client.set(f"danbooru:web:{post_id}", data, ex=self.ttl)
+        if raw_bytes:
+            self.tiered_cache.namespace("danbooru:web").record_compact(raw_bytes, len(data))
@@ -17,6 +17,9 @@ class DanbooruSitesService(SiteService):
     async def get_artwork_images(self, artwork_id: int) -> list[bytes]:
         return await self.api.get_artwork_images(artwork_id)
 
+    async def prefetch_artworks(self, artwork_ids: list[int]) -> int:
+        return await self.api.prefetch_posts(artwork_ids)
+
     @staticmethod
     def extract(text: str) -> int | None:
         for pattern in compiled_patterns:
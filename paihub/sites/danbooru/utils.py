@@ -8,3 +8,11 @@ patterns = [
 
 # 必须预编译表达式 否则性能会下降
 compiled_patterns = [re.compile(p) for p in patterns]
+
+# 缓存中保留的作品字段
+post_fields = ("id", "created_at", "source", "tag_string", "uploader_id", "file_url")
+
+
+def project_post(post: dict) -> dict:
+    """只保留生成作品信息与下载图片需要的字段 用于缓存"""
+    return {field: post[field] for field in post_fields if field in post}
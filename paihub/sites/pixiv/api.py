@@ -8,18 +8,22 @@ from urllib.parse import parse_qs, urlencode, urlparse
 
 from apscheduler.triggers.interval import IntervalTrigger
 from async_pixiv import PixivClient
+from async_pixiv.client.api._illust import IllustDetail
 from async_pixiv.const import APP_API_HOST
-from async_pixiv.error import LoginError, PixivError
+from async_pixiv.error import DataValidationError, LoginError, PixivError
 from async_pixiv.model import Illust, PixivModel, User
+from async_pixiv.model.other.enums import SearchFilter
 from async_pixiv.model.other.result import PageResult
 from async_pixiv.utils.context import set_pixiv_client
 from async_pixiv.utils.rate_limiter import RateLimiter
-from pydantic import Field
+from pydantic import Field, ValidationError
 
 from paihub.base import ApiService
 from paihub.entities.config import TomlConfig
 from paihub.log import logger
 from paihub.sites.pixiv.cache import PixivCache
+from paihub.utils.downloader import ConcurrentDownloader
+from paihub.utils.singleflight import SingleFlight
 from pixnet.client.web import WebClient
 from pixnet.errors import BadRequest as PixNetBadRequest
 
@@ -68,9 +72,11 @@ class PixivMobileApi(ApiService):
         )
         self.cache = cache
         self.config = TomlConfig("config/pixiv.toml")
+        self.downloader = ConcurrentDownloader("Pixiv", self.config.get("download", {}).get("concurrency", 4))
         self.illust: IllustAPI = self.client.ILLUST
         self.user: UserAPI = self.client.USER
         self.novel: NovelAPI = self.client.NOVEL
+        self._illust_detail_flight: SingleFlight[int, IllustDetail] = SingleFlight()
 
     async def initialize(self) -> None:
         await self.login()
@@ -113,6 +119,32 @@ class PixivMobileApi(ApiService):
             except PixivError as exc:
                 logger.error("[blue]Pixiv[/blue] Login Error", exc_info=exc)
 
+    async def illust_detail(self, artwork_id: int) -> IllustDetail:
+        """获取作品详情
+
+        同一作品的并发请求只会调用一次 API，结果写入 PixivCache（进程内与 Redis），
+        审核与推送时 get_artwork 与 get_artwork_images 只消耗一次 API 配额。
+        :param artwork_id: 作品ID
+        :return: 作品详情
+        """
+        return await self._illust_detail_flight.do(artwork_id, lambda: self._fetch_illust_detail(artwork_id))
+
+    async def _fetch_illust_detail(self, artwork_id: int) -> IllustDetail:
+        data = await self.cache.get_illust_detail(artwork_id)
+        if data is None:
+            response = await self.client.request_get(
+                APP_API_HOST / "v1/illust/detail",
+                params={"illust_id": artwork_id, "filter": SearchFilter.ANDROID},
+            )
+            response.raise_for_result().raise_for_status()
+            data = response.json()
+            await self.cache.set_illust_detail(artwork_id, data)
+        with set_pixiv_client(self.client):
+            try:
+                return IllustDetail.model_validate(data)
+            except ValidationError as exc:
+                raise DataValidationError(data) from exc
+
     async def user_follow_add(self, user_id: int | str, restrict: str = "public") -> dict[str, Any]:
         url = APP_API_HOST / "v1/user/follow/add"
         data = {"user_id": user_id, "restrict": restrict}
@@ -1,7 +1,9 @@
 from collections.abc import Iterable
+from datetime import datetime
 
 from paihub.base import Component
 from paihub.dependence.redis import Redis
+from paihub.sites.cache import TieredCache, tiered_get, tiered_set
 
 try:
     import orjson as jsonlib
@@ -12,24 +14,85 @@ except ImportError:
 class PixivReviewCache(Component):
     def __init__(self, redis: Redis):
         self.client = redis.client
+        self.ttl = 60 * 60  # 中间集合只在初始化期间使用 防止异常退出后残留
+        self.stream_ttl = 2 * 24 * 60 * 60  # 爬虫每次运行都会续期 爬虫停止后候选集合不再可信
 
-    async def del_review_all_cache(self):
-        await self.client.delete("pixiv:review:database")
-        await self.client.delete("pixiv:review:already")
+    async def del_review_all_cache(self, work_id: int):
+        await self.client.delete(f"pixiv:review:{work_id}:database", f"pixiv:review:{work_id}:already")
 
-    async def set_database_artwork_ids(self, values: Iterable[int]) -> int:
-        return await self.client.sadd("pixiv:review:database", *values)
+    async def set_database_artwork_ids(self, work_id: int, values: Iterable[int]) -> int:
+        key = f"pixiv:review:{work_id}:database"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.sadd(key, *values)
+            pipe.expire(key, self.ttl)
+            result = await pipe.execute()
+        return result[0]
 
-    async def set_already_review_artwork_ids(self, values: Iterable[int]) -> int:
-        return await self.client.sadd("pixiv:review:already", *values)
+    async def set_already_review_artwork_ids(self, work_id: int, values: Iterable[int]) -> int:
+        key = f"pixiv:review:{work_id}:already"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.sadd(key, *values)
+            pipe.expire(key, self.ttl)
+            result = await pipe.execute()
+        return result[0]
 
-    async def get_ready_review_artwork_ids(self) -> list[int]:
-        return await self.client.sdiff("pixiv:review:database", "pixiv:review:already")
+    async def get_ready_review_artwork_ids(self, work_id: int) -> list[int]:
+        return await self.client.sdiff(f"pixiv:review:{work_id}:database", f"pixiv:review:{work_id}:already")
+
+    async def add_candidate_artwork_ids(self, work_id: int, values: Iterable[int]) -> int:
+        return await self.client.sadd(f"pixiv:review:{work_id}:candidate", *values)
+
+    async def pop_candidate_artwork_ids(self, work_id: int, count: int) -> list[int]:
+        values = await self.client.spop(f"pixiv:review:{work_id}:candidate", count)
+        return [int(value) for value in values]
+
+    async def del_candidate_artwork_ids(self, work_id: int):
+        await self.client.delete(f"pixiv:review:{work_id}:candidate")
+
+    async def get_stream_start(self, work_id: int, rule: str) -> datetime | None:
+        """获取爬虫使用当前规则持续写入候选集合的起始时间
+        :param work_id: 工作ID
+        :param rule: 规则指纹
+        :return: 起始时间 规则不一致或未开始时返回 None
+        """
+        data = await self.client.hgetall(f"pixiv:review:{work_id}:stream")
+        if not data or data.get("rule") != rule:
+            return None
+        return datetime.fromisoformat(data["since"])
+
+    async def set_stream_start(self, work_id: int, rule: str, since: datetime):
+        """记录爬虫开始使用规则写入候选集合 规则未变更时保留原有的起始时间 每次调用都会续期"""
+        key = f"pixiv:review:{work_id}:stream"
+        if await self.client.hget(key, "rule") != rule:
+            await self.client.hset(key, mapping={"rule": rule, "since": since.isoformat()})
+        await self.client.expire(key, self.stream_ttl)
+
+    async def del_stream_start(self, work_id: int):
+        await self.client.delete(f"pixiv:review:{work_id}:stream")
+
+    async def get_watermark(self, work_id: int) -> tuple[datetime, str] | None:
+        """获取上一次扫描 Pixiv 数据库时的水位线
+        :param work_id: 工作ID
+        :return: 上一次扫描时的 update_time 与规则指纹
+        """
+        data = await self.client.hgetall(f"pixiv:review:watermark:{work_id}")
+        if not data:
+            return None
+        return datetime.fromisoformat(data["update_time"]), data["rule"]
+
+    async def set_watermark(self, work_id: int, update_time: datetime, rule: str):
+        await self.client.hset(
+            f"pixiv:review:watermark:{work_id}", mapping={"update_time": update_time.isoformat(), "rule": rule}
+        )
+
+    async def del_watermark(self, work_id: int):
+        await self.client.delete(f"pixiv:review:watermark:{work_id}")
 
 
 class PixivCache(Component):
-    def __init__(self, redis: Redis):
+    def __init__(self, redis: Redis, tiered_cache: TieredCache):
         self.client = redis.client
+        self.tiered_cache = tiered_cache
         self.ttl = 60 * 10
 
     async def set_login_token(self, token: str):
@@ -38,11 +101,13 @@ class PixivCache(Component):
     async def get_login_token(self) -> str | None:
         return await self.client.get("pixiv:login:token")
 
+    @tiered_get("pixiv:illust:detail")
     async def get_illust_detail(self, artwork_id: int) -> dict | None:
         data = await self.client.get(f"pixiv:illust:detail:{artwork_id}")
         if data is None:
             return None
         return jsonlib.loads(data)
 
-    async def set_illust_detail(self, artwork_id: int, value: str):
-        await self.client.set(f"pixiv:illust:detail:{artwork_id}", value, ex=self.ttl)
+    @tiered_set("pixiv:illust:detail")
+    async def set_illust_detail(self, artwork_id: int, value: dict):
+        await self.client.set(f"pixiv:illust:detail:{artwork_id}", jsonlib.dumps(value), ex=self.ttl)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, func
+from sqlalchemy import Index, String, func
 from sqlmodel import BigInteger, Column, DateTime, Field, SQLModel
 
 from paihub.entities.artwork import ArtWork
@@ -10,6 +10,7 @@ from paihub.utils.sql_types import Tags
 
 class Pixiv(SQLModel, table=True):
     __tablename__ = "pixiv"
+    __table_args__ = (Index("ix_pixiv_update_time", "update_time"),)
 
     id: int | None = Field(sa_column=Column("id", BigInteger, primary_key=True, autoincrement=True))
     title: str | None = Field(
@@ -26,6 +27,20 @@ class Pixiv(SQLModel, table=True):
     )
 
 
+class PixivTag(SQLModel, table=True):
+    """Pixiv 作品标签索引 每个作品的每个标签一行 用于按标签精确或前缀匹配
+
+    :var artwork_id: 作品ID
+    :var tag: 标签
+    """
+
+    __tablename__ = "pixiv_tag"
+    __table_args__ = (Index("ix_pixiv_tag_tag_artwork_id", "tag", "artwork_id"),)
+
+    artwork_id: int = Field(sa_column=Column("artwork_id", BigInteger, primary_key=True, autoincrement=False))
+    tag: str = Field(sa_column=Column("tag", String(collation="utf8mb4_general_ci", length=255), primary_key=True))
+
+
 class PixivAuthor(Author):
     @property
     def url(self) -> str:
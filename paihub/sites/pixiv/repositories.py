@@ -1,44 +1,239 @@
+from collections.abc import AsyncIterator
 from datetime import datetime
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, delete, text
 from sqlalchemy.ext.asyncio import AsyncSession as _AsyncSession
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from paihub.base import Repository
-from paihub.sites.pixiv.entities import Pixiv
+from paihub.sites.pixiv.entities import Pixiv, PixivTag
 
-__all__ = ("PixivRepository",)
+__all__ = ("PixivRepository", "get_match_clause")
+
+
+def get_match_clause(search_text: str, is_pattern: bool) -> tuple[str, str]:
+    """生成匹配 pixiv.tags 的条件语句
+    :param search_text: 匹配文本
+    :param is_pattern: 是否为正则表达式
+    :return: 条件语句与绑定到 :search_text 的参数
+    """
+    if is_pattern:
+        return "pixiv.tags REGEXP :search_text", search_text
+    # 非正则规则通过 pixiv_tag 索引进行标签精确或前缀匹配 避免对 pixiv.tags 全表扫描
+    escaped = search_text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return (
+        "pixiv.id IN (SELECT pixiv_tag.artwork_id FROM pixiv_tag WHERE pixiv_tag.tag LIKE :search_text)",
+        f"{escaped}%",
+    )
 
 
 class PixivRepository(Repository[Pixiv]):
-    async def get_artworks_by_tags(
-        self, search_text: str, is_pattern: bool, page_number: int, lines_per_page: int = 10000
-    ) -> list[int]:
+    async def merge(self, value: Pixiv):
+        """合并作品 并同步刷新该作品在 pixiv_tag 中的标签索引"""
+        async with AsyncSession(self.engine) as session:
+            await session.merge(value)
+            await session.exec(delete(PixivTag).where(PixivTag.artwork_id == value.id))
+            values = [{"artwork_id": value.id, "tag": tag} for tag in dict.fromkeys(value.tags or []) if tag]
+            if values:
+                # 主键使用不区分大小写的排序规则 仅大小写或末尾空格不同的标签视为重复 与 backfill_tags 一样忽略
+                statement = text("INSERT IGNORE INTO pixiv_tag (artwork_id, tag) VALUES (:artwork_id, :tag)")
+                await session.execute(statement, values)
+            await session.commit()
+
+    async def backfill_tags(self, last_id: int = 0, lines_per_page: int = 10000) -> tuple[int, int] | None:
+        """从 pixiv.tags 回填一页 pixiv_tag 标签索引
+        :param last_id: 上一页最后一个作品ID
+        :param lines_per_page: 每一页的数量
+        :return: 本页最后一个作品ID与写入的标签数量 没有更多作品时返回 None
+        """
+        async with _AsyncSession(self.engine) as session:
+            statement = text("SELECT id, tags FROM pixiv WHERE id > :last_id ORDER BY id LIMIT :limit")
+            result = await session.execute(statement, {"last_id": last_id, "limit": lines_per_page})
+            rows = result.all()
+            if len(rows) == 0:
+                return None
+            values = [
+                {"artwork_id": artwork_id, "tag": tag}
+                for artwork_id, tags in rows
+                if tags
+                for tag in dict.fromkeys(tags.split("#"))
+                if tag
+            ]
+            count = 0
+            if values:
+                statement = text("INSERT IGNORE INTO pixiv_tag (artwork_id, tag) VALUES (:artwork_id, :tag)")
+                result = await session.execute(statement, values)
+                count = result.rowcount
+            await session.commit()
+            return rows[-1][0], count
+
+    async def get_max_update_time(self) -> datetime | None:
+        async with _AsyncSession(self.engine) as session:
+            result = await session.execute(text("SELECT MAX(update_time) FROM pixiv"))
+            return result.scalar()
+
+    async def get_now(self) -> datetime:
+        """获取数据库当前时间 与 update_time 使用同一个时钟"""
         async with _AsyncSession(self.engine) as session:
-            offset = (page_number - 1) * lines_per_page
-            if is_pattern:
-                statement = text("SELECT id FROM pixiv WHERE tags REGEXP :search_text LIMIT :limit OFFSET :offset")
-            else:
-                statement = text("SELECT id FROM pixiv WHERE tags LIKE :search_text LIMIT :limit OFFSET :offset")
-                search_text = f"%{search_text}%"
-            result = await session.execute(
-                statement, {"search_text": search_text, "limit": lines_per_page, "offset": offset}
-            )
-            return result.scalars().all()
+            result = await session.execute(text("SELECT NOW()"))
+            return result.scalar()
+
+    async def iter_artworks_by_tags(
+        self, search_text: str, is_pattern: bool, lines_per_page: int = 10000, since: datetime | None = None
+    ) -> AsyncIterator[list[int]]:
+        """按主键分页遍历标签匹配的作品ID
+        :param search_text: 匹配文本
+        :param is_pattern: 是否为正则表达式
+        :param lines_per_page: 每一页的数量
+        :param since: 只遍历 update_time 不早于该时间的作品 为空时遍历全部
+        :return: 每次产出一页作品ID
+        """
+        match_clause, search_text = get_match_clause(search_text, is_pattern)
+        since_clause = "and update_time >= :since " if since is not None else ""
+        statement = text(
+            f"SELECT id FROM pixiv WHERE {match_clause} {since_clause}and id > :last_id ORDER BY id LIMIT :limit"  # noqa: S608
+        )
+        last_id = 0
+        while True:
+            async with _AsyncSession(self.engine) as session:
+                params = {"search_text": search_text, "last_id": last_id, "limit": lines_per_page}
+                if since is not None:
+                    params["since"] = since
+                result = await session.execute(statement, params)
+                artworks_id = result.scalars().all()
+            if len(artworks_id) == 0:
+                return
+            last_id = artworks_id[-1]
+            yield artworks_id
+
+    @staticmethod
+    async def _insert_reviews(
+        session: _AsyncSession, where_clause: str, params: dict, expanding: tuple[str, ...] = ()
+    ) -> int:
+        """把满足条件的作品写入审核库 并在同一个事务中累加 review_author_stats 的等待数量
+        :param session: 当前会话
+        :param where_clause: 针对 pixiv 表的筛选条件
+        :param params: 绑定参数 需要包含 work_id create_by create_time
+        :param expanding: 需要展开的列表参数名
+        :return: int 写入审核库的行数
+        """
+        stats_statement = text(
+            "INSERT INTO review_author_stats (work_id, site_key, author_id, wait_count) "  # noqa: S608
+            "SELECT :work_id, 'pixiv', pixiv.author_id, COUNT(*) "
+            "FROM pixiv "
+            f"WHERE pixiv.author_id IS NOT NULL and {where_clause} "
+            "GROUP BY pixiv.author_id "
+            "ON DUPLICATE KEY UPDATE wait_count = wait_count + VALUES(wait_count)"
+        )
+        statement = text(
+            "INSERT INTO review (work_id, site_key, artwork_id, author_id, status, create_by, create_time) "  # noqa: S608
+            "SELECT :work_id, 'pixiv', pixiv.id, pixiv.author_id, 'WAIT' , :create_by , :create_time "
+            "FROM pixiv "
+            f"WHERE {where_clause}"
+        )
+        if expanding:
+            stats_statement = stats_statement.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+            statement = statement.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+        # 统计需要在写入审核库之前执行 反连接条件依赖审核库中尚不存在这些作品
+        stats_params = {key: value for key, value in params.items() if key not in ("create_by", "create_time")}
+        await session.execute(stats_statement, stats_params)
+        result = await session.execute(statement, params)
+        return result.rowcount
 
     async def add_review_form_pixiv(self, work_id: int, artwork_id: int, create_by: int | None = None):
         create_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         async with _AsyncSession(self.engine) as session:
-            statement = text(
-                "INSERT INTO review (work_id, site_key, artwork_id, author_id, status, create_by, create_time) "
-                "SELECT :work_id, 'pixiv', pixiv.id, pixiv.author_id, 'WAIT' , :create_by , :create_time "
-                "FROM pixiv "
-                "WHERE pixiv.id = :artwork_id"
-            )
             params = {
                 "work_id": work_id,
                 "artwork_id": artwork_id,
                 "create_by": create_by,
                 "create_time": create_time,
             }
-            await session.execute(statement, params)
+            await self._insert_reviews(session, "pixiv.id = :artwork_id", params)
+            await session.commit()
+
+    async def add_reviews_form_pixiv(self, work_id: int, artwork_ids: list[int], create_by: int | None = None) -> int:
+        """在同一个事务中批量写入待审核作品
+        :param work_id: 工作ID
+        :param artwork_ids: 作品ID列表
+        :param create_by: 当前操作的用户ID
+        :return: int 写入的行数
+        """
+        if not artwork_ids:
+            return 0
+        create_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        async with _AsyncSession(self.engine) as session:
+            params = {
+                "work_id": work_id,
+                "artwork_ids": artwork_ids,
+                "create_by": create_by,
+                "create_time": create_time,
+            }
+            count = await self._insert_reviews(session, "pixiv.id IN :artwork_ids", params, expanding=("artwork_ids",))
+            await session.commit()
+            return count
+
+    async def get_next_id_bound(self, last_id: int, span: int, since: datetime | None = None) -> int | None:
+        """按主键向后取 span 个作品 返回其中最大的作品ID 用作下一个事务的上界
+        :param last_id: 上一个事务的上界
+        :param span: 每个事务覆盖的作品数量
+        :param since: 只计算 update_time 不早于该时间的作品 为空时计算全部
+        :return: 作品ID上界 没有更多作品时返回 None
+        """
+        since_clause = "and update_time >= :since " if since is not None else ""
+        statement = text(
+            "SELECT MAX(id) FROM ("  # noqa: S608
+            f"SELECT id FROM pixiv WHERE id > :last_id {since_clause}ORDER BY id LIMIT :span"
+            ") AS page"
+        )
+        async with _AsyncSession(self.engine) as session:
+            params = {"last_id": last_id, "span": span}
+            if since is not None:
+                params["since"] = since
+            result = await session.execute(statement, params)
+            return result.scalar()
+
+    async def add_reviews_form_pixiv_by_tags(
+        self,
+        work_id: int,
+        search_text: str,
+        is_pattern: bool,
+        start_id: int,
+        end_id: int,
+        since: datetime | None = None,
+        create_by: int | None = None,
+    ) -> int:
+        """在数据库内通过反连接直接写入尚未审核的匹配作品 作品ID不经过应用程序
+        :param work_id: 工作ID
+        :param search_text: 匹配文本
+        :param is_pattern: 是否为正则表达式
+        :param start_id: 作品ID下界（不包含）
+        :param end_id: 作品ID上界（包含）
+        :param since: 只处理 update_time 不早于该时间的作品 为空时处理全部
+        :param create_by: 当前操作的用户ID
+        :return: int 写入的行数
+        """
+        match_clause, search_text = get_match_clause(search_text, is_pattern)
+        since_clause = "and pixiv.update_time >= :since " if since is not None else ""
+        create_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        where_clause = (
+            f"pixiv.id > :start_id and pixiv.id <= :end_id and {match_clause} {since_clause}"  # noqa: S608
+            "and NOT EXISTS ("
+            "SELECT 1 FROM review "
+            "WHERE review.work_id = :work_id and review.site_key = 'pixiv' and review.artwork_id = pixiv.id"
+            ")"
+        )
+        async with _AsyncSession(self.engine) as session:
+            params = {
+                "work_id": work_id,
+                "search_text": search_text,
+                "start_id": start_id,
+                "end_id": end_id,
+                "create_by": create_by,
+                "create_time": create_time,
+            }
+            if since is not None:
+                params["since"] = since
+            count = await self._insert_reviews(session, where_clause, params)
             await session.commit()
+            return count
@@ -1,4 +1,7 @@
 import asyncio
+import hashlib
+from datetime import datetime
+from itertools import batched
 
 from async_pixiv.error import APIError, NotExistError, PixivError, RateLimitError
 from async_pixiv.model.illust import IllustType
@@ -13,11 +16,14 @@ from paihub.sites.pixiv.entities import PixivArtWork, PixivAuthor
 from paihub.sites.pixiv.repositories import PixivRepository
 from paihub.sites.pixiv.utils import compiled_patterns
 from paihub.system.review.repositories import ReviewRepository
+from paihub.system.work.repositories import WorkRepository
 
 
 class PixivSitesService(SiteService):
     site_name = "Pixiv"
     site_key = "pixiv"
+    review_insert_chunk_size = 1000  # 每个事务写入审核库的最大作品数量
+    review_sql_id_span = 100000  # sql 引擎每个事务覆盖的作品数量
 
     def __init__(
         self,
@@ -26,12 +32,14 @@ class PixivSitesService(SiteService):
         review_repository: ReviewRepository,
         cache: PixivCache,
         api: PixivMobileApi,
+        work_repository: WorkRepository,
     ):
         self.repository = repository
         self.review_cache = review_cache
         self.review_repository = review_repository
         self.cache = cache
         self.api = api
+        self.work_repository = work_repository
         self.loop = asyncio.get_event_loop()
 
     async def initialize_review(
@@ -41,42 +49,166 @@ class PixivSitesService(SiteService):
         is_pattern: bool,
         lines_per_page: int = 10000,
         create_by: int | None = None,
+        full_rebuild: bool = False,
+    ) -> int:
+        rule = self.get_rule_fingerprint(search_text, is_pattern)
+        watermark = await self.review_cache.get_watermark(work_id)
+        # 在扫描之前记录水位线 扫描期间写入的作品会在下一次增量扫描时被重新检查
+        high_water = await self.repository.get_max_update_time()
+        since = None if full_rebuild or watermark is None or watermark[1] != rule else watermark[0]
+        stream_start = None if since is None else await self.review_cache.get_stream_start(work_id, rule)
+        if stream_start is not None and stream_start <= since:
+            # 爬虫在水位线之前就已经按当前规则把新作品写入候选集合 无需再扫描数据库
+            logger.info("Work %s 从候选集合初始化 Pixiv 审核队列", work_id)
+            count = await self._initialize_review_candidates(work_id, create_by)
+        elif self.review_engine == "sql":
+            await self.review_cache.del_candidate_artwork_ids(work_id)
+            count = await self._initialize_review_sql(work_id, search_text, is_pattern, since, create_by)
+        elif since is None:
+            await self.review_cache.del_candidate_artwork_ids(work_id)
+            logger.info("Work %s 全量重建 Pixiv 审核队列", work_id)
+            count = await self._initialize_review_full(work_id, search_text, is_pattern, lines_per_page, create_by)
+        else:
+            logger.info("Work %s 从 %s 开始增量扫描 Pixiv 数据库", work_id, since)
+            await self.review_cache.del_candidate_artwork_ids(work_id)
+            count = await self._initialize_review_incremental(
+                work_id, search_text, is_pattern, since, lines_per_page, create_by
+            )
+        if high_water is not None:
+            await self.review_cache.set_watermark(work_id, high_water, rule)
+        return count
+
+    async def _initialize_review_full(
+        self, work_id: int, search_text: str, is_pattern: bool, lines_per_page: int, create_by: int | None
     ) -> int:
-        count = 0
-        page_number = 1
         logger.info("清理 Pixiv 审核缓存")
-        await self.review_cache.del_review_all_cache()
+        await self.review_cache.del_review_all_cache(work_id)
+        start_time = self.loop.time()
+        async for artworks_id in self.repository.iter_artworks_by_tags(search_text, is_pattern, lines_per_page):
+            await self.review_cache.set_database_artwork_ids(work_id, artworks_id)
+        logger.info("从Pixiv数据库中获取匹配内容使用了 %s 秒", self.loop.time() - start_time)
+        start_time = self.loop.time()
+        async for artworks_id in self.review_repository.iter_artwork_ids_by_work_and_web(
+            work_id, site_key=self.site_key, lines_per_page=lines_per_page
+        ):
+            await self.review_cache.set_already_review_artwork_ids(work_id, artworks_id)
+        logger.info("从审核库获取匹配内容使用了 %s 秒", self.loop.time() - start_time)
+        difference = await self.review_cache.get_ready_review_artwork_ids(work_id)
+        await self.review_cache.del_review_all_cache(work_id)
+        await self._add_reviews(work_id, [int(artwork_id) for artwork_id in difference], create_by)
+        return len(difference)
+
+    async def _initialize_review_incremental(
+        self,
+        work_id: int,
+        search_text: str,
+        is_pattern: bool,
+        since: datetime,
+        lines_per_page: int,
+        create_by: int | None,
+    ) -> int:
+        count = 0
+        start_time = self.loop.time()
+        async for artworks_id in self.repository.iter_artworks_by_tags(
+            search_text, is_pattern, lines_per_page, since=since
+        ):
+            exists = await self.review_repository.get_exists_artwork_ids(work_id, self.site_key, artworks_id)
+            pending = [artwork_id for artwork_id in artworks_id if artwork_id not in exists]
+            await self._add_reviews(work_id, pending, create_by)
+            count += len(pending)
+        logger.info("增量扫描 Pixiv 数据库新增 %s 个作品使用了 %s 秒", count, self.loop.time() - start_time)
+        return count
+
+    async def _initialize_review_candidates(self, work_id: int, create_by: int | None) -> int:
+        count = 0
         start_time = self.loop.time()
         while True:
-            artworks_id = await self.repository.get_artworks_by_tags(
-                search_text, is_pattern, page_number, lines_per_page
-            )
+            artworks_id = await self.review_cache.pop_candidate_artwork_ids(work_id, self.review_insert_chunk_size)
             if len(artworks_id) == 0:
                 break
-            count += await self.review_cache.set_database_artwork_ids(artworks_id)
-            page_number += 1
-        logger.info("从Pixiv数据库中获取匹配内容使用了 %s 秒", self.loop.time() - start_time)
-        page_number = 1
+            exists = await self.review_repository.get_exists_artwork_ids(work_id, self.site_key, artworks_id)
+            pending = [artwork_id for artwork_id in artworks_id if artwork_id not in exists]
+            await self._add_reviews(work_id, pending, create_by)
+            count += len(pending)
+        logger.info("从候选集合新增 %s 个作品使用了 %s 秒", count, self.loop.time() - start_time)
+        return count
+
+    async def _initialize_review_sql(
+        self, work_id: int, search_text: str, is_pattern: bool, since: datetime | None, create_by: int | None
+    ) -> int:
+        count = 0
         start_time = self.loop.time()
+        start_id = 0
+        # 作品ID稀疏 按实际存在的作品分页 增量扫描时只覆盖 since 之后更新过的作品
         while True:
-            artworks_id = await self.review_repository.get_artwork_id_by_work_and_web(
-                work_id, site_key=self.site_key, page_number=page_number, lines_per_page=lines_per_page
-            )
-            if len(artworks_id) == 0:
+            end_id = await self.repository.get_next_id_bound(start_id, self.review_sql_id_span, since)
+            if end_id is None:
                 break
-            count += await self.review_cache.set_already_review_artwork_ids(artworks_id)
-            page_number += 1
-        logger.info("从审核库获取匹配内容使用了 %s 秒", self.loop.time() - start_time)
-        difference = await self.review_cache.get_ready_review_artwork_ids()
-        for artwork_id in difference:
-            await self.repository.add_review_form_pixiv(
-                work_id=work_id, artwork_id=int(artwork_id), create_by=create_by
+            count += await self.repository.add_reviews_form_pixiv_by_tags(
+                work_id,
+                search_text,
+                is_pattern,
+                start_id=start_id,
+                end_id=end_id,
+                since=since,
+                create_by=create_by,
             )
-        return len(difference)
+            start_id = end_id
+        logger.info(
+            "Work %s 通过数据库反连接写入 %s 个作品使用了 %s 秒 增量起点 %s",
+            work_id,
+            count,
+            self.loop.time() - start_time,
+            since,
+        )
+        return count
+
+    async def _add_reviews(self, work_id: int, artwork_ids: list[int], create_by: int | None):
+        for chunk_number, chunk in enumerate(batched(artwork_ids, self.review_insert_chunk_size), start=1):
+            start_time = self.loop.time()
+            inserted = await self.repository.add_reviews_form_pixiv(
+                work_id=work_id, artwork_ids=list(chunk), create_by=create_by
+            )
+            logger.info(
+                "写入审核库第 %s 批 %s 个作品使用了 %s 秒", chunk_number, inserted, self.loop.time() - start_time
+            )
+
+    @property
+    def review_engine(self) -> str:
+        """审核队列初始化引擎 由 config/pixiv.toml 中的 [review] engine 决定
+
+        redis: 在 Redis 中求差集后写入 sql: 在数据库内通过反连接直接写入
+        """
+        return self.api.config.get("review", {}).get("engine", "redis")
+
+    @staticmethod
+    def get_rule_fingerprint(search_text: str, is_pattern: bool) -> str:
+        return hashlib.sha1(f"{int(is_pattern)}|{search_text}".encode(), usedforsecurity=False).hexdigest()
+
+    async def backfill_tags(self, lines_per_page: int = 10000) -> int:
+        """从 pixiv.tags 回填 pixiv_tag 标签索引 已存在的标签会被跳过 完成后清除所有 Work 的增量扫描水位线
+        :param lines_per_page: 每一页的数量
+        :return: int 写入的标签数量
+        """
+        count = 0
+        last_id = 0
+        start_time = self.loop.time()
+        while True:
+            result = await self.repository.backfill_tags(last_id, lines_per_page)
+            if result is None:
+                break
+            last_id, inserted = result
+            count += inserted
+            logger.info("回填 Pixiv 标签索引至作品 %s 已写入 %s 个标签", last_id, count)
+        logger.info("回填 Pixiv 标签索引完成 共写入 %s 个标签 使用了 %s 秒", count, self.loop.time() - start_time)
+        # 回填的作品早于已有的水位线 清除水位线使下一次初始化审核队列时重新全量扫描
+        for work in await self.work_repository.get_all():
+            await self.review_cache.del_watermark(work.id)
+        return count
 
     async def get_artwork(self, artwork_id: int) -> PixivArtWork:
         try:
-            illust_detail = await self.api.illust.detail(artwork_id)
+            illust_detail = await self.api.illust_detail(artwork_id)
         except NotExistError as exc:
             raise ArtWorkNotFoundError("Not Exist") from exc
         except RateLimitError as exc:
@@ -100,7 +232,7 @@ class PixivSitesService(SiteService):
 
     async def get_artwork_images(self, artwork_id: int) -> list[bytes]:
         # 对于动态图片作品需要 ffmpeg 转换
-        artwork = (await self.api.illust.detail(artwork_id)).illust
+        artwork = (await self.api.illust_detail(artwork_id)).illust
         if artwork.type == IllustType.ugoira:
             result_ugoira = await artwork.download_ugoira(result_type="mp4")
             if isinstance(result_ugoira, bytes):
@@ -112,7 +244,8 @@ class PixivSitesService(SiteService):
             raise ImagesFormatNotSupported(message=f"Images Data {result_ugoira.__class__.__name__} Not Supported")
         if not artwork.meta_pages:
             return [await self.api.client.download(str(artwork.image_urls.large))]
-        return [await self.api.client.download(str(meta_page.image_urls.large)) for meta_page in artwork.meta_pages]
+        urls = [str(meta_page.image_urls.large) for meta_page in artwork.meta_pages]
+        return await self.api.downloader.download(artwork_id, urls, self.api.client.download)
 
     @staticmethod
     def extract(text: str) -> int | None:
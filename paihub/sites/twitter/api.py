@@ -10,6 +10,8 @@ from paihub.error import ArtWorkNotFoundError, BadRequest
 from paihub.log import logger
 from paihub.sites.twitter.cache import WebClientCache
 from paihub.sites.twitter.entities import TwitterArtWork, TwitterAuthor
+from paihub.sites.twitter.utils import project_tweet
+from paihub.utils.downloader import ConcurrentDownloader
 
 
 class WebClientApi(ApiService):
@@ -19,6 +21,7 @@ class WebClientApi(ApiService):
         login = self.config.get("login")
         auth_token = login.get("auth_token")
         self.web = WebClient(auth_token=auth_token)
+        self.downloader = ConcurrentDownloader("Twitter", self.config.get("download", {}).get("concurrency", 4))
         self.login_status = False
 
     async def initialize(self) -> None:
@@ -51,34 +54,28 @@ class WebClientApi(ApiService):
         return await self.get_tweet_images_result_by_rest_id(artwork_id)
 
     async def get_tweet_detail(self, tweet_id: int) -> TwitterArtWork:
-        response = await self.web_cache.get_tweet_detail(tweet_id)
-        if response is None:
-            try:
-                response = await self.web.tweet_detail(str(tweet_id))
-            except BirdNetBadRequest as exc:
-                if "No status found" in exc.message:
-                    raise ArtWorkNotFoundError from exc
-                raise BadRequest(exc.message) from exc
-            await self.web_cache.set_tweet_detail(tweet_id, response)
-
-        tweet = self.get_tweet_from_tweet_detail(response, tweet_id)
-
+        tweet = await self.get_focal_tweet(tweet_id)
         return self.get_artwork_from_tweet(tweet, tweet_id)
 
     async def get_tweet_detail_images(self, tweet_id: int) -> list[bytes]:
-        response = await self.web_cache.get_tweet_detail(tweet_id)
-        if response is None:
+        tweet = await self.get_focal_tweet(tweet_id)
+        medias: list[dict] = tweet["legacy"]["extended_entities"]["media"]
+        urls = [media["media_url_https"] for media in medias]
+        return await self.downloader.download(tweet_id, urls, self.web.download)
+
+    async def get_focal_tweet(self, tweet_id: int) -> dict:
+        """通过 TweetDetail 获取推文 缓存中只保存 project_tweet 精简后的推文"""
+        tweet = await self.web_cache.get_tweet_detail(tweet_id)
+        if tweet is None:
             try:
                 response = await self.web.tweet_detail(str(tweet_id))
             except BirdNetBadRequest as exc:
                 if "No status found" in exc.message:
                     raise ArtWorkNotFoundError from exc
                 raise BadRequest(exc.message) from exc
-            await self.web_cache.set_tweet_detail(tweet_id, response)
-
-        tweet = self.get_tweet_from_tweet_detail(response, tweet_id)
-        medias: list[dict] = tweet["legacy"]["extended_entities"]["media"]
-        return [await self.web.download(media["media_url_https"]) for media in medias]
+            tweet = project_tweet(self.get_tweet_from_tweet_detail(response, tweet_id))
+            await self.web_cache.set_tweet_detail(tweet_id, tweet)
+        return tweet
 
     async def get_tweet_result_by_rest_id(self, tweet_id: int) -> TwitterArtWork:
         data = await self.web_cache.get_tweet_result_by_rest_id(tweet_id)
@@ -104,7 +101,8 @@ class WebClientApi(ApiService):
                 raise BadRequest from exc
             await self.web_cache.set_tweet_result_by_rest_id(tweet_id, data)
         medias: list[dict] = data["legacy"]["extended_entities"]["media"]
-        return [await self.web.download(media["media_url_https"]) for media in medias]
+        urls = [media["media_url_https"] for media in medias]
+        return await self.downloader.download(tweet_id, urls, self.web.download)
 
     @staticmethod
     def get_artwork_from_tweet(tweet: dict, tweet_id: int):
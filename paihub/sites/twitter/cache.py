@@ -1,5 +1,6 @@
 from paihub.base import Component
 from paihub.dependence.redis import Redis
+from paihub.sites.cache import TieredCache, pack_entry, tiered_get, tiered_set, unpack_entry
 
 try:
     import orjson as jsonlib
@@ -8,24 +9,36 @@ except ImportError:
 
 
 class WebClientCache(Component):
-    def __init__(self, redis: Redis):
+    tweet_detail_version = 1  # 精简后的推文结构版本 结构变更时递增 旧版本的缓存会被忽略
+
+    def __init__(self, redis: Redis, tiered_cache: TieredCache):
         self.client = redis.client
+        self.binary_client = redis.binary_client
+        self.tiered_cache = tiered_cache
         self.ttl = 60 * 60
 
+    @tiered_get("twitter:web:tweet_result_by_rest_id")
     async def get_tweet_result_by_rest_id(self, tweet_id: int) -> dict | None:
         data = await self.client.get(f"twitter:web:tweet_result_by_rest_id:{tweet_id}")
         if data is None:
             return None
         return jsonlib.loads(data)
 
+    @tiered_set("twitter:web:tweet_result_by_rest_id")
     async def set_tweet_result_by_rest_id(self, tweet_id: int, value: dict):
         await self.client.set(f"twitter:web:tweet_result_by_rest_id:{tweet_id}", jsonlib.dumps(value), ex=self.ttl)
 
+    @tiered_get("twitter:web:tweet_detail")
     async def get_tweet_detail(self, tweet_id: int) -> dict | None:
-        data = await self.client.get(f"twitter:web:tweet_detail:{tweet_id}")
-        if data is None:
-            return None
-        return jsonlib.loads(data)
+        """获取 project_tweet 精简后的推文"""
+        data = await self.binary_client.get(f"twitter:web:tweet_detail:{tweet_id}")
+        return unpack_entry(data, self.tweet_detail_version)
 
+    @tiered_set("twitter:web:tweet_detail")
     async def set_tweet_detail(self, tweet_id: int, value: dict):
-        await self.client.set(f"twitter:web:tweet_detail:{tweet_id}", jsonlib.dumps(value), ex=self.ttl)
+        """写入 project_tweet 精简后的推文
+        :param tweet_id: 推文ID
+        :param value: 精简后的推文
+        """
+        data = pack_entry(value, self.tweet_detail_version)
+        await self.binary_client.set(f"twitter:web:tweet_detail:{tweet_id}", data, ex=self.ttl)
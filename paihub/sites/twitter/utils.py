@@ -10,3 +10,22 @@ patterns = [
 
 # 必须预编译表达式 否则性能会下降
 compiled_patterns = [re.compile(p) for p in patterns]
+
+
+def project_tweet(tweet: dict) -> dict:
+    """只保留生成作品信息与下载图片需要的推文字段 用于缓存
+    :param tweet: tweet_results 中的推文
+    :return: 精简后的推文 字段路径与原推文一致
+    """
+    legacy = tweet["legacy"]
+    user = tweet["core"]["user_results"]["result"]["legacy"]
+    medias = legacy.get("extended_entities", {}).get("media", [])
+    return {
+        "core": {"user_results": {"result": {"legacy": {"name": user["name"], "screen_name": user["screen_name"]}}}},
+        "legacy": {
+            "user_id_str": legacy["user_id_str"],
+            "full_text": legacy["full_text"],
+            "created_at": legacy["created_at"],
+            "extended_entities": {"media": [{"media_url_https": media["media_url_https"]} for media in medias]},
+        },
+    }
@@ -11,11 +11,14 @@ from async_pixiv.error import APIError, NotExistError
 from paihub.base import Spider
 from paihub.log import Logger, logger
 from paihub.sites.pixiv.api import PixivMobileApi, PixivWebAPI
-from paihub.sites.pixiv.cache import PixivCache
+from paihub.sites.pixiv.cache import PixivCache, PixivReviewCache
 from paihub.sites.pixiv.entities import Pixiv as _Pixiv
 from paihub.sites.pixiv.repositories import PixivRepository
+from paihub.sites.pixiv.services import PixivSitesService
 from paihub.spider.pixiv.document import PixivSpiderDocument
 from paihub.system.review.repositories import ReviewRepository
+from paihub.system.work.matcher import WorkRuleMatcher
+from paihub.system.work.repositories import WorkRuleRepository
 
 if TYPE_CHECKING:
     from async_pixiv.model.illust import Illust
@@ -32,6 +35,8 @@ class PixivSpider(Spider):
         review_repository: ReviewRepository,
         spider_document: PixivSpiderDocument,
         web_api: PixivWebAPI,
+        review_cache: PixivReviewCache,
+        work_rule_repository: WorkRuleRepository,
     ):
         self.cache = cache
         self.repository = repository
@@ -39,6 +44,9 @@ class PixivSpider(Spider):
         self.review_repository = review_repository
         self.spider_document = spider_document
         self.web_api = web_api
+        self.review_cache = review_cache
+        self.work_rule_repository = work_rule_repository
+        self.rule_matcher: WorkRuleMatcher | None = None
 
     def add_jobs(self) -> None:
         self.application.scheduler.add_job(
@@ -55,8 +63,35 @@ class PixivSpider(Spider):
         )
         # 调试使用 asyncio.create_task(self.fetch_artwork)
 
+    async def refresh_rule_matcher(self):
+        """重新编译所有 WorkRule 并记录候选集合开始按当前规则写入的时间
+
+        无法编译的正则规则不会写入候选集合（MySQL REGEXP 可能接受 Python re 不支持的语法），
+        清除其记录使这些 Work 继续通过扫描数据库初始化审核队列。
+        """
+        rules = await self.work_rule_repository.get_all()
+        self.rule_matcher = WorkRuleMatcher(rules)
+        # 与水位线比较时需要使用 pixiv.update_time 的时钟 即数据库时间
+        now = await self.repository.get_now()
+        compiled = {rule.work_id for rule in self.rule_matcher.rules}
+        for rule in rules:
+            if rule.work_id not in compiled:
+                await self.review_cache.del_stream_start(rule.work_id)
+                continue
+            fingerprint = PixivSitesService.get_rule_fingerprint(rule.search_text, rule.is_pattern)
+            await self.review_cache.set_stream_start(rule.work_id, fingerprint, now)
+
+    async def save_artwork(self, instance: _Pixiv):
+        """保存作品 并把命中规则的作品直接写入对应 Work 的候选集合"""
+        await self.repository.merge(instance)
+        if self.rule_matcher is None:
+            return
+        for work_id in self.rule_matcher.match(instance.tags or []):
+            await self.review_cache.add_candidate_artwork_ids(work_id, [instance.id])
+
     async def search_job(self):
         logger.info("正在进行 Pixiv 搜索爬虫任务")
+        await self.refresh_rule_matcher()
         await self.web_search()
         await self.mobile_search()
 
@@ -66,11 +101,13 @@ class PixivSpider(Spider):
 
     async def follow_job(self):
         logger.info("正在进行 Pixiv 关注作品爬虫任务")
+        await self.refresh_rule_matcher()
         await self.get_web_follow()
         await self.get_mobile_follow()
 
     async def fetch_artwork(self):
         logger.info("正在进行 Pixiv 关注作品同步任务")
+        await self.refresh_rule_matcher()
         await self.fetch_user_artwork()
 
     async def mobile_search(self):
@@ -110,7 +147,7 @@ class PixivSpider(Spider):
                         author_id=illust.user.id,
                         create_time=illust.create_date,
                     )
-                    await self.repository.merge(instance)
+                    await self.save_artwork(instance)
                     add_count += 1
             logger.info("当前已经搜索到 %s 张作品 已经添加数据库 %s 张作品", offset, add_count)
             if offset > 5000:
@@ -208,7 +245,7 @@ class PixivSpider(Spider):
                 if count == 0:
                     break
                 for illust in user_illusts.illusts:
-                    await self.repository.merge(self.parse_mobile_details_to_database(illust))
+                    await self.save_artwork(self.parse_mobile_details_to_database(illust))
                     _logger.info("Pixiv Fetch Artwork 正在保存作品 Id[%s]", illust.id)
                 offset += count
                 _logger.info("Pixiv Fetch Artwork 正在搜索用户 UserId[%s] 当前搜索 Offset[%s]", user_id, offset)
@@ -274,7 +311,7 @@ class PixivSpider(Spider):
                     author_id=illust.user.id,
                     create_time=illust.create_date,
                 )
-                await self.repository.merge(instance)
+                await self.save_artwork(instance)
                 add_count += 1
             logger.info("当前已经获取到 %s 张作品 已经添加 %s 张作品到数据库", offset, add_count)
             if offset > 1000:
@@ -1,12 +1,34 @@
+import time
 from collections.abc import Iterable
 
 from paihub.base import Component
 from paihub.dependence.redis import Redis
 
+# 从等待集合中取出一个作品并记录到处理中集合 两步在 Redis 中原子执行
+CLAIM_SCRIPT = """
+local review_id = redis.call('SPOP', KEYS[1])
+if review_id then
+    redis.call('ZADD', KEYS[2], ARGV[1], review_id)
+end
+return review_id
+"""
+
+# 把处理超时的作品放回等待集合
+SWEEP_SCRIPT = """
+local review_ids = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, review_id in ipairs(review_ids) do
+    redis.call('SADD', KEYS[1], review_id)
+    redis.call('ZREM', KEYS[2], review_id)
+end
+return #review_ids
+"""
+
 
 class PushCache(Component):
     def __init__(self, redis: Redis):
         self.client = redis.client
+        self._claim_script = self.client.register_script(CLAIM_SCRIPT)
+        self._sweep_script = self.client.register_script(SWEEP_SCRIPT)
 
     async def set_pending_push(self, work_id: int, values: Iterable[int]) -> int:
         return await self.client.sadd(f"push:pending:{work_id}", *values)
@@ -34,3 +56,26 @@ class PushCache(Component):
         """
         removed_count = await self.client.srem(f"push:pending:{work_id}", review_id)
         return removed_count > 0
+
+    async def claim_pending_push(self, work_id: int) -> str | None:
+        """从等待队列取出一个作品 并移动到处理中集合 推送完成后需要调用 ack_push
+        :param work_id: 工作ID
+        :return: 审核ID 队列为空时返回 None
+        """
+        return await self._claim_script(
+            keys=[f"push:pending:{work_id}", f"push:processing:{work_id}"], args=[time.time()]
+        )
+
+    async def ack_push(self, work_id: int, review_id: int) -> bool:
+        """确认作品已经处理完毕 从处理中集合移除"""
+        return await self.client.zrem(f"push:processing:{work_id}", review_id) > 0
+
+    async def sweep_processing_push(self, work_id: int, seconds: float) -> int:
+        """把处理超时的作品放回等待队列
+        :param work_id: 工作ID
+        :param seconds: 超时时间（秒）
+        :return: 放回队列的数量
+        """
+        return await self._sweep_script(
+            keys=[f"push:pending:{work_id}", f"push:processing:{work_id}"], args=[time.time() - seconds]
+        )
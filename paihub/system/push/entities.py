@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import func
+from sqlalchemy import Index, func
 from sqlmodel import BigInteger, Column, DateTime, Field, Integer, SQLModel
 
 from paihub.utils.sql_types import JSON
@@ -8,6 +8,7 @@ from paihub.utils.sql_types import JSON
 
 class Push(SQLModel, table=True):
     __tablename__ = "push"
+    __table_args__ = (Index("ix_push_review_id", "review_id"),)
 
     id: int | None = Field(sa_column=Column("id", BigInteger, primary_key=True, autoincrement=True))
     review_id: int | None = Field(default=None, sa_type=BigInteger, foreign_key="review.id")
@@ -59,4 +59,4 @@ class PushCallbackContext:
         )
 
     async def undo_push(self) -> int:
-        return await self.push_service.undo_push(self.work_id, self.artwork_id)
+        return await self.push_service.undo_push(self.work_id, self.review_id)
@@ -0,0 +1,50 @@
+from datetime import datetime
+from enum import IntEnum
+
+from sqlalchemy import Enum, Index, func
+from sqlmodel import BigInteger, Column, DateTime, Field, Integer, SQLModel
+
+
+class PushOutboxStatus(IntEnum):
+    """推送发件箱状态
+    :var PENDING: 等待推送
+    :var SENDING: 正在推送
+    :var SENT: 已经推送
+    :var FAILED: 推送失败
+    :var UNKNOWN: 推送过程中进程退出 无法确认是否已经发送 不会自动重新推送
+    """
+
+    PENDING = 0
+    SENDING = 1
+    SENT = 2
+    FAILED = 3
+    UNKNOWN = 4
+
+
+class PushOutbox(SQLModel, table=True):
+    """推送发件箱 每个 Review 只有一条记录 用于保证推送不会丢失也不会重复
+
+    :var id: 数据库ID
+    :var work_id: 关联的任务ID
+    :var review_id: 审核ID
+    :var status: 推送状态
+    :var message_id: 推送成功后的消息ID
+    :var create_time: 创建时间
+    :var update_time: 更新时间
+    """
+
+    __tablename__ = "push_outbox"
+    __table_args__ = (Index("ix_push_outbox_work_id_status", "work_id", "status"),)
+
+    id: int | None = Field(sa_column=Column("id", BigInteger, primary_key=True, autoincrement=True))
+    work_id: int = Field(sa_column=Column("work_id", Integer, nullable=False))
+    review_id: int = Field(sa_column=Column("review_id", BigInteger, nullable=False, unique=True))
+    status: PushOutboxStatus = Field(
+        default=PushOutboxStatus.PENDING,
+        sa_column=Column("status", Enum(PushOutboxStatus), nullable=False, default=PushOutboxStatus.PENDING),
+    )
+    message_id: int | None = Field(default=None, sa_column=Column("message_id", Integer))
+    create_time: datetime | None = Field(default=None, sa_column=Column("create_time", DateTime, default=func.now()))
+    update_time: datetime | None = Field(
+        default=None, sa_column=Column("update_time", DateTime, default=func.now(), onupdate=func.now())
+    )
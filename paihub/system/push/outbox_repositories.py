@@ -0,0 +1,127 @@
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession as _AsyncSession
+
+from paihub.base import Repository
+from paihub.system.push.outbox_entities import PushOutbox, PushOutboxStatus
+
+
+class PushOutboxRepository(Repository[PushOutbox]):
+    """推送发件箱Repository"""
+
+    async def add_pending(self, work_id: int, review_ids: list[int]) -> int:
+        """把作品加入发件箱 已经存在的 Review 保持原有状态
+        :param work_id: 工作ID
+        :param review_ids: 审核ID列表
+        :return: 新加入的数量
+        """
+        if not review_ids:
+            return 0
+        async with _AsyncSession(self.engine) as session:
+            statement = text(
+                "INSERT IGNORE INTO push_outbox (work_id, review_id, status, create_time, update_time) "
+                "VALUES (:work_id, :review_id, 'PENDING', NOW(), NOW())"
+            )
+            result = await session.execute(
+                statement, [{"work_id": work_id, "review_id": review_id} for review_id in review_ids]
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def get_pending_review_ids(self, work_id: int) -> list[int]:
+        """获取等待推送且仍然为通过状态的审核ID
+        :param work_id: 工作ID
+        :return: 审核ID列表
+        """
+        async with _AsyncSession(self.engine) as session:
+            # 只返回仍然为通过状态的作品 被重置为拒绝或删除的作品不会重新进入推送队列
+            statement = text(
+                "SELECT push_outbox.review_id FROM push_outbox "
+                "JOIN review ON review.id = push_outbox.review_id AND review.status = 'PASS' "
+                "WHERE push_outbox.work_id = :work_id AND push_outbox.status = 'PENDING' "
+                "ORDER BY push_outbox.review_id"
+            )
+            result = await session.execute(statement, {"work_id": work_id})
+            return list(result.scalars().all())
+
+    async def get_work_id(self, review_id: int) -> int | None:
+        async with _AsyncSession(self.engine) as session:
+            statement = text("SELECT work_id FROM push_outbox WHERE review_id = :review_id")
+            result = await session.execute(statement, {"review_id": review_id})
+            return result.scalar_one_or_none()
+
+    async def transition(
+        self,
+        review_id: int,
+        from_status: PushOutboxStatus,
+        to_status: PushOutboxStatus,
+        message_id: int | None = None,
+    ) -> bool:
+        """按条件更新状态 只有当前状态为 from_status 时才会更新 用于保证同一作品只被一个推送方认领
+        :param review_id: 审核ID
+        :param from_status: 当前状态
+        :param to_status: 新的状态
+        :param message_id: 推送成功后的消息ID
+        :return: 是否更新成功
+        """
+        async with _AsyncSession(self.engine) as session:
+            statement = text(
+                "UPDATE push_outbox SET status = :to_status, message_id = COALESCE(:message_id, message_id), "
+                "update_time = NOW() "
+                "WHERE review_id = :review_id AND status = :from_status"
+            )
+            params = {
+                "review_id": review_id,
+                "from_status": from_status.name,
+                "to_status": to_status.name,
+                "message_id": message_id,
+            }
+            result = await session.execute(statement, params)
+            await session.commit()
+            return result.rowcount == 1
+
+    async def mark_stale_sending(self, work_id: int, seconds: int) -> list[int]:
+        """把长时间处于 SENDING 的记录标记为 UNKNOWN
+        :param work_id: 工作ID
+        :param seconds: 开始推送超过该时间（秒）的记录视为过期 与 update_time 一样使用数据库时间计算
+        :return: 被标记的审核ID列表
+        """
+        async with _AsyncSession(self.engine) as session:
+            params = {"work_id": work_id, "seconds": seconds}
+            result = await session.execute(
+                text(
+                    "SELECT review_id FROM push_outbox "
+                    "WHERE work_id = :work_id AND status = 'SENDING' "
+                    "AND update_time < NOW() - INTERVAL :seconds SECOND "
+                    "FOR UPDATE"
+                ),
+                params,
+            )
+            review_ids = list(result.scalars().all())
+            if review_ids:
+                statement = text(
+                    "UPDATE push_outbox SET status = 'UNKNOWN', update_time = NOW() "
+                    "WHERE review_id IN :review_ids AND status = 'SENDING'"
+                ).bindparams(bindparam("review_ids", expanding=True))
+                await session.execute(statement, {"review_ids": review_ids})
+            await session.commit()
+            return review_ids
+
+    async def requeue_unknown(self, work_id: int) -> list[int]:
+        """把 UNKNOWN 的记录重新设为 PENDING 需要人工确认这些作品没有发送成功
+        :param work_id: 工作ID
+        :return: 重新等待推送的审核ID列表
+        """
+        async with _AsyncSession(self.engine) as session:
+            result = await session.execute(
+                text("SELECT review_id FROM push_outbox WHERE work_id = :work_id AND status = 'UNKNOWN' FOR UPDATE"),
+                {"work_id": work_id},
+            )
+            review_ids = list(result.scalars().all())
+            if review_ids:
+                statement = text(
+                    "UPDATE push_outbox SET status = 'PENDING', update_time = NOW() "
+                    "WHERE review_id IN :review_ids AND status = 'UNKNOWN'"
+                ).bindparams(bindparam("review_ids", expanding=True))
+                await session.execute(statement, {"review_ids": review_ids})
+            await session.commit()
+            return review_ids
@@ -16,14 +16,29 @@ class PushRepository(Repository[Push]):
             results = await session.exec(statement)
             return results.first()
 
-    async def get_review_id_by_push(self, work_id: int) -> list[int]:
+    async def get_review_id_by_push(self, work_id: int, page_size: int = 10000) -> list[int]:
+        """获取通过审核但还没有推送的审核ID
+        按 review.id 分页查询，每页通过 NOT EXISTS 在 push.review_id 索引上逐行判断，不需要扫描整个 push 表
+        :param work_id: 工作ID
+        :param page_size: 每页数量
+        :return: 审核ID列表
+        """
+        reviews_id: list[int] = []
+        last_id = 0
         async with _AsyncSession(self.engine) as session:
             statement = text(
                 "SELECT review.id "
                 "FROM review "
-                "WHERE review.status = 'PASS' AND review.work_id = :work_id "
-                "AND review.id NOT IN (SELECT push.review_id FROM push)"
+                "WHERE review.work_id = :work_id AND review.status = 'PASS' AND review.id > :last_id "
+                "AND NOT EXISTS (SELECT 1 FROM push WHERE push.review_id = review.id) "
+                "ORDER BY review.id "
+                "LIMIT :limit"
             )
-            params = {"work_id": work_id}
-            result = await session.execute(statement, params)
-            return result.scalars().all()
+            while True:
+                params = {"work_id": work_id, "last_id": last_id, "limit": page_size}
+                result = await session.execute(statement, params)
+                page = list(result.scalars().all())
+                reviews_id.extend(page)
+                if len(page) < page_size:
+                    return reviews_id
+                last_id = page[-1]
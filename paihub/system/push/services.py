@@ -4,6 +4,8 @@ from paihub.system.name_map.service import WorkTagFormatterService
 from paihub.system.push.cache import PushCache
 from paihub.system.push.entities import Push
 from paihub.system.push.ext import PushCallbackContext
+from paihub.system.push.outbox_entities import PushOutboxStatus
+from paihub.system.push.outbox_repositories import PushOutboxRepository
 from paihub.system.push.repositories import PushRepository
 from paihub.system.review.entities import ReviewStatus
 from paihub.system.review.repositories import ReviewRepository
@@ -12,6 +14,8 @@ from paihub.system.work.repositories import WorkChannelRepository
 
 
 class PushService(Service):
+    processing_timeout = 10 * 60  # 认领后超过该时间仍未完成的推送视为中断（秒）
+
     def __init__(
         self,
         sites_manager: SitesManager,
@@ -20,8 +24,10 @@ class PushService(Service):
         review_repository: ReviewRepository,
         work_channel_repository: WorkChannelRepository,
         tag_formatter: WorkTagFormatterService,
+        push_outbox_repository: PushOutboxRepository,
     ):
         self.push_repository = push_repository
+        self.push_outbox_repository = push_outbox_repository
         self.push_cache = push_cache
         self.sites_manager = sites_manager
         self.review_repository = review_repository
@@ -30,16 +36,83 @@ class PushService(Service):
 
     async def get_push(self, work_id: int) -> int:
         reviews_id = await self.push_repository.get_review_id_by_push(work_id)
-        return await self.push_cache.set_pending_push(work_id, reviews_id)
+        await self.push_outbox_repository.add_pending(work_id, reviews_id)
+        return await self.recover_push(work_id)
+
+    async def enqueue_push(self, work_id: int, reviews_id: list[int]) -> int:
+        """把作品写入发件箱并加入推送队列
+        :param work_id: 工作ID
+        :param reviews_id: 审核ID列表
+        :return: 新加入发件箱的数量
+        """
+        count = await self.push_outbox_repository.add_pending(work_id, reviews_id)
+        if reviews_id:
+            await self.push_cache.set_pending_push(work_id, reviews_id)
+        return count
+
+    async def recover_push(self, work_id: int) -> int:
+        """恢复推送队列 用于进程重启后继续推送
+        处理超时的作品放回等待队列；长时间处于 SENDING 的记录无法确认是否已经发送，标记为 UNKNOWN 不再自动推送；
+        发件箱中等待推送的作品重新写入 Redis，Redis 数据丢失时也不需要重新扫描审核库。
+        :param work_id: 工作ID
+        :return: 等待推送的数量
+        """
+        swept = await self.push_cache.sweep_processing_push(work_id, self.processing_timeout)
+        if swept:
+            logger.info("Work %s 有 %s 个处理超时的推送被放回队列", work_id, swept)
+        unknown = await self.push_outbox_repository.mark_stale_sending(work_id, self.processing_timeout)
+        if unknown:
+            logger.warning(
+                "Work %s 的 Review %s 推送时中断 无法确认是否已经发送 需要人工检查后通过 /push_requeue 重新推送",
+                work_id,
+                unknown,
+            )
+        reviews_id = await self.push_outbox_repository.get_pending_review_ids(work_id)
+        if reviews_id:
+            await self.push_cache.set_pending_push(work_id, reviews_id)
+        return await self.push_cache.get_push_count(work_id)
+
+    async def requeue_unknown_push(self, work_id: int) -> int:
+        """把推送中断的作品重新加入推送队列
+        :param work_id: 工作ID
+        :return: 重新加入推送队列的数量
+        """
+        reviews_id = await self.push_outbox_repository.requeue_unknown(work_id)
+        if reviews_id:
+            await self.push_cache.set_pending_push(work_id, reviews_id)
+            logger.info("Work %s 的 Review %s 重新加入推送队列", work_id, reviews_id)
+        return len(reviews_id)
+
+    async def _claim_next_push(self, work_id: int) -> int | None:
+        """从推送队列认领下一个作品 发件箱中已经不是 PENDING 的作品说明已被处理 直接确认并跳过"""
+        while True:
+            review_id = await self.push_cache.claim_pending_push(work_id)
+            if review_id is None:
+                return None
+            review_id = int(review_id)
+            if await self.push_outbox_repository.transition(
+                review_id, PushOutboxStatus.PENDING, PushOutboxStatus.SENDING
+            ):
+                return review_id
+            await self.push_cache.ack_push(work_id, review_id)
+            logger.info("Review %s 已经推送或正在推送，跳过", review_id)
+
+    async def _finish_outbox(self, review_id: int, message_id: int | None, status: bool):
+        work_id = await self.push_outbox_repository.get_work_id(review_id)
+        if work_id is None:
+            return
+        to_status = PushOutboxStatus.SENT if status else PushOutboxStatus.FAILED
+        await self.push_outbox_repository.transition(review_id, PushOutboxStatus.SENDING, to_status, message_id)
+        await self.push_cache.ack_push(work_id, review_id)
 
     async def get_push_count(self, work_id: int) -> int:
         return await self.push_cache.get_push_count(work_id)
 
     async def get_next_push(self, work_id: int) -> PushCallbackContext | None:
-        review_id = await self.push_cache.get_pending_push(work_id)
+        review_id = await self._claim_next_push(work_id)
         if review_id is None:
             return None
-        review_data = await self.review_repository.get_by_id(int(review_id))
+        review_data = await self.review_repository.get_by_id(review_id)
         site_service = self.sites_manager.get_site_by_site_key(review_data.site_key)
         work_channel = await self.work_channel_repository.get_by_work_id(work_id)
         return PushCallbackContext(
@@ -62,12 +135,12 @@ class PushService(Service):
             推送上下文，如果没有有效的推送项则返回 None
         """
         while True:
-            review_id = await self.push_cache.get_pending_push(work_id)
+            review_id = await self._claim_next_push(work_id)
             if review_id is None:
                 return None
 
             # 验证 review 状态
-            review_data = await self.review_repository.get_by_id(int(review_id))
+            review_data = await self.review_repository.get_by_id(review_id)
             if review_data and review_data.status == ReviewStatus.PASS:
                 # 状态仍为 PASS 可以推送
                 site_service = self.sites_manager.get_site_by_site_key(review_data.site_key)
@@ -82,6 +155,7 @@ class PushService(Service):
                     tag_formatter=self.tag_formatter,
                 )
             # 状态已变更 记录日志并继续下一个
+            await self._finish_outbox(review_id, None, False)
             logger.info(
                 "Review %s 状态已变更为 %s，跳过推送",
                 review_id,
@@ -94,6 +168,7 @@ class PushService(Service):
             review_id=review_id, channel_id=channel_id, message_id=message_id, status=status, create_by=create_by
         )
         await self.push_repository.add(instance)
+        await self._finish_outbox(review_id, message_id, status)
 
     async def set_send_push(self, review_id: int, channel_id: int, message_id: int, status: bool, create_by: int):
         instance = await self.push_repository.get_push(review_id)
@@ -102,12 +177,17 @@ class PushService(Service):
                 review_id=review_id, channel_id=channel_id, message_id=message_id, status=status, create_by=create_by
             )
             await self.push_repository.add(instance)
-            return
-        instance.channel_id = channel_id
-        instance.message_id = message_id
-        instance.status = status
-        instance.update_by = create_by
-        await self.push_repository.update(instance)
+        else:
+            instance.channel_id = channel_id
+            instance.message_id = message_id
+            instance.status = status
+            instance.update_by = create_by
+            await self.push_repository.update(instance)
+        await self._finish_outbox(review_id, message_id, status)
 
     async def undo_push(self, work_id: int, review_id: int) -> int:
-        return await self.push_cache.set_pending_push(work_id, [review_id])
+        """推送没有发出时放回队列 之后重新推送"""
+        await self.push_outbox_repository.transition(review_id, PushOutboxStatus.SENDING, PushOutboxStatus.PENDING)
+        count = await self.push_cache.set_pending_push(work_id, [review_id])
+        await self.push_cache.ack_push(work_id, review_id)
+        return count
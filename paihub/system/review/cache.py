@@ -19,5 +19,11 @@ class ReviewCache(Component):
             return None
         return data[-1]
 
+    async def get_pending_reviews(self, work_id: int, count: int) -> list[str]:
+        data = await self.client.spop(f"review:pending:{work_id}", count)
+        if data is None:
+            return []
+        return data
+
     async def get_review_count(self, work_id: int) -> int:
         return await self.client.scard(f"review:pending:{work_id}")
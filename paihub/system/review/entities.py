@@ -57,6 +57,12 @@ class Review(SQLModel, table=True):
     """
 
     __tablename__ = "review"
+    __table_args__ = (
+        Index("ix_review_work_id_status_id", "work_id", "status", "id"),
+        Index("ix_review_work_id_site_key_id", "work_id", "site_key", "id"),
+        Index("ix_review_work_id_site_key_artwork_id", "work_id", "site_key", "artwork_id"),
+        Index("ix_review_artwork_id", "artwork_id"),
+    )
 
     id: int | None = Field(sa_column=Column("id", BigInteger, primary_key=True, autoincrement=True))
     work_id: int | None = Field(default=None, sa_type=Integer, foreign_key="work.id")
@@ -121,18 +127,19 @@ class StatusStatistics(BaseModel):
     def parse_form_result(cls, result: "Result"):
         obj = cls()
         for row in result.all():
-            name = row[0]
-            count = row[1]
-            if name == "WAIT":
-                obj.wait_count = count
-            elif name == "REJECT":
-                obj.reject_count = count
-            elif name == "PASS":
-                obj.pass_count = count
-            elif name == "MOVE":
-                obj.move_count = count
+            obj.set_count(row[0], row[1])
         return obj
 
+    def set_count(self, name: str, count: int):
+        if name == "WAIT":
+            self.wait_count = count
+        elif name == "REJECT":
+            self.reject_count = count
+        elif name == "PASS":
+            self.pass_count = count
+        elif name == "MOVE":
+            self.move_count = count
+
     @property
     def total(self) -> int:
         return self.wait_count + self.pass_count + self.reject_count + self.move_count
@@ -167,6 +174,38 @@ class ReviewAuthorRule(SQLModel, table=True):
     update_time: datetime | None = Field(default=None, sa_column=Column("update_time", DateTime, onupdate=func.now()))
 
 
+class ReviewAuthorStats(SQLModel, table=True):
+    """按作者汇总的审核状态统计 在审核状态变化时增量维护
+
+    :var work_id: 任务ID
+    :var site_key: 网站唯一标识符
+    :var author_id: 作者ID
+    :var wait_count: 等待审核数量
+    :var pass_count: 通过数量
+    :var reject_count: 拒绝数量
+    :var move_count: 已经移动数量
+    """
+
+    __tablename__ = "review_author_stats"
+    __table_args__ = (Index("ix_review_author_stats_site_author", "site_key", "author_id"),)
+
+    work_id: int = Field(sa_column=Column("work_id", Integer, primary_key=True, autoincrement=False))
+    site_key: str = Field(sa_column=Column("site_key", SiteKey, primary_key=True))
+    author_id: int = Field(sa_column=Column("author_id", BigInteger, primary_key=True, autoincrement=False))
+    wait_count: int = Field(default=0, sa_column=Column("wait_count", Integer, nullable=False, server_default="0"))
+    pass_count: int = Field(default=0, sa_column=Column("pass_count", Integer, nullable=False, server_default="0"))
+    reject_count: int = Field(default=0, sa_column=Column("reject_count", Integer, nullable=False, server_default="0"))
+    move_count: int = Field(default=0, sa_column=Column("move_count", Integer, nullable=False, server_default="0"))
+
+    def to_statistics(self) -> StatusStatistics:
+        return StatusStatistics(
+            wait_count=self.wait_count,
+            pass_count=self.pass_count,
+            reject_count=self.reject_count,
+            move_count=self.move_count,
+        )
+
+
 # class AutoReviewRule(SQLModel):
 #     __tablename__ = "auto_review_rules"
 #
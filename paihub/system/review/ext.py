@@ -14,6 +14,8 @@ class ReviewCallbackContext:
         "review_service",
         "review",
         "tag_formatter",
+        "_artwork",
+        "_artwork_images",
     )
 
     def __init__(
@@ -27,14 +29,27 @@ class ReviewCallbackContext:
         self.site_service = site_service
         self.review_service = review_service
         self.tag_formatter = tag_formatter
+        self._artwork: ArtWork | None = None
+        self._artwork_images: list[bytes] | None = None
 
     async def get_artwork(self) -> "ArtWork":
-        """获取作品"""
-        return await self.site_service.get_artwork(self.review.artwork_id)
+        """获取作品 已经预取时直接返回"""
+        if self._artwork is None:
+            self._artwork = await self.site_service.get_artwork(self.review.artwork_id)
+        return self._artwork
 
     async def get_artwork_images(self) -> list[bytes]:
-        """获取作品图片"""
-        return await self.site_service.get_artwork_images(self.review.artwork_id)
+        """获取作品图片 已经预取时直接返回"""
+        if self._artwork_images is None:
+            self._artwork_images = await self.site_service.get_artwork_images(self.review.artwork_id)
+        return self._artwork_images
+
+    async def prefetch(self):
+        """预取作品信息与图片 可以自动审核的作品不会下载图片"""
+        if await self.try_auto_review() is not None:
+            return
+        await self.get_artwork()
+        await self.get_artwork_images()
 
     async def format_artwork_tags(self, artwork: "ArtWork", filter_character_tags: bool = False) -> str:
         """格式化作品标签"""
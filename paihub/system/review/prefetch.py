@@ -0,0 +1,90 @@
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING
+
+from paihub.log import logger
+
+if TYPE_CHECKING:
+    from paihub.system.review.ext import ReviewCallbackContext
+    from paihub.system.review.services import ReviewService
+
+__all__ = ("ReviewPrefetcher",)
+
+
+class ReviewPrefetcher:
+    """人工审核的预取器
+
+    在当前作品展示期间，预先从审核队列取出后面 size 个作品，并发获取作品信息与图片。
+    关闭时尚未展示的作品会放回 review:pending:{work_id}。
+    """
+
+    def __init__(self, review_service: "ReviewService", work_id: int, size: int = 3):
+        self.review_service = review_service
+        self.work_id = work_id
+        self.size = size
+        self._queue: deque[tuple[ReviewCallbackContext, asyncio.Task]] = deque()
+        self._exhausted = False
+
+    @property
+    def pending_count(self) -> int:
+        """已经从队列取出但尚未展示的作品数量"""
+        return len(self._queue)
+
+    async def _fill(self):
+        if self._exhausted or len(self._queue) >= self.size:
+            return
+        review_contexts = await self.review_service.retrieve_next_batch_for_review(
+            self.work_id, self.size - len(self._queue)
+        )
+        if not review_contexts:
+            self._exhausted = True
+            return
+        batch_task = asyncio.create_task(self._prefetch_artworks(review_contexts))
+        for review_context in review_contexts:
+            self._queue.append((review_context, asyncio.create_task(self._prefetch(review_context, batch_task))))
+
+    @staticmethod
+    async def _prefetch_artworks(review_contexts: list["ReviewCallbackContext"]):
+        """按网站批量获取作品信息 不支持批量查询的网站不做处理"""
+        artwork_ids: dict[str, list[int]] = {}
+        site_services = {}
+        for review_context in review_contexts:
+            artwork_ids.setdefault(review_context.site_key, []).append(review_context.artwork_id)
+            site_services[review_context.site_key] = review_context.site_service
+        for site_key, ids in artwork_ids.items():
+            try:
+                await site_services[site_key].prefetch_artworks(ids)
+            except Exception as exc:
+                logger.debug("批量获取 %s 作品信息失败", site_key, exc_info=exc)
+
+    @staticmethod
+    async def _prefetch(review_context: "ReviewCallbackContext", batch_task: asyncio.Task):
+        await asyncio.shield(batch_task)
+        await review_context.prefetch()
+
+    async def next(self) -> "ReviewCallbackContext | None":
+        """获取下一个作品 并继续预取后面的作品
+        :return: ReviewCallbackContext 队列为空时返回 None
+        """
+        await self._fill()
+        if not self._queue:
+            return None
+        review_context, task = self._queue.popleft()
+        await self._fill()
+        try:
+            await task
+        except Exception as exc:
+            # 预取失败时由调用方重新获取 以便按原有流程处理异常
+            logger.debug("预取作品 [%s]%s 失败", review_context.site_key, review_context.artwork_id, exc_info=exc)
+        return review_context
+
+    async def close(self):
+        """取消预取 并把尚未展示的作品放回审核队列"""
+        reviews_id = []
+        while self._queue:
+            review_context, task = self._queue.popleft()
+            task.cancel()
+            reviews_id.append(review_context.review_id)
+        if reviews_id:
+            await self.review_service.restore_pending_review(self.work_id, reviews_id)
+            logger.info("已将 %s 个预取的作品放回 Work %s 的审核队列", len(reviews_id), self.work_id)
@@ -1,51 +1,199 @@
-from sqlalchemy import text
+from collections.abc import AsyncIterator
+
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession as _AsyncSession
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from paihub.base import Repository
-from paihub.system.review.entities import Review, ReviewAuthorRule, ReviewStatus, StatusStatistics
+from paihub.system.review.entities import (
+    Review,
+    ReviewAuthorRule,
+    ReviewAuthorStats,
+    ReviewStatus,
+    StatusStatistics,
+)
+
+_STATS_COLUMNS = {
+    ReviewStatus.WAIT: "wait_count",
+    ReviewStatus.PASS: "pass_count",
+    ReviewStatus.REJECT: "reject_count",
+    ReviewStatus.MOVE: "move_count",
+}
+
+
+async def apply_author_stats(
+    session: _AsyncSession,
+    work_id: int | None,
+    site_key: str | None,
+    author_id: int | None,
+    status: ReviewStatus | str | None,
+    delta: int,
+):
+    """在当前事务中调整 review_author_stats 的计数
+    :param session: 当前会话
+    :param work_id: 工作ID
+    :param site_key: 网站唯一标识符
+    :param author_id: 作者ID
+    :param status: 审核状态 只统计 WAIT PASS REJECT MOVE
+    :param delta: 计数变化量
+    """
+    if isinstance(status, str):
+        status = ReviewStatus[status]
+    column = _STATS_COLUMNS.get(status)
+    if column is None or work_id is None or site_key is None or author_id is None:
+        return
+    statement = text(
+        f"INSERT INTO review_author_stats (work_id, site_key, author_id, {column}) "  # noqa: S608
+        "VALUES (:work_id, :site_key, :author_id, :delta) "
+        f"ON DUPLICATE KEY UPDATE {column} = {column} + :delta"
+    )
+    params = {"work_id": work_id, "site_key": site_key, "author_id": author_id, "delta": delta}
+    await session.execute(statement, params)
 
 
 class ReviewRepository(Repository[Review]):
-    async def get_artwork_id_by_work_and_web(
-        self, work_id: int, site_key: str, page_number: int, lines_per_page: int = 10000
-    ) -> list[int]:
+    """审核仓库 所有写入都会在同一个事务中维护 review_author_stats"""
+
+    @staticmethod
+    async def _get_stats_key(session: AsyncSession, review_id: int) -> tuple | None:
+        statement = text("SELECT work_id, site_key, author_id, status FROM review WHERE id = :id FOR UPDATE")
+        result = await session.execute(statement, {"id": review_id})
+        return result.first()
+
+    async def add(self, instance: Review) -> Review:
+        async with AsyncSession(self.engine) as session:
+            session.add(instance)
+            await apply_author_stats(
+                session, instance.work_id, instance.site_key, instance.author_id, instance.status, 1
+            )
+            await session.commit()
+            await session.refresh(instance)
+            return instance
+
+    async def update(self, instance: Review) -> Review:
+        async with AsyncSession(self.engine) as session:
+            old = await self._get_stats_key(session, instance.id) if instance.id is not None else None
+            new = (instance.work_id, instance.site_key, instance.author_id, instance.status)
+            session.add(instance)
+            if old is not None and (*old[:3], ReviewStatus[old[3]] if old[3] else None) != new:
+                await apply_author_stats(session, *old, delta=-1)
+                await apply_author_stats(session, *new, delta=1)
+            await session.commit()
+            await session.refresh(instance)
+            return instance
+
+    async def remove(self, instance: Review):
+        async with AsyncSession(self.engine) as session:
+            old = await self._get_stats_key(session, instance.id)
+            await session.delete(instance)
+            if old is not None:
+                await apply_author_stats(session, *old, delta=-1)
+            await session.commit()
+
+    async def iter_artwork_ids_by_work_and_web(
+        self, work_id: int, site_key: str, lines_per_page: int = 10000
+    ) -> AsyncIterator[list[int]]:
+        """按主键分页遍历指定 Work 与网站下已经存在的作品ID
+
+        使用 `id > :last_id ORDER BY id` 进行分页，避免 OFFSET 导致的重复扫描
+        :param work_id: 工作ID
+        :param site_key: 网站唯一标识符
+        :param lines_per_page: 每一页的数量
+        :return: 每次产出一页作品ID
+        """
+        statement = text(
+            "SELECT id, artwork_id "
+            "FROM review "
+            "WHERE work_id = :work_id and site_key = :site_key and id > :last_id "
+            "ORDER BY id "
+            "LIMIT :limit"
+        )
+        last_id = 0
+        while True:
+            async with _AsyncSession(self.engine) as session:
+                params = {"work_id": work_id, "site_key": site_key, "last_id": last_id, "limit": lines_per_page}
+                result = await session.execute(statement, params)
+                rows = result.all()
+            if len(rows) == 0:
+                return
+            last_id = rows[-1][0]
+            yield [row[1] for row in rows]
+
+    async def get_exists_artwork_ids(self, work_id: int, site_key: str, artwork_ids: list[int]) -> set[int]:
+        """获取指定作品ID中已经存在于审核库的部分
+        :param work_id: 工作ID
+        :param site_key: 网站唯一标识符
+        :param artwork_ids: 作品ID列表
+        :return: 已经存在的作品ID
+        """
+        if not artwork_ids:
+            return set()
         async with _AsyncSession(self.engine) as session:
-            offset = (page_number - 1) * lines_per_page
             statement = text(
                 "SELECT artwork_id "
                 "FROM review "
-                "WHERE work_id = :work_id and site_key = :site_key "
-                "LIMIT :limit OFFSET :offset"
-            )
-            params = {"work_id": work_id, "site_key": site_key, "limit": lines_per_page, "offset": offset}
+                "WHERE work_id = :work_id and site_key = :site_key and artwork_id IN :artwork_ids"
+            ).bindparams(bindparam("artwork_ids", expanding=True))
+            params = {"work_id": work_id, "site_key": site_key, "artwork_ids": artwork_ids}
             result = await session.execute(statement, params)
-            return result.scalars().all()
+            return set(result.scalars().all())
 
-    async def get_by_status(
-        self, work_id: int, status: ReviewStatus, page_number: int, lines_per_page: int = 1000
-    ) -> list[int]:
-        async with _AsyncSession(self.engine) as session:
-            offset = (page_number - 1) * lines_per_page
-            statement = text(
-                "SELECT id FROM review WHERE work_id = :work_id and status = :status LIMIT :limit OFFSET :offset"
-            )
-            params = {"work_id": work_id, "status": status.name, "limit": lines_per_page, "offset": offset}
-            result = await session.execute(statement, params)
-            return result.scalars().all()
+    async def iter_ids_by_status(
+        self, work_id: int, status: ReviewStatus, lines_per_page: int = 1000
+    ) -> AsyncIterator[list[int]]:
+        """按主键分页遍历指定 Work 下对应状态的审核ID
+        :param work_id: 工作ID
+        :param status: 审核状态
+        :param lines_per_page: 每一页的数量
+        :return: 每次产出一页审核ID
+        """
+        statement = text(
+            "SELECT id FROM review "
+            "WHERE work_id = :work_id and status = :status and id > :last_id "
+            "ORDER BY id "
+            "LIMIT :limit"
+        )
+        last_id = 0
+        while True:
+            async with _AsyncSession(self.engine) as session:
+                params = {"work_id": work_id, "status": status.name, "last_id": last_id, "limit": lines_per_page}
+                result = await session.execute(statement, params)
+                reviews_id = result.scalars().all()
+            if len(reviews_id) == 0:
+                return
+            last_id = reviews_id[-1]
+            yield reviews_id
 
     async def get_by_status_statistics(self, work_id: int, site_key: str, author_id: int) -> StatusStatistics:
-        async with _AsyncSession(self.engine) as session:
-            statement = text(
-                "SELECT `status`, COUNT(*) AS count "
-                "FROM review "
-                "WHERE work_id = :work_id and author_id = :author_id and site_key = :site_key "
-                "GROUP BY `status`"
+        async with AsyncSession(self.engine) as session:
+            statement = select(ReviewAuthorStats).where(
+                ReviewAuthorStats.work_id == work_id,
+                ReviewAuthorStats.site_key == site_key,
+                ReviewAuthorStats.author_id == author_id,
             )
-            params = {"work_id": work_id, "author_id": author_id, "site_key": site_key}
-            result = await session.execute(statement, params)
-            return StatusStatistics.parse_form_result(result)
+            results = await session.exec(statement)
+            stats = results.first()
+            if stats is None:
+                return StatusStatistics()
+            return stats.to_statistics()
+
+    async def get_by_status_statistics_batch(
+        self, work_id: int, author_ids: list[int]
+    ) -> dict[tuple[str, int], StatusStatistics]:
+        """在一次查询中获取多个作者的审核状态统计
+        :param work_id: 工作ID
+        :param author_ids: 作者ID列表
+        :return: 以 (site_key, author_id) 为键的统计信息
+        """
+        if not author_ids:
+            return {}
+        async with AsyncSession(self.engine) as session:
+            statement = select(ReviewAuthorStats).where(
+                ReviewAuthorStats.work_id == work_id, ReviewAuthorStats.author_id.in_(author_ids)
+            )
+            results = await session.exec(statement)
+            return {(stats.site_key, stats.author_id): stats.to_statistics() for stats in results.all()}
 
     async def get_filtered_status_counts(
         self, site_key: str, min_total_count: int = 10, pass_ratio_threshold: float = 0.8
@@ -54,10 +202,10 @@ class ReviewRepository(Repository[Review]):
             statement = text(
                 "SELECT "
                 "author_id, "
-                "SUM(IF(status = 'PASS', 1, 0)) AS pass_count, "
-                "SUM(IF(status = 'REJECT', 1, 0)) AS reject_count, "
-                "SUM(IF(status = 'PASS' OR status = 'REJECT', 1, 0)) AS total_count "
-                "FROM review "
+                "SUM(pass_count) AS pass_count, "
+                "SUM(reject_count) AS reject_count, "
+                "SUM(pass_count + reject_count) AS total_count "
+                "FROM review_author_stats "
                 "WHERE site_key = :site_key "
                 "GROUP BY author_id "
                 "HAVING total_count > :min_total_count AND (pass_count / total_count) >= :pass_ratio_threshold "
@@ -96,6 +244,14 @@ class ReviewRepository(Repository[Review]):
             results = await session.exec(statement)
             return results.first()
 
+    async def get_by_ids(self, review_ids: list[int]) -> list[Review]:
+        if not review_ids:
+            return []
+        async with AsyncSession(self.engine) as session:
+            statement = select(Review).where(Review.id.in_(review_ids))
+            results = await session.exec(statement)
+            return results.all()
+
     async def get_by_ids_with_status(self, review_ids: list[int], status: ReviewStatus) -> list[Review]:
         """批量查询指定ID列表中状态符合条件的 Review
 
@@ -126,6 +282,17 @@ class ReviewAuthorRuleRepository(Repository[ReviewAuthorRule]):
             results = await session.exec(statement)
             return results.all()
 
+    async def get_by_work_authors(self, work_id: int, author_ids: list[int]) -> list[ReviewAuthorRule]:
+        if not author_ids:
+            return []
+        async with AsyncSession(self.engine) as session:
+            statement = select(ReviewAuthorRule).where(
+                ReviewAuthorRule.work_id == work_id,
+                ReviewAuthorRule.author_id.in_(author_ids),
+            )
+            results = await session.exec(statement)
+            return results.all()
+
     async def get_by_work_site_author(self, work_id: int, site_key: str, author_id: int) -> ReviewAuthorRule | None:
         async with AsyncSession(self.engine) as session:
             statement = select(ReviewAuthorRule).where(
@@ -135,3 +302,27 @@ class ReviewAuthorRuleRepository(Repository[ReviewAuthorRule]):
             )
             results = await session.exec(statement)
             return results.first()
+
+
+class ReviewAuthorStatsRepository(Repository[ReviewAuthorStats]):
+    async def rebuild(self) -> int:
+        """从 review 表重新计算全部作者统计
+        :return: int 重建后的统计行数
+        """
+        async with _AsyncSession(self.engine) as session:
+            await session.execute(text("DELETE FROM review_author_stats"))
+            statement = text(
+                "INSERT INTO review_author_stats "
+                "(work_id, site_key, author_id, wait_count, pass_count, reject_count, move_count) "
+                "SELECT work_id, site_key, author_id, "
+                "SUM(IF(status = 'WAIT', 1, 0)), "
+                "SUM(IF(status = 'PASS', 1, 0)), "
+                "SUM(IF(status = 'REJECT', 1, 0)), "
+                "SUM(IF(status = 'MOVE', 1, 0)) "
+                "FROM review "
+                "WHERE work_id IS NOT NULL and site_key IS NOT NULL and author_id IS NOT NULL "
+                "GROUP BY work_id, site_key, author_id"
+            )
+            result = await session.execute(statement)
+            await session.commit()
+            return result.rowcount
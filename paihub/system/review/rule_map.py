@@ -0,0 +1,101 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+
+from paihub.base import Component
+from paihub.dependence.redis import Redis
+from paihub.log import logger
+from paihub.system.review.entities import ReviewAuthorRule, ReviewAuthorRuleAction
+from paihub.utils.aioredis import RedisConnectionError, RedisTimeoutError
+
+__all__ = ("ReviewAuthorRuleMap",)
+
+type RuleKey = tuple[str, int]
+
+
+class ReviewAuthorRuleMap(Component):
+    """以 Work 为单位缓存在进程内的作者规则 (site_key, author_id) -> action
+
+    首次使用时从数据库整体加载；规则变更后清除本地缓存并通过 Redis 频道通知其他进程清除。
+    与订阅断开期间可能错过通知，因此重新订阅时会清除全部缓存。
+    """
+
+    channel = "review:author_rule:invalidate"
+
+    def __init__(self, redis: Redis):
+        self.client = redis.client
+        self._rules: dict[int, dict[RuleKey, ReviewAuthorRuleAction]] = {}
+        self._versions: dict[int, int] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._listen_task: asyncio.Task | None = None
+
+    async def initialize(self):
+        self._listen_task = asyncio.create_task(self._listen())
+
+    async def shutdown(self):
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listen_task
+
+    async def get(
+        self, work_id: int, loader: Callable[[int], Awaitable[list[ReviewAuthorRule]]]
+    ) -> dict[RuleKey, ReviewAuthorRuleAction]:
+        """获取 Work 的作者规则
+        :param work_id: 工作ID
+        :param loader: 缓存不存在时读取该 Work 全部规则的方法
+        :return: 以 (site_key, author_id) 为键的规则动作
+        """
+        rules = self._rules.get(work_id)
+        if rules is not None:
+            return rules
+        lock = self._locks.setdefault(work_id, asyncio.Lock())
+        async with lock:
+            rules = self._rules.get(work_id)
+            if rules is not None:
+                return rules
+            version = self._versions.get(work_id, 0)
+            rules = {(rule.site_key, rule.author_id): rule.action for rule in await loader(work_id)}
+            # 加载期间收到失效通知时不写入缓存 下次重新加载
+            if self._versions.get(work_id, 0) == version:
+                self._rules[work_id] = rules
+            return rules
+
+    def discard(self, work_id: int):
+        self._versions[work_id] = self._versions.get(work_id, 0) + 1
+        self._rules.pop(work_id, None)
+
+    def clear(self):
+        for work_id in list(self._versions) + list(self._rules):
+            self.discard(work_id)
+
+    async def invalidate(self, work_id: int):
+        """规则变更后清除本进程与其他进程的缓存
+        :param work_id: 工作ID
+        """
+        self.discard(work_id)
+        try:
+            await self.client.publish(self.channel, work_id)
+        except (RedisConnectionError, RedisTimeoutError) as exc:
+            logger.warning("发布作者规则变更通知失败 其他进程可能仍在使用旧的规则", exc_info=exc)
+
+    async def _listen(self):
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # 订阅前后可能错过通知 清除全部缓存
+                self.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        self.discard(int(message["data"]))
+                    except ValueError:
+                        logger.warning("无法解析作者规则变更通知 %s", message["data"])
+            except (RedisConnectionError, RedisTimeoutError) as exc:
+                logger.warning("作者规则变更订阅断开 5 秒后重试", exc_info=exc)
+                self.clear()
+                await asyncio.sleep(5)
+            finally:
+                await pubsub.aclose()
@@ -1,3 +1,5 @@
+import asyncio
+
 from paihub.base import Service
 from paihub.system.name_map.service import WorkTagFormatterService
 from paihub.system.review.cache import ReviewCache
@@ -10,7 +12,13 @@ from paihub.system.review.entities import (
     StatusStatistics,
 )
 from paihub.system.review.ext import ReviewCallbackContext
-from paihub.system.review.repositories import ReviewAuthorRuleRepository, ReviewRepository
+from paihub.system.review.prefetch import ReviewPrefetcher
+from paihub.system.review.repositories import (
+    ReviewAuthorRuleRepository,
+    ReviewAuthorStatsRepository,
+    ReviewRepository,
+)
+from paihub.system.review.rule_map import ReviewAuthorRuleMap
 from paihub.system.sites.manager import SitesManager
 from paihub.system.work.error import WorkRuleNotFound
 from paihub.system.work.repositories import WorkRepository, WorkRuleRepository
@@ -26,42 +34,52 @@ class ReviewService(Service):
         sites_manager: SitesManager,
         review_repository: ReviewRepository,
         review_author_rule_repository: ReviewAuthorRuleRepository,
+        review_author_stats_repository: ReviewAuthorStatsRepository,
         review_cache: ReviewCache,
         tag_formatter: WorkTagFormatterService,
+        author_rule_map: ReviewAuthorRuleMap,
     ):
         self.review_repository = review_repository
+        self.author_rule_map = author_rule_map
         self.review_author_rule_repository = review_author_rule_repository
+        self.review_author_stats_repository = review_author_stats_repository
         self.work_repository = work_repository
         self.sites_manager = sites_manager
         self.work_rule_repository = work_rule_repository
         self.review_cache = review_cache
         self.tag_formatter = tag_formatter
+        self._initialize_locks: dict[int, asyncio.Lock] = {}
 
     @property
     def repository(self):
         return self.review_repository
 
     async def initialize_review_form_sites(
-        self, work_id: int, lines_per_page: int = 10000, create_by: int | None = None
+        self, work_id: int, lines_per_page: int = 10000, create_by: int | None = None, full_rebuild: bool = False
     ) -> int:
         """通知网站初始化审核队列
         :param work_id: 工作OD
         :param lines_per_page: 每一页的操作数量
         :param create_by: 当前操作的用户ID
+        :param full_rebuild: 是否忽略水位线全量重建 规则变更时网站会自动全量重建
         :return: int 已经添加进队列的数量
         """
         count = 0
         work_rule = await self.work_rule_repository.get_by_work_id(work_id)
         if work_rule is None:
             raise WorkRuleNotFound
-        for s in self.sites_manager.get_all_sites():
-            count += await s.initialize_review(
-                work_id,
-                search_text=work_rule.search_text,
-                is_pattern=work_rule.is_pattern,
-                lines_per_page=lines_per_page,
-                create_by=create_by,
-            )
+        # 不同 Work 之间可以并发初始化 同一个 Work 需要串行 避免重复写入审核库
+        lock = self._initialize_locks.setdefault(work_id, asyncio.Lock())
+        async with lock:
+            for s in self.sites_manager.get_all_sites():
+                count += await s.initialize_review(
+                    work_id,
+                    search_text=work_rule.search_text,
+                    is_pattern=work_rule.is_pattern,
+                    lines_per_page=lines_per_page,
+                    create_by=create_by,
+                    full_rebuild=full_rebuild,
+                )
         return count
 
     async def initialize_review_queue(self, work_id: int) -> int:
@@ -70,15 +88,8 @@ class ReviewService(Service):
         :return: int 已经添加进队列的数量
         """
         count = 0
-        page_number = 1
-        while True:
-            reviews_id = await self.review_repository.get_by_status(
-                work_id, status=ReviewStatus.WAIT, page_number=page_number
-            )
-            if len(reviews_id) == 0:
-                break
+        async for reviews_id in self.review_repository.iter_ids_by_status(work_id, status=ReviewStatus.WAIT):
             count += await self.review_cache.set_pending_review(reviews_id, work_id)
-            page_number += 1
         return count
 
     async def retrieve_next_for_review(self, work_id: int) -> ReviewCallbackContext | None:
@@ -95,6 +106,42 @@ class ReviewService(Service):
             review=review_data, site_service=site_service, review_service=self, tag_formatter=self.tag_formatter
         )
 
+    async def retrieve_next_batch_for_review(self, work_id: int, count: int) -> list[ReviewCallbackContext]:
+        """从审核队列批量获取作品
+        :param work_id: 工作ID
+        :param count: 最多获取的数量
+        :return: List[ReviewCallbackContext]
+        """
+        reviews_id = await self.review_cache.get_pending_reviews(work_id, count)
+        reviews = await self.review_repository.get_by_ids([int(review_id) for review_id in reviews_id])
+        return [
+            ReviewCallbackContext(
+                review=review,
+                site_service=self.sites_manager.get_site_by_site_key(review.site_key),
+                review_service=self,
+                tag_formatter=self.tag_formatter,
+            )
+            for review in sorted(reviews, key=lambda x: x.id)
+        ]
+
+    def create_prefetcher(self, work_id: int, size: int = 3) -> ReviewPrefetcher:
+        """创建人工审核使用的预取器
+        :param work_id: 工作ID
+        :param size: 预取的作品数量
+        :return: ReviewPrefetcher
+        """
+        return ReviewPrefetcher(self, work_id, size)
+
+    async def restore_pending_review(self, work_id: int, reviews_id: list[int]) -> int:
+        """把未处理的作品放回审核队列
+        :param work_id: 工作ID
+        :param reviews_id: ReviewID 列表
+        :return: int 放回队列的数量
+        """
+        if not reviews_id:
+            return 0
+        return await self.review_cache.set_pending_review(reviews_id, work_id)
+
     async def get_review_count(self, work_id: int) -> int:
         """获取下一个审核的队列
         :param work_id:
@@ -171,17 +218,21 @@ class ReviewService(Service):
                 create_by=update_by,
             )
             await self.review_author_rule_repository.add(rule)
+            await self.author_rule_map.invalidate(work_id)
             return await self.review_author_rule_repository.get_by_work_site_author(work_id, site_key, author_id)
         rule.action = action
         rule.reason = reason
         rule.update_by = update_by
-        return await self.review_author_rule_repository.update(rule)
+        rule = await self.review_author_rule_repository.update(rule)
+        await self.author_rule_map.invalidate(work_id)
+        return rule
 
     async def remove_author_rule(self, work_id: int, site_key: str, author_id: int) -> bool:
         rule = await self.review_author_rule_repository.get_by_work_site_author(work_id, site_key, author_id)
         if rule is None:
             return False
         await self.review_author_rule_repository.remove(rule)
+        await self.author_rule_map.invalidate(work_id)
         return True
 
     async def remove_author_rule_by_id(self, rule_id: int) -> bool:
@@ -189,6 +240,7 @@ class ReviewService(Service):
         if rule is None:
             return False
         await self.review_author_rule_repository.remove(rule)
+        await self.author_rule_map.invalidate(rule.work_id)
         return True
 
     async def try_auto_review(self, work_id: int, site_key: str, author_id: int | None) -> AutoReviewResult | None:
@@ -201,21 +253,58 @@ class ReviewService(Service):
         if author_id is None:
             return None
 
-        author_rule = await self.review_author_rule_repository.get_by_work_site_author(work_id, site_key, author_id)
-        if author_rule is not None:
-            is_auto_pass = author_rule.action == ReviewAuthorRuleAction.AUTO_PASS
-            description = "author_whitelist" if is_auto_pass else "author_blacklist"
-            return AutoReviewResult(status=is_auto_pass, statistics=StatusStatistics(), description=description)
+        author_rules = await self.author_rule_map.get(work_id, self.review_author_rule_repository.get_all_by_work_id)
+        action = author_rules.get((site_key, author_id))
+        if action is not None:
+            return self._auto_review_by_author_rule(action)
 
         statistics = await self.review_repository.get_by_status_statistics(
             work_id, site_key=site_key, author_id=author_id
         )
+        return self._auto_review_by_statistics(statistics)
+
+    async def try_auto_review_batch(self, work_id: int, reviews: list[Review]) -> dict[int, AutoReviewResult | None]:
+        """批量尝试自动审核 作者规则从进程内缓存读取 作者历史统计只需要一次查询
+        :param work_id: 当前 Work id
+        :param reviews: 需要审核的 Review 列表
+        :return: 以 review_id 为键的自动审核结果 无法判断的为 None
+        """
+        author_ids = list({review.author_id for review in reviews if review.author_id is not None})
+        author_rules = await self.author_rule_map.get(work_id, self.review_author_rule_repository.get_all_by_work_id)
+        statistics = await self.review_repository.get_by_status_statistics_batch(work_id, author_ids)
+        results: dict[int, AutoReviewResult | None] = {}
+        for review in reviews:
+            if review.author_id is None:
+                results[review.id] = None
+                continue
+            key = (review.site_key, review.author_id)
+            action = author_rules.get(key)
+            if action is not None:
+                results[review.id] = self._auto_review_by_author_rule(action)
+            else:
+                results[review.id] = self._auto_review_by_statistics(statistics.get(key, StatusStatistics()))
+        return results
+
+    @staticmethod
+    def _auto_review_by_author_rule(action: ReviewAuthorRuleAction) -> AutoReviewResult:
+        is_auto_pass = action == ReviewAuthorRuleAction.AUTO_PASS
+        description = "author_whitelist" if is_auto_pass else "author_blacklist"
+        return AutoReviewResult(status=is_auto_pass, statistics=StatusStatistics(), description=description)
+
+    @staticmethod
+    def _auto_review_by_statistics(statistics: StatusStatistics) -> AutoReviewResult | None:
         if statistics.already >= 3:
             if statistics.pass_count / statistics.already >= 0.5:
                 return AutoReviewResult(status=True, statistics=statistics, description="history_pass_ratio")
             return AutoReviewResult(status=False, statistics=statistics, description="history_reject_ratio")
         return None
 
+    async def rebuild_author_stats(self) -> int:
+        """从审核库重建作者审核统计 用于修正增量维护产生的偏差
+        :return: int 重建后的统计行数
+        """
+        return await self.review_author_stats_repository.rebuild()
+
     async def get_review_by_artwork_id(self, artwork_id: int) -> list[Review]:
         """从根据 artwork_id获取数据库中的审核信息
         :param artwork_id: 作品ID
@@ -0,0 +1,24 @@
+from paihub.base import Component
+from paihub.dependence.redis import Redis
+
+
+class SenderCache(Component):
+    def __init__(self, redis: Redis):
+        self.client = redis.client
+        self.ttl = 30 * 24 * 60 * 60  # file_id 长期有效 只在一段时间没有使用后过期
+
+    async def get_file_ids(self, site_key: str, artwork_id: int) -> dict[int, str]:
+        data = await self.client.hgetall(f"sender:file_id:{site_key}:{artwork_id}")
+        return {int(page): file_id for page, file_id in data.items()}
+
+    async def set_file_ids(self, site_key: str, artwork_id: int, file_ids: dict[int, str]):
+        if not file_ids:
+            return
+        key = f"sender:file_id:{site_key}:{artwork_id}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=file_ids)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def del_file_ids(self, site_key: str, artwork_id: int):
+        await self.client.delete(f"sender:file_id:{site_key}:{artwork_id}")
@@ -0,0 +1,115 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from telegram.error import RetryAfter as BotRetryAfter
+
+from paihub.base import Component
+from paihub.log import logger
+
+__all__ = ("SendScheduler", "TokenBucket")
+
+
+class TokenBucket:
+    """令牌桶
+
+    令牌允许透支：取出后余额为负时，调用方需要等待余额恢复到 0 的时间，保证多个调用方按请求顺序排队。
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate: float | None = None):
+        self.default_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 4
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at: float | None = None
+        self.paused_until = 0.0
+
+    def reserve(self, count: float, now: float) -> float:
+        """取出令牌
+        :param count: 令牌数量 超过容量时透支 需要等待余额恢复
+        :param now: 当前时间
+        :return: 需要等待的秒数
+        """
+        if self.updated_at is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= count
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.paused_until - now)
+
+    def pause(self, seconds: float, now: float):
+        """收到 RetryAfter 后暂停发送并降低速率"""
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = min(self.tokens, 0)
+        self.updated_at = max(now, self.updated_at or now)
+        self.rate = max(self.min_rate, self.rate * 0.8)
+
+    def recover(self):
+        """发送成功后逐渐恢复速率"""
+        if self.rate < self.default_rate:
+            self.rate = min(self.default_rate, self.rate * 1.05)
+
+
+class SendScheduler(Component):
+    """Telegram 发送调度器
+
+    所有发送共用一个全局令牌桶，每个会话另有一个令牌桶，媒体组中的每个媒体都计为一条消息。
+    收到 RetryAfter 时暂停对应会话并降低其速率，之后的发送成功会逐渐恢复。
+    """
+
+    GLOBAL_RATE = 25  # 每秒消息数
+    GROUP_RATE = 20 / 60  # 频道与群组每秒消息数
+    GROUP_CAPACITY = 10  # 允许一次发送完整的媒体组
+    PRIVATE_RATE = 1
+    PRIVATE_CAPACITY = 3
+    MAX_RETRIES = 3
+
+    def __init__(self):
+        self._global = TokenBucket(self.GLOBAL_RATE, self.GLOBAL_RATE)
+        self._chats: dict[int, TokenBucket] = {}
+
+    def _get_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if chat_id < 0:
+                bucket = TokenBucket(self.GROUP_RATE, self.GROUP_CAPACITY)
+            else:
+                bucket = TokenBucket(self.PRIVATE_RATE, self.PRIVATE_CAPACITY)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    async def acquire(self, chat_id: int, count: int = 1):
+        """等待可以向会话发送消息
+        :param chat_id: 会话ID
+        :param count: 消息数量 媒体组为媒体的数量
+        """
+        now = asyncio.get_running_loop().time()
+        wait = max(self._global.reserve(count, now), self._get_bucket(chat_id).reserve(count, now))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_retry_after(self, chat_id: int, retry_after: float):
+        now = asyncio.get_running_loop().time()
+        self._get_bucket(chat_id).pause(retry_after, now)
+        logger.warning("向会话 %s 发送消息触发速率限制 暂停 %s 秒", chat_id, retry_after)
+
+    async def send[T](self, chat_id: int, count: int, func: Callable[[], Awaitable[T]]) -> T:
+        """按速率限制发送 收到 RetryAfter 时等待后重试
+        :param chat_id: 会话ID
+        :param count: 消息数量 媒体组为媒体的数量
+        :param func: 执行发送的方法
+        :return: 发送结果
+        """
+        attempt = 1
+        while True:
+            await self.acquire(chat_id, count)
+            try:
+                result = await func()
+            except BotRetryAfter as exc:
+                self.on_retry_after(chat_id, exc.retry_after + 1)
+                if attempt >= self.MAX_RETRIES:
+                    raise
+                attempt += 1
+                continue
+            self._get_bucket(chat_id).recover()
+            return result
@@ -0,0 +1,154 @@
+from telegram import InputMediaPhoto, Message
+from telegram.constants import ChatAction, ParseMode
+from telegram.error import BadRequest as BotBadRequest
+
+from paihub.base import Service
+from paihub.entities.artwork import ImageType
+from paihub.log import logger
+from paihub.system.sender.cache import SenderCache
+from paihub.system.sender.scheduler import SendScheduler
+
+
+class SenderService(Service):
+    """发送作品图片到 Telegram
+
+    记录 Telegram 返回的 file_id，以 (site_key, artwork_id, page) 为键，再次发送同一作品时直接使用 file_id 而不重新上传。
+    所有发送都经过 SendScheduler 限制速率。
+    """
+
+    def __init__(self, sender_cache: SenderCache, scheduler: SendScheduler):
+        self.sender_cache = sender_cache
+        self.scheduler = scheduler
+
+    async def send_artwork(
+        self,
+        site_key: str,
+        artwork_id: int,
+        artwork_images: list[bytes],
+        image_type: ImageType,
+        caption: str,
+        chat_id: int | None = None,
+        reply_to: Message | None = None,
+    ) -> list[Message]:
+        """发送作品 多张图片时以媒体组发送 最多发送前10张
+        :param site_key: 网站关键标识符
+        :param artwork_id: 作品ID
+        :param artwork_images: 作品图片
+        :param image_type: 图片类型
+        :param caption: 说明文字
+        :param chat_id: 发送到的会话 与 reply_to 二选一
+        :param reply_to: 回复的消息
+        :return: 发送的消息列表
+        """
+        artwork_images = artwork_images[:10]
+        target_chat_id = reply_to.chat_id if reply_to is not None else chat_id
+        file_ids = await self.sender_cache.get_file_ids(site_key, artwork_id)
+
+        async def send(_file_ids: dict[int, str]) -> list[Message]:
+            return await self.scheduler.send(
+                target_chat_id,
+                len(artwork_images),
+                lambda: self._send(artwork_images, _file_ids, image_type, caption, chat_id, reply_to),
+            )
+
+        if any(page in file_ids for page in range(len(artwork_images))):
+            try:
+                messages = await send(file_ids)
+            except BotBadRequest as exc:
+                # file_id 失效时清除记录并重新上传
+                logger.warning("使用 file_id 发送 [%s]%s 失败 重新上传：%s", site_key, artwork_id, exc.message)
+                await self.sender_cache.del_file_ids(site_key, artwork_id)
+                messages = await send({})
+        else:
+            messages = await send({})
+        await self.sender_cache.set_file_ids(site_key, artwork_id, self.get_file_ids(messages))
+        return messages
+
+    async def send_documents(self, artwork_images: list[bytes], caption: str, reply_to: Message) -> list[Message]:
+        """按速率限制以文件形式逐张发送图片 用于超出图片大小限制的作品
+        :param artwork_images: 作品图片
+        :param caption: 说明文字
+        :param reply_to: 回复的消息
+        :return: 发送的消息列表
+        """
+        messages = []
+        for image in artwork_images:
+            message = await self.scheduler.send(
+                reply_to.chat_id,
+                1,
+                lambda image=image: reply_to.reply_document(
+                    document=image,
+                    caption=caption,
+                    parse_mode=ParseMode.HTML,
+                    connect_timeout=10,
+                    read_timeout=10,
+                    write_timeout=30,
+                ),
+            )
+            messages.append(message)
+        return messages
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> Message:
+        """按速率限制发送文本消息
+        :param chat_id: 会话ID
+        :param text: 消息内容
+        :return: 发送的消息
+        """
+        bot = self.application.bot.bot
+        return await self.scheduler.send(chat_id, 1, lambda: bot.send_message(chat_id=chat_id, text=text, **kwargs))
+
+    async def _send(
+        self,
+        artwork_images: list[bytes],
+        file_ids: dict[int, str],
+        image_type: ImageType,
+        caption: str,
+        chat_id: int | None,
+        reply_to: Message | None,
+    ) -> list[Message]:
+        bot = self.application.bot.bot
+        media = [file_ids.get(page, data) for page, data in enumerate(artwork_images)]
+        if reply_to is not None:
+            dynamic = len(media) == 1 and image_type == ImageType.DYNAMIC
+            await reply_to.reply_chat_action(ChatAction.UPLOAD_VIDEO if dynamic else ChatAction.UPLOAD_PHOTO)
+        timeouts = {"connect_timeout": 10, "read_timeout": 10, "write_timeout": 30}
+        if len(media) > 1:
+            media_group = [InputMediaPhoto(media=media[0], caption=caption, parse_mode=ParseMode.HTML)]
+            media_group.extend(InputMediaPhoto(media=data) for data in media[1:])
+            if reply_to is not None:
+                return list(await reply_to.reply_media_group(media_group, **timeouts))
+            return list(await bot.send_media_group(chat_id=chat_id, media=media_group, **timeouts))
+        if len(media) == 1:
+            if image_type == ImageType.STATIC:
+                if reply_to is not None:
+                    message = await reply_to.reply_photo(
+                        photo=media[0], caption=caption, parse_mode=ParseMode.HTML, **timeouts
+                    )
+                else:
+                    message = await bot.send_photo(
+                        chat_id=chat_id, photo=media[0], caption=caption, parse_mode=ParseMode.HTML, **timeouts
+                    )
+                return [message]
+            if image_type == ImageType.DYNAMIC:
+                if reply_to is not None:
+                    message = await reply_to.reply_video(
+                        video=media[0], caption=caption, parse_mode=ParseMode.HTML, **timeouts
+                    )
+                else:
+                    message = await bot.send_video(
+                        chat_id=chat_id, video=media[0], caption=caption, parse_mode=ParseMode.HTML, **timeouts
+                    )
+                return [message]
+        return []
+
+    @staticmethod
+    def get_file_ids(messages: list[Message]) -> dict[int, str]:
+        file_ids = {}
+        for page, message in enumerate(messages):
+            if message.photo:
+                file_ids[page] = message.photo[-1].file_id
+            elif message.video is not None:
+                file_ids[page] = message.video.file_id
+            elif message.animation is not None:
+                file_ids[page] = message.animation.file_id
+        return file_ids
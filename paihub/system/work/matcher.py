@@ -0,0 +1,107 @@
+import re
+from collections import deque
+from collections.abc import Iterable, Sequence
+
+from paihub.log import logger
+from paihub.system.work.entities import WorkRule
+
+__all__ = ("AhoCorasick", "WorkRuleMatcher")
+
+
+class AhoCorasick[T]:
+    """Aho-Corasick 多模式匹配自动机
+
+    一次遍历文本即可找出所有命中的模式，耗时与文本长度相关，与模式数量无关。
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, T]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[set[T]] = [set()]
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._build()
+
+    def _add(self, pattern: str, value: T):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            state = next_state
+        self._output[state].add(value)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def search(self, text: str) -> set[T]:
+        result: set[T] = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                result |= self._output[state]
+        return result
+
+
+class WorkRuleMatcher:
+    """把所有 WorkRule 编译为一个匹配器 用于在写入作品时直接判断作品属于哪些 Work
+
+    与数据库中的匹配方式保持一致：
+    非正则规则匹配以 search_text 开头的标签（与 pixiv_tag 前缀查询一致），忽略大小写；
+    正则规则对以 # 连接的标签执行 REGEXP，先用所有正则组成的单个选择表达式预筛选，命中后再逐条确认。
+    """
+
+    def __init__(self, rules: Iterable[WorkRule]):
+        keywords: list[tuple[str, int]] = []
+        self._patterns: list[tuple[int, re.Pattern]] = []
+        self.rules: list[WorkRule] = []  # 能够在写入作品时匹配的规则 不包含无法编译的正则规则
+        for rule in rules:
+            if rule.is_pattern:
+                try:
+                    self._patterns.append((rule.work_id, re.compile(rule.search_text, re.IGNORECASE)))
+                except re.error as exc:
+                    logger.warning("Work %s 的规则 %s 无法编译为正则表达式：%s", rule.work_id, rule.search_text, exc)
+                    continue
+            else:
+                keywords.append((f"#{rule.search_text.casefold()}", rule.work_id))
+            self.rules.append(rule)
+        self._automaton = AhoCorasick(keywords)
+        self._combined: re.Pattern | None = None
+        if self._patterns:
+            try:
+                self._combined = re.compile(
+                    "|".join(f"(?:{pattern.pattern})" for _, pattern in self._patterns), re.IGNORECASE
+                )
+            except re.error:
+                # 含有编号反向引用等无法合并的表达式时 直接逐条匹配
+                self._combined = None
+
+    def match(self, tags: Sequence[str]) -> set[int]:
+        """返回标签命中的 Work ID
+        :param tags: 作品标签
+        :return: 命中的 Work ID 集合
+        """
+        if not tags:
+            return set()
+        text = "#".join(tags)
+        result = self._automaton.search(f"#{text}".casefold())
+        if self._patterns and (self._combined is None or self._combined.search(text)):
+            result.update(work_id for work_id, pattern in self._patterns if pattern.search(text))
+        return result
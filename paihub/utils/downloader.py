@@ -0,0 +1,46 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+
+from paihub.log import logger
+
+__all__ = ("ConcurrentDownloader",)
+
+
+class ConcurrentDownloader:
+    """并发下载同一作品的多张图片
+
+    同一站点的所有下载共用一个信号量限制并发数量，返回结果与传入的链接顺序一致。
+    """
+
+    def __init__(self, site_name: str, concurrency: int = 4):
+        self.site_name = site_name
+        self.concurrency = max(1, concurrency)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def _fetch(self, fetch: Callable[[str], Awaitable[bytes]], url: str) -> bytes:
+        async with self._semaphore:
+            return await fetch(url)
+
+    async def download(
+        self, artwork_id: int | str, urls: Sequence[str], fetch: Callable[[str], Awaitable[bytes]]
+    ) -> list[bytes]:
+        """下载作品的所有图片
+        :param artwork_id: 作品ID 用于日志
+        :param urls: 图片链接
+        :param fetch: 下载单张图片的方法
+        :return: 与 urls 顺序一致的图片数据
+        """
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(self._fetch(fetch, url)) for url in urls]
+        try:
+            result = await asyncio.gather(*tasks)
+        except BaseException:
+            # 任意一张图片下载失败时取消其余下载 以原有异常通知调用方
+            for task in tasks:
+                task.cancel()
+            raise
+        logger.info(
+            "[%s] 作品 %s 下载 %s 张图片 耗时 %.2fs", self.site_name, artwork_id, len(urls), time.perf_counter() - start
+        )
+        return result
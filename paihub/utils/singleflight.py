@@ -0,0 +1,38 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+__all__ = ("SingleFlight",)
+
+
+class SingleFlight[K: Hashable, V]:
+    """合并相同键的并发请求
+
+    同一个键同时只有一个请求在执行，其他调用方等待并共享它的结果或异常。
+    请求在独立的任务中执行，某个调用方被取消不会影响其他调用方。
+    """
+
+    def __init__(self):
+        self._calls: dict[K, asyncio.Task[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """执行请求 已有相同键的请求在执行时等待它的结果
+        :param key: 请求的键
+        :param func: 执行请求的方法
+        :return: 请求结果
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task)
+
+    def _done(self, key: K, task: asyncio.Task[V]):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 所有调用方都已取消时 避免出现未获取异常的警告
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,82 @@
+from collections.abc import AsyncIterable
+from tempfile import SpooledTemporaryFile
+
+from paihub.error import ImagesTooLarge
+
+__all__ = ("StreamBuffer", "read_stream")
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_SPOOL_THRESHOLD = 16 * 1024 * 1024
+
+
+class StreamBuffer:
+    """流式下载使用的缓冲区
+
+    已知 Content-Length 时预先分配 bytearray 并按偏移写入；长度未知时写入 SpooledTemporaryFile，超过阈值后转存到临时文件。
+    总大小超过 max_size 时抛出 ImagesTooLarge。
+    """
+
+    def __init__(
+        self,
+        content_length: int | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+    ):
+        if content_length is not None and content_length > max_size:
+            raise ImagesTooLarge(f"Content-Length {content_length} exceeds {max_size} bytes")
+        self.max_size = max_size
+        self.size = 0
+        self._buffer: bytearray | None = None
+        self._file: SpooledTemporaryFile | None = None
+        if content_length is not None:
+            self._buffer = bytearray(content_length)
+        else:
+            self._file = SpooledTemporaryFile(max_size=spool_threshold)  # noqa: SIM115
+
+    def write(self, chunk: bytes):
+        end = self.size + len(chunk)
+        if end > self.max_size:
+            self.close()
+            raise ImagesTooLarge(f"Stream exceeds {self.max_size} bytes")
+        if self._buffer is not None:
+            # 服务器返回的数据多于 Content-Length 时 切片赋值会自动扩展
+            self._buffer[self.size : end] = chunk
+        else:
+            self._file.write(chunk)
+        self.size = end
+
+    def getvalue(self) -> bytes:
+        if self._buffer is not None:
+            if self.size == len(self._buffer):
+                return bytes(self._buffer)
+            return bytes(memoryview(self._buffer)[: self.size])
+        self._file.seek(0)
+        return self._file.read()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._buffer = None
+
+
+async def read_stream(
+    chunks: AsyncIterable[bytes],
+    content_length: int | str | None = None,
+    max_size: int = DEFAULT_MAX_SIZE,
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+) -> bytes:
+    """把响应流读取为 bytes
+    :param chunks: 响应内容的异步迭代器
+    :param content_length: 响应头中的 Content-Length
+    :param max_size: 允许的最大字节数
+    :param spool_threshold: 长度未知时转存到临时文件的阈值
+    :return: 响应内容
+    """
+    length = int(content_length) if content_length else None
+    buffer = StreamBuffer(length, max_size, spool_threshold)
+    try:
+        async for chunk in chunks:
+            buffer.write(chunk)
+        return buffer.getvalue()
+    finally:
+        buffer.close()
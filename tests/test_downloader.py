@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from paihub.utils.downloader import ConcurrentDownloader
+
+
+class TestConcurrentDownloader:
+    async def test_keep_order(self):
+        async def fetch(url: str) -> bytes:
+            await asyncio.sleep(0.01 * (5 - int(url)))
+            return url.encode()
+
+        downloader = ConcurrentDownloader("test", concurrency=5)
+        assert await downloader.download(1, ["1", "2", "3", "4"], fetch) == [b"1", b"2", b"3", b"4"]
+
+    async def test_concurrency_limit(self):
+        running = 0
+        peak = 0
+
+        async def fetch(url: str) -> bytes:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return url.encode()
+
+        downloader = ConcurrentDownloader("test", concurrency=2)
+        result = await downloader.download(1, [str(i) for i in range(6)], fetch)
+        assert len(result) == 6
+        assert peak == 2
+
+    async def test_error_cancel_others(self):
+        cancelled = []
+
+        async def fetch(url: str) -> bytes:
+            if url == "bad":
+                raise ValueError(url)
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            return url.encode()
+
+        downloader = ConcurrentDownloader("test", concurrency=3)
+        with pytest.raises(ValueError, match="bad"):
+            await downloader.download(1, ["a", "bad", "b"], fetch)
+        await asyncio.sleep(0)
+        assert sorted(cancelled) == ["a", "b"]
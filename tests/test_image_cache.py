@@ -0,0 +1,65 @@
+import pytest
+
+from paihub.dependence.image_cache import ImageCache
+
+
+@pytest.fixture
+def image_cache(tmp_path, monkeypatch) -> ImageCache:
+    monkeypatch.setenv("IMAGE_CACHE_MEMORY_BYTES", "10")
+    monkeypatch.setenv("IMAGE_CACHE_DISK_BYTES", "20")
+    monkeypatch.setenv("IMAGE_CACHE_DISK_PATH", str(tmp_path))
+    return ImageCache()
+
+
+class TestImageCache:
+    async def test_miss(self, image_cache: ImageCache):
+        assert await image_cache.get("pixiv", 1) is None
+        assert image_cache.misses == 1
+
+    async def test_memory_hit(self, image_cache: ImageCache):
+        await image_cache.set("pixiv", 1, [b"abc", b"de"])
+        assert await image_cache.get("pixiv", 1) == [b"abc", b"de"]
+        assert image_cache.memory_hits == 1
+
+    async def test_memory_lru_fallback_to_disk(self, image_cache: ImageCache):
+        await image_cache.set("pixiv", 1, [b"12345"])
+        await image_cache.set("pixiv", 2, [b"12345"])
+        await image_cache.get("pixiv", 1)
+        await image_cache.set("pixiv", 3, [b"12345"])
+        # 内存只能容纳两个作品 最久未使用的 2 被淘汰 但仍可从磁盘读取
+        assert await image_cache.get("pixiv", 1) == [b"12345"]
+        assert image_cache.memory_hits == 2
+        assert await image_cache.get("pixiv", 2) == [b"12345"]
+        assert image_cache.disk_hits == 1
+
+    async def test_disk_eviction(self, image_cache: ImageCache):
+        for artwork_id in range(5):
+            await image_cache.set("pixiv", artwork_id, [b"123456"])
+        assert image_cache.get_stats()["disk_size"] <= 20
+        image_cache._memory.clear()  # noqa: SLF001
+        image_cache._page_counts.clear()  # noqa: SLF001
+        assert await image_cache.get("pixiv", 0) is None
+        assert await image_cache.get("pixiv", 4) == [b"123456"]
+
+    async def test_reload_disk_index(self, image_cache: ImageCache):
+        await image_cache.set("twitter", 7, [b"a", b"b"])
+        reloaded = ImageCache()
+        await reloaded.initialize()
+        assert await reloaded.get("twitter", 7) == [b"a", b"b"]
+        assert reloaded.disk_hits == 1
+
+    async def test_reload_skip_unknown_directories(self, image_cache: ImageCache, tmp_path):
+        await image_cache.set("pixiv", 1, [b"a"])
+        for path in (tmp_path / "paihub" / "sites", tmp_path / "pixiv" / "2"):
+            path.mkdir(parents=True)
+            (path / "keep").write_bytes(b"keep")
+        # 写入一半的作品目录带有标记文件 没有 pages 文件
+        incomplete = tmp_path / "pixiv" / "3"
+        incomplete.mkdir()
+        (incomplete / ImageCache.MARKER).touch()
+        reloaded = ImageCache()
+        await reloaded.initialize()
+        assert (tmp_path / "paihub" / "sites" / "keep").is_file()
+        assert (tmp_path / "pixiv" / "2" / "keep").is_file()
+        assert not incomplete.exists()
+        assert reloaded.get_stats()["disk_size"] == 1
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+from paihub.base import SiteService
+from paihub.error import ArtWorkNotFoundError, ArtWorkUnavailableError, BadRequest
+from paihub.sites.cache import NegativeCache
+
+
+class FakeRedisClient:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.reads = 0
+
+    async def get(self, key: str) -> str | None:
+        self.reads += 1
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None):  # noqa: ARG002
+        self.data[key] = value
+
+
+class FakeSiteService(SiteService):
+    site_key = "test"
+
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.calls = 0
+
+    async def get_artwork(self, artwork_id: int) -> int:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return artwork_id
+
+
+@pytest.fixture
+def negative_cache() -> NegativeCache:
+    return NegativeCache(SimpleNamespace(client=FakeRedisClient()))
+
+
+class TestNegativeCache:
+    async def test_not_found_cached(self, negative_cache: NegativeCache):
+        service = FakeSiteService(ArtWorkNotFoundError("Not Exist"))
+        service.set_negative_cache(negative_cache)
+        for _ in range(3):
+            with pytest.raises(ArtWorkNotFoundError, match="Not Exist"):
+                await service.get_artwork(1)
+        assert service.calls == 1
+        assert negative_cache.get_stats()["local_hits"] == 2
+
+    async def test_unavailable_cached(self, negative_cache: NegativeCache):
+        service = FakeSiteService(ArtWorkUnavailableError("gold account"))
+        service.set_negative_cache(negative_cache)
+        with pytest.raises(ArtWorkUnavailableError, match="gold account"):
+            await service.get_artwork(1)
+        with pytest.raises(ArtWorkUnavailableError, match="gold account"):
+            await service.get_artwork(1)
+        assert service.calls == 1
+
+    async def test_shared_by_redis(self, negative_cache: NegativeCache):
+        await negative_cache.set("test", 1, ArtWorkNotFoundError())
+        other = NegativeCache(SimpleNamespace(client=negative_cache.client))
+        with pytest.raises(ArtWorkNotFoundError, match="ArtWork Not Found"):
+            await other.check("test", 1)
+        assert other.get_stats()["remote_hits"] == 1
+
+    async def test_other_errors_not_cached(self, negative_cache: NegativeCache):
+        service = FakeSiteService(BadRequest("Pixiv Error"))
+        service.set_negative_cache(negative_cache)
+        for _ in range(2):
+            with pytest.raises(BadRequest, match="Pixiv Error"):
+                await service.get_artwork(1)
+        assert service.calls == 2
+        service.error = None
+        assert await service.get_artwork(1) == 1
+
+    async def test_disabled(self, negative_cache: NegativeCache):
+        negative_cache.ttl = 0
+        service = FakeSiteService(ArtWorkNotFoundError())
+        service.set_negative_cache(negative_cache)
+        for _ in range(2):
+            with pytest.raises(ArtWorkNotFoundError):
+                await service.get_artwork(1)
+        assert service.calls == 2
+        assert negative_cache.client.reads == 0
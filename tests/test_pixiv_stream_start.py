@@ -0,0 +1,49 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from paihub.models import WorkRule
+from paihub.sites.pixiv.services import PixivSitesService
+from paihub.spider.pixiv.spider import PixivSpider
+
+NOW = datetime(2026, 1, 1)
+
+
+class FakePixivReviewCache:
+    def __init__(self):
+        self.streams: dict[int, tuple[str, datetime]] = {}
+
+    async def set_stream_start(self, work_id: int, rule: str, since: datetime):
+        self.streams[work_id] = (rule, since)
+
+    async def del_stream_start(self, work_id: int):
+        self.streams.pop(work_id, None)
+
+
+def make_spider(rules: list[WorkRule], review_cache: FakePixivReviewCache) -> PixivSpider:
+    async def get_all():
+        return rules
+
+    async def get_now():
+        return NOW
+
+    return PixivSpider(
+        cache=None,
+        repository=SimpleNamespace(get_now=get_now),
+        mobile_api=None,
+        review_repository=None,
+        spider_document=None,
+        web_api=None,
+        review_cache=review_cache,
+        work_rule_repository=SimpleNamespace(get_all=get_all),
+    )
+
+
+class TestPixivStreamStart:
+    async def test_uncompiled_pattern_keeps_database_scan(self):
+        pattern = WorkRule(work_id=1, name=None, description=None, search_text=r"^\p{Han}+$", is_pattern=True)
+        keyword = WorkRule(work_id=2, name=None, description=None, search_text="原神", is_pattern=False)
+        review_cache = FakePixivReviewCache()
+        # 之前记录的候选集合起始时间需要被清除 否则初始化审核队列时会跳过扫描数据库
+        review_cache.streams[1] = ("old", NOW)
+        await make_spider([pattern, keyword], review_cache).refresh_rule_matcher()
+        assert review_cache.streams == {2: (PixivSitesService.get_rule_fingerprint("原神", False), NOW)}
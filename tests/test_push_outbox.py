@@ -0,0 +1,255 @@
+from types import SimpleNamespace
+
+import pytest
+
+from paihub.error import ArtWorkNotFoundError, ConnectionTimedOut
+from paihub.jobs.auto_push import AutoPushJob
+from paihub.system.push.outbox_entities import PushOutboxStatus
+from paihub.system.push.services import PushService
+from paihub.system.review.entities import ReviewStatus
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+
+class FakePushCache:
+    """按 PushCache 的 Lua 脚本语义实现的内存推送队列"""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.pending: set[int] = set()
+        self.processing: dict[int, float] = {}
+
+    async def set_pending_push(self, _: int, values) -> int:
+        values = set(values) - self.pending
+        self.pending |= values
+        return len(values)
+
+    async def get_push_count(self, _: int) -> int:
+        return len(self.pending)
+
+    async def claim_pending_push(self, _: int) -> str | None:
+        if not self.pending:
+            return None
+        review_id = min(self.pending)
+        self.pending.remove(review_id)
+        self.processing[review_id] = self.clock.now
+        return str(review_id)
+
+    async def ack_push(self, _: int, review_id: int) -> bool:
+        return self.processing.pop(review_id, None) is not None
+
+    async def sweep_processing_push(self, _: int, seconds: float) -> int:
+        expired = [review_id for review_id, at in self.processing.items() if at <= self.clock.now - seconds]
+        for review_id in expired:
+            del self.processing[review_id]
+            self.pending.add(review_id)
+        return len(expired)
+
+
+class FakePushOutboxRepository:
+    """按 PushOutboxRepository 的 SQL 语义实现的内存发件箱"""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.rows: dict[int, dict] = {}
+
+    def status(self, review_id: int) -> PushOutboxStatus:
+        return self.rows[review_id]["status"]
+
+    async def add_pending(self, work_id: int, review_ids: list[int]) -> int:
+        count = 0
+        for review_id in review_ids:
+            if review_id not in self.rows:
+                self.rows[review_id] = {
+                    "work_id": work_id,
+                    "status": PushOutboxStatus.PENDING,
+                    "update_time": self.clock.now,
+                    "message_id": None,
+                }
+                count += 1
+        return count
+
+    async def get_pending_review_ids(self, work_id: int) -> list[int]:
+        return sorted(
+            review_id
+            for review_id, row in self.rows.items()
+            if row["work_id"] == work_id and row["status"] == PushOutboxStatus.PENDING
+        )
+
+    async def get_work_id(self, review_id: int) -> int | None:
+        row = self.rows.get(review_id)
+        return None if row is None else row["work_id"]
+
+    async def transition(self, review_id, from_status, to_status, message_id=None) -> bool:
+        row = self.rows.get(review_id)
+        if row is None or row["status"] != from_status:
+            return False
+        row.update(status=to_status, update_time=self.clock.now, message_id=message_id or row["message_id"])
+        return True
+
+    async def mark_stale_sending(self, work_id: int, seconds: int) -> list[int]:
+        review_ids = [
+            review_id
+            for review_id, row in self.rows.items()
+            if row["work_id"] == work_id
+            and row["status"] == PushOutboxStatus.SENDING
+            and row["update_time"] < self.clock.now - seconds
+        ]
+        for review_id in review_ids:
+            self.rows[review_id].update(status=PushOutboxStatus.UNKNOWN, update_time=self.clock.now)
+        return review_ids
+
+    async def requeue_unknown(self, work_id: int) -> list[int]:
+        review_ids = [
+            review_id
+            for review_id, row in self.rows.items()
+            if row["work_id"] == work_id and row["status"] == PushOutboxStatus.UNKNOWN
+        ]
+        for review_id in review_ids:
+            self.rows[review_id].update(status=PushOutboxStatus.PENDING, update_time=self.clock.now)
+        return review_ids
+
+
+class FakePushRepository:
+    def __init__(self):
+        self.pushes = []
+
+    async def get_review_id_by_push(self, _: int) -> list[int]:
+        # 模拟推送记录没有写入时 审核库仍然返回这些作品
+        return [1, 2]
+
+    async def get_push(self, review_id: int):
+        return next((push for push in self.pushes if push.review_id == review_id), None)
+
+    async def add(self, instance):
+        self.pushes.append(instance)
+        return instance
+
+
+class FakeReviewRepository:
+    async def get_by_id(self, review_id: int):
+        return SimpleNamespace(id=review_id, site_key="pixiv", artwork_id=review_id * 10, status=ReviewStatus.PASS)
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def push_service(clock: Clock) -> PushService:
+    return PushService(
+        sites_manager=SimpleNamespace(get_site_by_site_key=lambda _: None),
+        push_repository=FakePushRepository(),
+        push_cache=FakePushCache(clock),
+        review_repository=FakeReviewRepository(),
+        work_channel_repository=SimpleNamespace(get_by_work_id=lambda _: _async(SimpleNamespace(channel_id=100))),
+        tag_formatter=None,
+        push_outbox_repository=FakePushOutboxRepository(clock),
+    )
+
+
+async def _async(value):
+    return value
+
+
+class TestPushOutbox:
+    async def test_claim_and_ack(self, push_service: PushService):
+        await push_service.enqueue_push(1, [1, 2])
+        push_context = await push_service.get_next_push(1)
+        assert push_context.review_id == 1
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.SENDING
+        assert 1 in push_service.push_cache.processing
+
+        await push_context.set_push(message_id=10, create_by=0)
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.SENT
+        assert push_service.push_outbox_repository.rows[1]["message_id"] == 10
+        assert not push_service.push_cache.processing
+        assert await push_service.get_push_count(1) == 1
+
+    async def test_failed_push(self, push_service: PushService):
+        await push_service.enqueue_push(1, [1])
+        push_context = await push_service.get_next_push(1)
+        await push_context.set_push(status=False, create_by=0)
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.FAILED
+        # 再次初始化推送队列时不会重新推送
+        assert await push_service.get_push(1) == 1
+        assert push_service.push_cache.pending == {2}
+
+    async def test_undo(self, push_service: PushService):
+        await push_service.enqueue_push(1, [1])
+        push_context = await push_service.get_next_push(1)
+        await push_context.undo_push()
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.PENDING
+        assert not push_service.push_cache.processing
+        push_context = await push_service.get_next_push(1)
+        assert push_context.review_id == 1
+
+    async def test_sweep_finished_push_not_resent(self, clock: Clock, push_service: PushService):
+        await push_service.enqueue_push(1, [1])
+        push_context = await push_service.get_next_push(1)
+        await push_service.push_outbox_repository.transition(1, PushOutboxStatus.SENDING, PushOutboxStatus.SENT)
+        # 推送完成后进程在确认之前退出 处理中集合仍然保留该作品
+        clock.now += push_service.processing_timeout + 1
+        await push_service.recover_push(1)
+        assert push_service.push_cache.pending == {push_context.review_id}
+        assert await push_service.get_next_push(1) is None
+        assert not push_service.push_cache.processing
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.SENT
+
+    async def test_stale_sending_marked_unknown(self, clock: Clock, push_service: PushService):
+        await push_service.enqueue_push(1, [1, 2])
+        await push_service.get_next_push(1)
+        clock.now += push_service.processing_timeout - 1
+        await push_service.recover_push(1)
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.SENDING
+
+        clock.now += 2
+        assert await push_service.recover_push(1) == 2
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.UNKNOWN
+        # 无法确认是否已经发出的作品不会自动重新推送
+        push_context = await push_service.get_next_push(1)
+        assert push_context.review_id == 2
+        assert await push_service.get_next_push(1) is None
+        assert await push_service.get_push(1) == 0
+
+        assert await push_service.requeue_unknown_push(1) == 1
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.PENDING
+        push_context = await push_service.get_next_push(1)
+        assert push_context.review_id == 1
+
+
+class FakeSiteService:
+    def __init__(self, errors: dict[int, Exception]):
+        self.errors = errors
+        self.calls: list[int] = []
+
+    async def get_artwork(self, artwork_id: int):
+        self.calls.append(artwork_id)
+        raise self.errors[artwork_id]
+
+
+class TestBatchPush:
+    async def test_fetch_errors(self, push_service: PushService):
+        site_service = FakeSiteService({10: ArtWorkNotFoundError(), 20: ConnectionTimedOut()})
+        push_service.sites_manager = SimpleNamespace(get_site_by_site_key=lambda _: site_service)
+        job = AutoPushJob(
+            config_repository=None,
+            review_service=None,
+            push_service=push_service,
+            work_channel_repository=push_service.work_channel_repository,
+            sender_service=None,
+        )
+        await job._batch_push_artworks(1, [1, 2], create_by=0)
+
+        # 作品不存在时记录为推送失败 同一轮中不会被再次认领
+        assert site_service.calls == [10, 20]
+        assert push_service.push_outbox_repository.status(1) == PushOutboxStatus.FAILED
+        assert [(push.review_id, push.status) for push in push_service.push_repository.pushes] == [(1, False)]
+        # 网络错误放回队列 等待下次推送
+        assert push_service.push_outbox_repository.status(2) == PushOutboxStatus.PENDING
+        assert push_service.push_cache.pending == {2}
+        assert not push_service.push_cache.processing
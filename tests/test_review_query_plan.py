@@ -0,0 +1,94 @@
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from paihub.models import metadata
+from paihub.system.push.outbox_repositories import PushOutboxRepository
+from paihub.system.push.repositories import PushRepository
+from paihub.system.review.entities import ReviewStatus
+from paihub.system.review.repositories import ReviewRepository
+
+pytest.importorskip("aiosqlite")
+
+# SQLite 的执行计划中 SCAN 表示全表扫描 通过索引或主键查找为 SEARCH
+FULL_SCAN = re.compile(r"\bSCAN (review|push|push_outbox)\b(?! USING (COVERING )?INDEX)")
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    tables = [metadata.tables[name] for name in ("work", "review", "push", "push_outbox")]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: metadata.create_all(sync_conn, tables=tables))
+    yield engine
+    await engine.dispose()
+
+
+async def collect(async_iterator):
+    return [item async for item in async_iterator]
+
+
+async def capture_plans(engine, func) -> list[tuple[str, list[str]]]:
+    """执行查询并返回每条 SQL 的执行计划"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await func()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            plans.append((statement, [row[-1] for row in result]))
+    return plans
+
+
+def review_repository(engine) -> ReviewRepository:
+    repository = ReviewRepository()
+    repository.set_engine(engine)
+    return repository
+
+
+def push_repository(engine) -> PushRepository:
+    repository = PushRepository()
+    repository.set_engine(engine)
+    return repository
+
+
+def push_outbox_repository(engine) -> PushOutboxRepository:
+    repository = PushOutboxRepository()
+    repository.set_engine(engine)
+    return repository
+
+
+QUERIES = {
+    "iter_artwork_ids_by_work_and_web": lambda engine: collect(
+        review_repository(engine).iter_artwork_ids_by_work_and_web(1, "pixiv")
+    ),
+    "get_exists_artwork_ids": lambda engine: review_repository(engine).get_exists_artwork_ids(1, "pixiv", [1, 2]),
+    "iter_ids_by_status": lambda engine: collect(review_repository(engine).iter_ids_by_status(1, ReviewStatus.WAIT)),
+    "get_review_by_artwork_id": lambda engine: review_repository(engine).get_review_by_artwork_id(1),
+    "get_review": lambda engine: review_repository(engine).get_review(1, "pixiv", 1),
+    "get_by_ids_with_status": lambda engine: review_repository(engine).get_by_ids_with_status([1], ReviewStatus.PASS),
+    "get_review_id_by_push": lambda engine: push_repository(engine).get_review_id_by_push(1),
+    "get_push": lambda engine: push_repository(engine).get_push(1),
+    "get_pending_review_ids": lambda engine: push_outbox_repository(engine).get_pending_review_ids(1),
+}
+
+
+class TestReviewQueryPlan:
+    @pytest.mark.parametrize("name", list(QUERIES))
+    async def test_no_full_scan(self, engine, name: str):
+        plans = await capture_plans(engine, lambda: QUERIES[name](engine))
+        assert plans
+        for statement, plan in plans:
+            scans = [line for line in plan if FULL_SCAN.search(line)]
+            assert not scans, f"{name} 出现全表扫描 {scans}\n{statement}"
@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+from paihub.system.review.entities import ReviewAuthorRule, ReviewAuthorRuleAction
+from paihub.system.review.rule_map import ReviewAuthorRuleMap
+
+
+def make_rule(site_key: str, author_id: int, action: ReviewAuthorRuleAction) -> ReviewAuthorRule:
+    return ReviewAuthorRule(work_id=1, site_key=site_key, author_id=author_id, action=action)
+
+
+class TestReviewAuthorRuleMap:
+    async def test_lazy_load_once(self):
+        rule_map = ReviewAuthorRuleMap(SimpleNamespace(client=None))
+        calls = []
+
+        async def loader(work_id: int):
+            calls.append(work_id)
+            return [make_rule("pixiv", 1, ReviewAuthorRuleAction.AUTO_PASS)]
+
+        assert await rule_map.get(1, loader) == {("pixiv", 1): ReviewAuthorRuleAction.AUTO_PASS}
+        await rule_map.get(1, loader)
+        assert calls == [1]
+
+    async def test_discard_reloads(self):
+        rule_map = ReviewAuthorRuleMap(SimpleNamespace(client=None))
+        rules = [make_rule("pixiv", 1, ReviewAuthorRuleAction.AUTO_PASS)]
+
+        async def loader(_: int):
+            return list(rules)
+
+        await rule_map.get(1, loader)
+        rules.append(make_rule("twitter", 2, ReviewAuthorRuleAction.AUTO_REJECT))
+        rule_map.discard(1)
+        assert ("twitter", 2) in await rule_map.get(1, loader)
+
+    async def test_discard_during_load_is_not_cached(self):
+        rule_map = ReviewAuthorRuleMap(SimpleNamespace(client=None))
+        loading = asyncio.Event()
+        release = asyncio.Event()
+        calls = []
+
+        async def loader(_: int):
+            calls.append(1)
+            loading.set()
+            await release.wait()
+            return []
+
+        task = asyncio.create_task(rule_map.get(1, loader))
+        await loading.wait()
+        rule_map.discard(1)
+        release.set()
+        await task
+        await rule_map.get(1, loader)
+        # 加载期间失效的结果不会写入缓存 第二次需要重新加载
+        assert len(calls) == 2
@@ -0,0 +1,35 @@
+from paihub.system.sender.scheduler import TokenBucket
+
+
+class TestTokenBucket:
+    def test_burst_within_capacity(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        assert bucket.reserve(1, now=0) == 0
+        assert bucket.reserve(2, now=0) == 0
+
+    def test_wait_when_empty(self):
+        bucket = TokenBucket(rate=0.5, capacity=2)
+        assert bucket.reserve(2, now=0) == 0
+        assert bucket.reserve(1, now=0) == 2
+        # 透支的令牌使后续调用方依次排队
+        assert bucket.reserve(1, now=0) == 4
+
+    def test_refill(self):
+        bucket = TokenBucket(rate=1, capacity=2)
+        bucket.reserve(2, now=0)
+        assert bucket.reserve(2, now=5) == 0
+
+    def test_count_over_capacity(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        # 媒体组中的每个媒体都计为一条消息 超出容量的部分需要等待
+        assert bucket.reserve(10, now=0) == 7
+        assert bucket.reserve(1, now=7) == 1
+
+    def test_pause_and_recover(self):
+        bucket = TokenBucket(rate=1, capacity=2)
+        bucket.pause(10, now=0)
+        assert bucket.rate == 0.8
+        assert bucket.reserve(1, now=0) >= 10
+        for _ in range(10):
+            bucket.recover()
+        assert bucket.rate == 1
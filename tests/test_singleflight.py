@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from paihub.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    async def test_share_result(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 1
+
+        assert await asyncio.gather(*(flight.do("key", fetch) for _ in range(5))) == [1] * 5
+        assert calls == 1
+        assert len(flight) == 0
+
+    async def test_share_exception(self):
+        flight = SingleFlight()
+
+        async def fetch() -> int:
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        results = await asyncio.gather(flight.do("key", fetch), flight.do("key", fetch), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError, match="failed"):
+            await flight.do("key", fetch)
+
+    async def test_cancel_caller_keep_request(self):
+        flight = SingleFlight()
+
+        async def fetch() -> int:
+            await asyncio.sleep(0.02)
+            return 1
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 1
@@ -0,0 +1,27 @@
+import pytest
+
+from paihub.error import ImagesTooLarge
+from paihub.utils.stream import StreamBuffer, read_stream
+
+
+async def iter_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestStreamBuffer:
+    async def test_content_length(self):
+        assert await read_stream(iter_chunks(b"abc", b"de"), "5") == b"abcde"
+
+    async def test_content_length_mismatch(self):
+        assert await read_stream(iter_chunks(b"abc", b"de"), 3) == b"abcde"
+        assert await read_stream(iter_chunks(b"abc"), 10) == b"abc"
+
+    async def test_unknown_length_spooled(self):
+        assert await read_stream(iter_chunks(b"abc", b"def", b"g"), spool_threshold=4) == b"abcdefg"
+
+    async def test_max_size(self):
+        with pytest.raises(ImagesTooLarge):
+            await read_stream(iter_chunks(b"abc", b"def"), max_size=5)
+        with pytest.raises(ImagesTooLarge):
+            StreamBuffer(content_length=10, max_size=5)
@@ -0,0 +1,70 @@
+from paihub.sites.cache import LocalCache, TieredCache, pack_entry, tiered_get, tiered_set, unpack_entry
+
+
+class FakeSiteCache:
+    def __init__(self):
+        self.tiered_cache = TieredCache()
+        self.remote: dict[int, dict] = {}
+        self.remote_reads = 0
+
+    @tiered_get("test")
+    async def get_result(self, key: int) -> dict | None:
+        self.remote_reads += 1
+        return self.remote.get(key)
+
+    @tiered_set("test")
+    async def set_result(self, key: int, value: dict):
+        self.remote[key] = value
+
+
+class TestLocalCache:
+    def test_expire(self):
+        local = LocalCache(size=2, ttl=10)
+        local.set("a", 1, now=0)
+        assert local.get("a", now=5) == 1
+        assert local.get("a", now=10) is None
+        assert len(local) == 0
+
+    def test_lru(self):
+        local = LocalCache(size=2, ttl=10)
+        local.set("a", 1, now=0)
+        local.set("b", 2, now=0)
+        local.get("a", now=1)
+        local.set("c", 3, now=1)
+        assert local.get("b", now=1) is None
+        assert local.get("a", now=1) == 1
+
+
+class TestTieredCache:
+    async def test_remote_read_once(self):
+        cache = FakeSiteCache()
+        cache.remote[1] = {"id": 1}
+        assert await cache.get_result(1) == {"id": 1}
+        assert await cache.get_result(1) == {"id": 1}
+        assert cache.remote_reads == 1
+        assert cache.tiered_cache.get_stats()["test"] == {"local_hits": 1, "remote_hits": 1, "misses": 0, "size": 1}
+
+    async def test_set_fill_local(self):
+        cache = FakeSiteCache()
+        await cache.set_result(1, {"id": 1})
+        assert await cache.get_result(1) == {"id": 1}
+        assert cache.remote_reads == 0
+
+    async def test_miss_not_cached(self):
+        cache = FakeSiteCache()
+        assert await cache.get_result(1) is None
+        assert await cache.get_result(1) is None
+        assert cache.remote_reads == 2
+
+
+class TestCompactEntry:
+    def test_round_trip(self):
+        value = {"id": 1, "tags": ["a", "b"]}
+        assert unpack_entry(pack_entry(value, 1), 1) == value
+
+    def test_ignore_other_version(self):
+        assert unpack_entry(pack_entry({"id": 1}, 1), 2) is None
+
+    def test_ignore_legacy_json(self):
+        assert unpack_entry(b'{"id": 1}', 1) is None
+        assert unpack_entry(None, 1) is None
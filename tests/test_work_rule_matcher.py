@@ -0,0 +1,68 @@
+from paihub.models import WorkRule
+from paihub.system.work.matcher import AhoCorasick, WorkRuleMatcher
+
+
+def make_rule(work_id: int, search_text: str, is_pattern: bool = False) -> WorkRule:
+    return WorkRule(work_id=work_id, name=None, description=None, search_text=search_text, is_pattern=is_pattern)
+
+
+class TestAhoCorasick:
+    def test_overlapping_patterns(self):
+        automaton = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+        assert automaton.search("ushers") == {1, 2, 4}
+
+    def test_no_match(self):
+        automaton = AhoCorasick([("abc", 1)])
+        assert automaton.search("abd") == set()
+
+    def test_empty_pattern_ignored(self):
+        automaton = AhoCorasick([("", 1), ("a", 2)])
+        assert automaton.search("b") == set()
+        assert automaton.search("a") == {2}
+
+
+class TestWorkRuleMatcher:
+    def test_keyword_prefix_of_tag(self):
+        matcher = WorkRuleMatcher([make_rule(1, "原神")])
+        assert matcher.match(["原神10000users入り", "風景"]) == {1}
+        assert matcher.match(["風景", "原神"]) == {1}
+
+    def test_keyword_not_prefix(self):
+        matcher = WorkRuleMatcher([make_rule(1, "原神")])
+        assert matcher.match(["非原神"]) == set()
+
+    def test_keyword_ignore_case(self):
+        matcher = WorkRuleMatcher([make_rule(1, "genshin")])
+        assert matcher.match(["GenshinImpact"]) == {1}
+
+    def test_pattern_rule(self):
+        matcher = WorkRuleMatcher(
+            [make_rule(1, "^(原神|Genshin)", is_pattern=True), make_rule(2, "风景|風景", is_pattern=True)]
+        )
+        assert matcher.match(["女の子", "風景"]) == {2}
+
+    def test_multiple_works(self):
+        matcher = WorkRuleMatcher(
+            [
+                make_rule(1, "原神"),
+                make_rule(2, "崩坏"),
+                make_rule(3, "原神|崩坏", is_pattern=True),
+                make_rule(4, "ブルーアーカイブ", is_pattern=True),
+            ]
+        )
+        assert matcher.match(["原神", "女の子"]) == {1, 3}
+
+    def test_invalid_pattern_skipped(self):
+        matcher = WorkRuleMatcher([make_rule(1, "(", is_pattern=True), make_rule(2, "原神")])
+        assert matcher.match(["原神"]) == {2}
+
+    def test_mysql_only_pattern_not_compiled(self):
+        # MySQL REGEXP 支持 \p{Han} 但 Python re 无法编译 这类规则不能依赖候选集合
+        rules = [make_rule(1, r"^\p{Han}+$", is_pattern=True), make_rule(2, "原神")]
+        matcher = WorkRuleMatcher(rules)
+        assert [rule.work_id for rule in matcher.rules] == [2]
+        assert matcher.match(["原神"]) == {2}
+
+    def test_empty_tags(self):
+        matcher = WorkRuleMatcher([make_rule(1, "原神")])
+        assert matcher.match([]) == set()